@@ -0,0 +1,55 @@
+"""Measure the memory retained per parsed cue.
+
+Usage: python benchmarks/cue_memory.py [CUE_COUNT]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from subtune.core.processor import SRTFile
+
+LINES = ["♪", "♪ ♪", "What do you mean?", "I don't know.", "Let's go!"]
+
+
+def generate_content(cue_count):
+    blocks = []
+    for index in range(cue_count):
+        start_ms = index * 300
+        end_ms = start_ms + 250
+        blocks.append(
+            f"{index + 1}\n{_format(start_ms)} --> {_format(end_ms)}\n"
+            f"{LINES[index % len(LINES)]}\nLine {index}\n"
+        )
+    return "\n".join(blocks)
+
+
+def _format(ms):
+    h, rest = divmod(ms, 3600000)
+    m, rest = divmod(rest, 60000)
+    s, ms = divmod(rest, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def main():
+    cue_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    content = generate_content(cue_count)
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+
+    srt_file = SRTFile.from_content(content)
+    del content
+    gc.collect()
+
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    print(f"cues:           {len(srt_file)}")
+    print(f"retained bytes: {retained}")
+    print(f"bytes per cue:  {retained / len(srt_file):.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Report tracemalloc peak and RSS for the parse, shift and write stages.
+
+Each stage runs in a fresh interpreter so RSS figures are not polluted by
+earlier stages.
+
+Usage: python benchmarks/memory.py [--sizes 10,100,1000] [--no-tracemalloc]
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+
+from subtune.core.validator import FileValidator
+from subtune.core.workflow import SubtitleProcessor
+
+STAGES = ("parse", "shift", "write", "stream")
+MAX_TIMELINE_MS = 99 * 3600 * 1000
+BYTES_PER_SAMPLE_CUE = 58
+LINES = ["♪", "What do you mean?", "I don't know.", "Let's go!"]
+
+
+def write_sample(path, target_bytes):
+    """Write a synthetic SRT file of roughly ``target_bytes`` and return its cue count."""
+    step_ms = max(2, MAX_TIMELINE_MS // max(target_bytes // BYTES_PER_SAMPLE_CUE, 1))
+    written = 0
+    number = 0
+
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target_bytes:
+            number += 1
+            start_ms = number * step_ms
+            block = (
+                f"{number}\n{_format(start_ms)} --> {_format(start_ms + step_ms // 2)}\n"
+                f"{LINES[number % len(LINES)]}\nLine {number}\n\n"
+            )
+            written += f.write(block)
+
+    return number
+
+
+def measure_stage(stage, input_path, use_tracemalloc):
+    """Run one stage and return its tracemalloc peak (bytes) and process max RSS."""
+    srt_file = shifted = None
+    if stage in ("shift", "write"):
+        srt_file = FileValidator.read_srt_file(input_path)
+    if stage == "write":
+        shifted = srt_file.shift(timedelta(seconds=1))
+
+    if use_tracemalloc:
+        tracemalloc.start()
+    started = time.perf_counter()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        output_path = Path(output_dir) / "output.srt"
+        if stage == "parse":
+            FileValidator.read_srt_file(input_path)
+        elif stage == "shift":
+            srt_file.shift(timedelta(seconds=1))
+        elif stage == "write":
+            FileValidator.write_srt_file(shifted, output_path)
+        else:
+            SubtitleProcessor(on_warning=lambda _message: None).shift_file(
+                input_path, output_path, 1000
+            )
+
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] if use_tracemalloc else None
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    return {"stage": stage, "peak_bytes": peak, "max_rss_bytes": max_rss, "seconds": elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10,100", help="Input sizes in MB (default: 10,100)")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Only report RSS")
+    parser.add_argument("--stage", choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--input", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.stage:
+        print(json.dumps(measure_stage(args.stage, Path(args.input), not args.no_tracemalloc)))
+        return
+
+    print(f"{'size':>7} {'stage':>7} {'peak/cue':>9} {'peak MB':>9} {'RSS MB':>8} {'time s':>7}")
+    with tempfile.TemporaryDirectory() as sample_dir:
+        for size_mb in map(int, args.sizes.split(",")):
+            input_path = Path(sample_dir) / f"sample_{size_mb}mb.srt"
+            cue_count = write_sample(input_path, size_mb * 1024 * 1024)
+
+            for stage in STAGES:
+                command = [sys.executable, __file__, "--stage", stage, "--input", str(input_path)]
+                if args.no_tracemalloc:
+                    command.append("--no-tracemalloc")
+                result = json.loads(subprocess.run(command, check=True, capture_output=True).stdout)
+                _print_row(size_mb, cue_count, result)
+
+            input_path.unlink()
+
+
+def _print_row(size_mb, cue_count, result):
+    peak = result["peak_bytes"]
+    per_cue = f"{peak / cue_count:9.1f}" if peak is not None else f"{'-':>9}"
+    peak_mb = f"{peak / 1048576:9.1f}" if peak is not None else f"{'-':>9}"
+    print(
+        f"{size_mb:>5}MB {result['stage']:>7} {per_cue} {peak_mb} "
+        f"{result['max_rss_bytes'] / 1048576:8.1f} {result['seconds']:7.2f}"
+    )
+
+
+def _format(ms):
+    h, rest = divmod(ms, 3600000)
+    m, rest = divmod(rest, 60000)
+    s, ms = divmod(rest, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Compare the table-driven timestamp codec with the SRTTimestamp methods.
+
+Usage: python benchmarks/timestamp_codec.py [--number 200000]
+"""
+
+import argparse
+import random
+import re
+import timeit
+
+from subtune.config import SRT_TIMING_LINE_PATTERN
+from subtune.core.codec import format_timing_line, parse_timing_line
+from subtune.core.processor import SRTFile
+from subtune.core.timestamp import MAX_TIMESTAMP_MS, SRTTimestamp
+
+
+def parse_with_timestamp(line):
+    start_str, end_str = re.match(SRT_TIMING_LINE_PATTERN, line).groups()
+    return (
+        SRTTimestamp.from_string(start_str).to_milliseconds(),
+        SRTTimestamp.from_string(end_str).to_milliseconds(),
+    )
+
+
+def format_with_timestamp(start_ms, end_ms):
+    start = SRTTimestamp.from_milliseconds(start_ms).to_string()
+    end = SRTTimestamp.from_milliseconds(end_ms).to_string()
+    return f"{start} --> {end}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200000, help="Timing lines per run")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    pairs = []
+    for _ in range(args.number):
+        start_ms = rng.randrange(MAX_TIMESTAMP_MS - 10000)
+        pairs.append((start_ms, start_ms + rng.randrange(10000)))
+    lines = [format_with_timestamp(*pair) for pair in pairs]
+    content = "\n\n".join(f"{n}\n{line}\nText" for n, line in enumerate(lines, start=1))
+
+    cases = [
+        (
+            "parse timing line",
+            lambda: [parse_with_timestamp(line) for line in lines],
+            lambda: [parse_timing_line(line) for line in lines],
+        ),
+        (
+            "format timing line",
+            lambda: [format_with_timestamp(*pair) for pair in pairs],
+            lambda: [format_timing_line(*pair) for pair in pairs],
+        ),
+    ]
+
+    print(f"{'case':<20} {'before ns':>10} {'codec ns':>10} {'speedup':>8}")
+    for name, before, after in cases:
+        before_ns = min(timeit.repeat(before, number=1, repeat=3)) / args.number * 1e9
+        after_ns = min(timeit.repeat(after, number=1, repeat=3)) / args.number * 1e9
+        print(f"{name:<20} {before_ns:10.0f} {after_ns:10.0f} {before_ns / after_ns:7.1f}x")
+
+    round_trip = min(
+        timeit.repeat(lambda: SRTFile.from_content(content).to_content(), number=1, repeat=3)
+    )
+    print(f"\nparse + format {args.number} cues end to end: {round_trip:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+from .api import ShiftResult, shift_bytes, shift_file, shift_many, shift_text
+from .config import VERSION
+from .core.repair import RepairOptions
+from .core.seekindex import read_window
+
+__version__ = VERSION
+
+__all__ = [
+    "RepairOptions",
+    "ShiftResult",
+    "read_window",
+    "shift_bytes",
+    "shift_file",
+    "shift_many",
+    "shift_text",
+]
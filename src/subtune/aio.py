@@ -0,0 +1,189 @@
+"""Asyncio API for shifting subtitles from async services.
+
+File I/O runs in the event loop's default thread pool and parsing and shifting
+run in ``executor`` (the default thread pool when omitted; pass a
+``ProcessPoolExecutor`` to use several cores). Results are the same
+:class:`ShiftResult` objects the synchronous API returns.
+
+Cancelling a call never leaves a partial output: the output holds either its
+old or its new content. A call cancelled while its temp file is being written
+leaves the output untouched and removes the temp file as soon as the write
+finishes; once the temp file is being moved into place, the move completes.
+
+Example::
+
+    from subtune import aio
+
+    async for result in aio.iter_shift_many(jobs, concurrency=16):
+        print(result.input_path, result.error or result.subtitle_count)
+"""
+
+import asyncio
+import time
+from pathlib import Path
+
+from .api import logger, notify
+from .config import ASYNC_CONCURRENCY
+from .core.exceptions import SubtuneError
+from .core.validator import FileValidator
+from .core.workflow import ShiftResult, SubtitleProcessor
+from .utils.backup import BackupManager
+
+_processor = SubtitleProcessor(on_warning=logger.warning)
+
+
+async def shift_file(
+    input_path,
+    output_path=None,
+    offset_ms=0,
+    create_backup=False,
+    on_warning=None,
+    skip_identical=False,
+    repair_options=None,
+    executor=None,
+):
+    """Shift a subtitle file without blocking the event loop.
+
+    Takes the same arguments as :func:`subtune.shift_file` except ``build_state``,
+    plus the ``executor`` used for parsing and shifting.
+    """
+    loop = asyncio.get_running_loop()
+    input_path = Path(input_path)
+    output_path = Path(output_path) if output_path is not None else input_path
+    started = time.perf_counter()
+
+    warnings, content = await loop.run_in_executor(None, _read_input, input_path, output_path)
+
+    stage_started = time.perf_counter()
+    result = await loop.run_in_executor(
+        executor, _shift_content, content, offset_ms, repair_options
+    )
+    result.timings["shift"] = time.perf_counter() - stage_started
+    result.input_path = input_path
+    result.output_path = output_path
+    for warning in warnings:
+        _processor.warn(result, warning)
+
+    if create_backup:
+        result.backup_path = await loop.run_in_executor(
+            None,
+            BackupManager.create_backup,
+            input_path,
+            lambda message: _processor.warn(result, message),
+        )
+
+    stage_started = time.perf_counter()
+    temp_path = await _write_temp(loop, result.content, output_path)
+    result.content = None
+
+    on_unchanged = _processor.unchanged_marker(result) if skip_identical else None
+    commit = loop.run_in_executor(
+        None, FileValidator.commit_output, temp_path, output_path, on_unchanged
+    )
+    # Once the temp file is being moved into place the write is allowed to finish
+    await asyncio.shield(commit)
+    result.timings["write"] = time.perf_counter() - stage_started
+
+    result.timings["total"] = time.perf_counter() - started
+    notify(result, on_warning)
+
+    return result
+
+
+async def iter_shift_many(
+    jobs,
+    concurrency=ASYNC_CONCURRENCY,
+    create_backup=False,
+    on_warning=None,
+    raise_on_error=False,
+    skip_identical=False,
+    repair_options=None,
+    executor=None,
+):
+    """Shift ``(input_path, output_path, offset_ms)`` jobs, yielding results as they finish.
+
+    At most ``concurrency`` files are in flight and ``jobs`` is consumed lazily,
+    so long job lists apply backpressure instead of being scheduled at once.
+    Failures are recorded in ``result.error`` unless ``raise_on_error`` is set.
+    Closing the iterator early cancels the files still in flight.
+    """
+    options = {
+        "create_backup": create_backup,
+        "on_warning": on_warning,
+        "skip_identical": skip_identical,
+        "repair_options": repair_options,
+        "executor": executor,
+    }
+    async for _index, result in _run_bounded(jobs, concurrency, raise_on_error, options):
+        yield result
+
+
+async def shift_many(jobs, concurrency=ASYNC_CONCURRENCY, raise_on_error=False, **options):
+    """Shift jobs concurrently and return their results in job order."""
+    results = {}
+    async for index, result in _run_bounded(jobs, concurrency, raise_on_error, options):
+        results[index] = result
+    return [results[index] for index in sorted(results)]
+
+
+async def _run_bounded(jobs, concurrency, raise_on_error, options):
+    if concurrency < 1:
+        raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+
+    jobs = enumerate(jobs)
+    pending = set()
+    try:
+        while True:
+            for index, job in jobs:
+                pending.add(asyncio.ensure_future(_run_job(index, job, raise_on_error, options)))
+                if len(pending) >= concurrency:
+                    break
+
+            if not pending:
+                return
+
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def _run_job(index, job, raise_on_error, options):
+    input_path, output_path, offset_ms = job
+    try:
+        return index, await shift_file(input_path, output_path, offset_ms, **options)
+    except SubtuneError as e:
+        if raise_on_error:
+            raise
+        logger.error("Could not shift %s: %s", input_path, e)
+        return index, ShiftResult(input_path=Path(input_path), output_path=output_path, error=e)
+
+
+async def _write_temp(loop, content, output_path):
+    future = loop.run_in_executor(None, FileValidator.write_temp_file, [content], output_path)
+    try:
+        return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        # The thread keeps writing; remove its temp file once it is done
+        future.add_done_callback(_discard_temp)
+        raise
+
+
+def _discard_temp(future):
+    if not future.cancelled() and future.exception() is None:
+        FileValidator.discard_temp_file(future.result())
+
+
+def _read_input(input_path, output_path):
+    FileValidator.validate_input_file(input_path)
+    warnings = FileValidator.collect_file_warnings(input_path)
+    FileValidator.validate_output_location(output_path)
+
+    return warnings, FileValidator.read_text(input_path)
+
+
+def _shift_content(content, offset_ms, repair_options):
+    return _processor.shift_text(content, offset_ms, repair_options)
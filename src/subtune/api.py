@@ -0,0 +1,131 @@
+"""In-process API for shifting subtitles without console output.
+
+All functions return a :class:`ShiftResult` and never print. Warnings are
+logged on the ``subtune`` logger and passed to the optional ``on_warning``
+callback. Functions share one processor, so calling them in a loop does not
+rebuild validators.
+
+Example::
+
+    from subtune import shift_file
+
+    result = shift_file("movie.srt", "movie.shifted.srt", offset_ms=1500)
+    print(result.subtitle_count, result.warnings, result.timings["total"])
+"""
+
+import logging
+from pathlib import Path
+
+from .config import FILE_ENCODING
+from .core.exceptions import SubtuneError
+from .core.workflow import ShiftResult, SubtitleProcessor
+
+logger = logging.getLogger("subtune")
+logger.addHandler(logging.NullHandler())
+
+_processor = SubtitleProcessor(on_warning=logger.warning)
+
+
+def shift_file(
+    input_path,
+    output_path=None,
+    offset_ms=0,
+    create_backup=False,
+    on_warning=None,
+    build_state=None,
+    skip_identical=False,
+    repair_options=None,
+    seek_index=False,
+):
+    """Shift a subtitle file, writing in place when ``output_path`` is omitted.
+
+    With ``skip_identical`` an output whose content would not change is left
+    untouched (``result.unchanged``). With a ``BuildState`` the call is skipped
+    entirely when the output is up to date (``result.up_to_date``). With
+    ``RepairOptions`` overlaps and gaps are repaired and counted in ``result.repair``.
+    With ``seek_index`` a seek index sidecar is written alongside the output, so
+    ``read_window`` can jump straight into it.
+    """
+    input_path = Path(input_path)
+    output_path = Path(output_path) if output_path is not None else input_path
+
+    result = _processor.shift_file(
+        input_path,
+        output_path,
+        offset_ms,
+        create_backup,
+        build_state,
+        skip_identical,
+        repair_options,
+        seek_index=seek_index,
+    )
+    notify(result, on_warning)
+
+    return result
+
+
+def shift_text(content, offset_ms, on_warning=None, repair_options=None):
+    """Shift SRT content held in a string; the shifted text is in ``result.content``."""
+    result = _processor.shift_text(content, offset_ms, repair_options)
+    notify(result, on_warning)
+
+    return result
+
+
+def shift_bytes(data, offset_ms, encoding=FILE_ENCODING, on_warning=None, repair_options=None):
+    """Shift encoded SRT content; the shifted bytes are in ``result.content``."""
+    result = _processor.shift_bytes(data, offset_ms, encoding, repair_options)
+    notify(result, on_warning)
+
+    return result
+
+
+def shift_many(
+    jobs,
+    create_backup=False,
+    on_warning=None,
+    raise_on_error=False,
+    build_state=None,
+    skip_identical=False,
+    repair_options=None,
+    seek_index=False,
+):
+    """Shift several files given as ``(input_path, output_path, offset_ms)`` tuples.
+
+    Failures are recorded in ``result.error`` and do not stop the batch unless
+    ``raise_on_error`` is set.
+    """
+    results = []
+
+    for input_path, output_path, offset_ms in jobs:
+        try:
+            result = shift_file(
+                input_path,
+                output_path,
+                offset_ms,
+                create_backup,
+                on_warning,
+                build_state,
+                skip_identical,
+                repair_options,
+                seek_index,
+            )
+        except SubtuneError as e:
+            if raise_on_error:
+                raise
+            logger.error("Could not shift %s: %s", input_path, e)
+            result = ShiftResult(input_path=Path(input_path), output_path=output_path, error=e)
+        results.append(result)
+
+    return results
+
+
+def notify(result, on_warning):
+    """Log dropped blocks and pass ``result.warnings`` on to ``on_warning``."""
+
+    if result.dropped_blocks:
+        logger.debug("Dropped %d malformed subtitle blocks", result.dropped_blocks)
+
+    if on_warning is not None:
+        for warning in result.warnings:
+            on_warning(warning)
@@ -1,15 +1,46 @@
+import json
+import signal
 import sys
+import threading
 from argparse import ArgumentParser
+from dataclasses import asdict
 from pathlib import Path
 
+from .config import (
+    ALIGN_MAX_OFFSET_MS,
+    FOLLOW_POLL_INTERVAL,
+    HLS_PLAYLIST_NAME,
+    HLS_SEGMENT_SECONDS,
+    INCREMENTAL_STATE_FILE,
+    LEDGER_SUFFIX,
+    SEARCH_INDEX_FILE,
+    SEARCH_RESULT_LIMIT,
+    UNDO_JOURNAL_FILE,
+)
+from .core.align import align_to_audio, apply_alignment
+from .core.archive import shift_archive
+from .core.codec import format_timing_line
+from .core.dedup import DEDUPE_MODES
+from .core.diff import DIFF_ALIGNMENTS, library_diff
 from .core.exceptions import (
+    UNEXPECTED_ERROR_EXIT_CODE,
     FileProcessingError,
     InvalidOffsetError,
-    InvalidSRTFormatError,
-    InvalidTimestampError,
     SubtuneError,
+    describe_error,
 )
+from .core.follow import follow
+from .core.hls import segment_hls
+from .core.incremental import BuildState
+from .core.jobs import JobLedger, load_manifest, run_jobs
+from .core.journal import UndoJournal, undo_shift
+from .core.multitrack import estimate_offset, expand_tracks, sync_tracks
+from .core.repair import STACKED_POLICIES, RepairOptions
+from .core.search import SubtitleIndex
+from .core.stats import library_stats
 from .core.workflow import SubtitleProcessor
+from .utils.metrics import Metrics
+from .utils.profiling import PROFILE_MODES, Profiler
 
 
 def create_parser():
@@ -19,7 +50,9 @@ def create_parser():
         epilog="Examples:\n"
         "  subtune input.srt --offset 2000 --output output.srt  # Shift forward 2 seconds\n"
         "  subtune input.srt -o -1500 --backup                  # Shift back 1.5s with backup\n"
-        "  subtune input.srt -o 500                             # Shift forward 0.5s in-place",
+        "  subtune input.srt -o 500                             # Shift forward 0.5s in-place\n"
+        "\n"
+        f"Other commands: {', '.join(COMMANDS)} (see 'subtune <command> --help')",
         formatter_class=ArgumentParser().formatter_class,
     )
 
@@ -42,53 +75,1050 @@ def create_parser():
         help="Create backup of input file before modification",
     )
 
+    parser.add_argument(
+        "--journal",
+        action="store_true",
+        help="Record the shift in the undo journal so 'subtune undo' can reverse it "
+        "(in-place shifts only)",
+    )
+
+    parser.add_argument(
+        "--seek-index",
+        action="store_true",
+        help="Write a seek index next to the output for fast windowed reads "
+        "(uncompressed outputs only)",
+    )
+
+    add_journal_argument(parser)
+    add_repair_arguments(parser)
+    add_incremental_arguments(parser)
+    add_metrics_arguments(parser)
+
     parser.add_argument("--version", action="version", version="%(prog)s 0.1.0")
 
     return parser
 
 
-def main():
-    parser = create_parser()
+def add_repair_arguments(parser):
+    parser.add_argument(
+        "--fix-overlaps",
+        action="store_true",
+        help="Trim cues that overlap the next cue",
+    )
+
+    parser.add_argument(
+        "--min-gap",
+        type=int,
+        default=0,
+        help="Minimum gap in milliseconds between consecutive cues (default: 0)",
+    )
+
+    parser.add_argument(
+        "--min-duration",
+        type=int,
+        default=0,
+        help="Minimum cue duration in milliseconds (default: 0)",
+    )
+
+    parser.add_argument(
+        "--stacked",
+        choices=STACKED_POLICIES,
+        default="keep",
+        help="How to treat cues sharing a start time: keep, merge into one cue, or "
+        "trim like other overlaps (needs --fix-overlaps) (default: keep)",
+    )
+
+    parser.add_argument(
+        "--sort",
+        action="store_true",
+        help="Sort cues by start time, spilling to temp files for huge inputs",
+    )
+
+    parser.add_argument(
+        "--renumber",
+        action="store_true",
+        help="Renumber cues sequentially from 1",
+    )
+
+
+def check_repair_arguments(parser, args):
+    if getattr(args, "stacked", "keep") == "trim" and not args.fix_overlaps:
+        parser.error("--stacked trim needs --fix-overlaps")
+
+
+def add_incremental_arguments(parser):
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Skip outputs that are up to date and leave identical outputs untouched",
+    )
+
+    parser.add_argument(
+        "--state",
+        default=INCREMENTAL_STATE_FILE,
+        help=f"Incremental state file (default: {INCREMENTAL_STATE_FILE})",
+    )
+
+
+def add_journal_argument(parser):
+    parser.add_argument(
+        "--journal-file",
+        default=UNDO_JOURNAL_FILE,
+        help=f"Undo journal file (default: {UNDO_JOURNAL_FILE})",
+    )
+
+
+def add_metrics_arguments(parser):
+    parser.add_argument(
+        "--metrics-file",
+        help="Write Prometheus metrics to this file (e.g. for the node exporter "
+        "textfile collector), even when the run fails",
+    )
+
+
+def add_profile_arguments(parser):
+    parser.add_argument(
+        "--profile",
+        metavar="PREFIX",
+        help="Profile the command, writing PREFIX.pstats and PREFIX.collapsed "
+        "(flame graph stacks); worker processes are included",
+    )
+    parser.add_argument(
+        "--profile-mode",
+        choices=PROFILE_MODES,
+        default="cprofile",
+        help="cprofile traces every call; sample records stacks periodically at "
+        "lower overhead and writes only PREFIX.collapsed (default: cprofile)",
+    )
+
+
+def create_merge_parser():
+    parser = ArgumentParser(
+        prog="subtune merge",
+        description="Merge SRT files into a single track ordered by start time",
+        epilog="Examples:\n"
+        "  subtune merge dialogue.srt signs.srt --output full.srt\n"
+        "  subtune merge en.srt es.srt -o 0 -o 250 --output bilingual.srt",
+        formatter_class=ArgumentParser().formatter_class,
+    )
+
+    parser.add_argument("input_files", nargs="+", help="Input SRT file paths")
+
+    parser.add_argument("--output", required=True, help="Merged output file path")
+
+    parser.add_argument(
+        "-o",
+        "--offset",
+        type=int,
+        action="append",
+        dest="offsets",
+        help="Time offset in milliseconds for the matching input (repeat once per input)",
+    )
+
+    return parser
+
+
+def create_archive_parser():
+    parser = ArgumentParser(
+        prog="subtune archive",
+        description="Shift every SRT file inside a zip or tar archive into a new archive",
+        epilog="Examples:\n"
+        "  subtune archive pack.zip -o 1500 --output shifted.zip\n"
+        "  subtune archive pack.tar.gz -o -500 --output shifted.tar.xz --workers 4",
+        formatter_class=ArgumentParser().formatter_class,
+    )
+
+    parser.add_argument("input_archive", help="Input zip or tar archive (tar may be compressed)")
+
+    parser.add_argument(
+        "-o",
+        "--offset",
+        type=int,
+        required=True,
+        help="Time offset in milliseconds (positive=forward, negative=backward)",
+    )
+
+    parser.add_argument(
+        "--output",
+        help="Output archive path; .zip, .tar, .tar.gz, .tar.bz2 or .tar.xz "
+        "(default: replace input archive)",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes shifting members (default: 1)",
+    )
+
+    add_repair_arguments(parser)
+
+    return parser
+
+
+def create_hls_parser():
+    parser = ArgumentParser(
+        prog="subtune hls",
+        description="Split subtitles into fixed-duration WebVTT segments with an HLS playlist",
+        epilog="Examples:\n"
+        "  subtune hls movie.srt hls/subs/\n"
+        "  subtune hls movie.srt hls/subs/ -o 1500 --segment-duration 4 --duration 5400",
+        formatter_class=ArgumentParser().formatter_class,
+    )
+
+    parser.add_argument("input_file", help="Input SRT file path")
+
+    parser.add_argument("output_dir", help=f"Directory for segments and {HLS_PLAYLIST_NAME}")
+
+    parser.add_argument(
+        "-o",
+        "--offset",
+        type=int,
+        default=0,
+        help="Time offset in milliseconds applied before segmenting (default: 0)",
+    )
+
+    parser.add_argument(
+        "--segment-duration",
+        type=float,
+        default=HLS_SEGMENT_SECONDS,
+        help=f"Segment length in seconds (default: {HLS_SEGMENT_SECONDS})",
+    )
+
+    parser.add_argument(
+        "--duration",
+        type=float,
+        help="Programme length in seconds to cover (default: until the last cue ends)",
+    )
+
+    parser.add_argument(
+        "--mpegts",
+        type=int,
+        help="Add an X-TIMESTAMP-MAP header mapping time zero to this MPEG-TS timestamp",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of threads writing segments (default: 1)",
+    )
+
+    return parser
+
+
+def create_align_parser():
+    parser = ArgumentParser(
+        prog="subtune align",
+        description="Sync an SRT file to the speech in an audio track (needs NumPy)",
+        epilog="Examples:\n"
+        "  subtune align movie.srt --audio movie.wav --backup\n"
+        "  subtune align movie.srt --audio movie.wav --drift --output fixed.srt",
+        formatter_class=ArgumentParser().formatter_class,
+    )
+
+    parser.add_argument("input_file", help="Input SRT file path")
+
+    parser.add_argument("--audio", required=True, help="PCM WAV file with the dialogue")
+
+    parser.add_argument("--output", help="Output file path (default: modify input file in-place)")
+
+    parser.add_argument(
+        "--max-offset",
+        type=float,
+        default=ALIGN_MAX_OFFSET_MS / 1000,
+        help=f"Largest offset to consider, in seconds (default: {ALIGN_MAX_OFFSET_MS // 1000})",
+    )
+
+    parser.add_argument(
+        "--drift",
+        action="store_true",
+        help="Also try common frame rate conversions (e.g. 23.976 vs 25 fps)",
+    )
+
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only report the estimated correction",
+    )
+
+    parser.add_argument(
+        "-b",
+        "--backup",
+        action="store_true",
+        help="Create backup of input file before modification",
+    )
+
+    return parser
+
+
+def create_sync_parser():
+    parser = ArgumentParser(
+        prog="subtune sync",
+        description="Apply one offset to every language track of a title",
+        epilog="Examples:\n"
+        "  subtune sync 'movie/*.srt' -o 1500 --output-dir synced/\n"
+        "  subtune sync 'movie/*.srt' --reference fixed.en.srt --anchor movie/en.srt -j 8",
+        formatter_class=ArgumentParser().formatter_class,
+    )
+
+    parser.add_argument("tracks", nargs="+", help="Track files or glob patterns")
+
+    parser.add_argument(
+        "-o",
+        "--offset",
+        type=int,
+        help="Time offset in milliseconds (positive=forward, negative=backward)",
+    )
+
+    parser.add_argument(
+        "--reference",
+        help="Correctly timed track to estimate the offset from (instead of --offset)",
+    )
+
+    parser.add_argument(
+        "--anchor",
+        help="Track compared against --reference to estimate the offset",
+    )
+
+    parser.add_argument(
+        "--output-dir",
+        help="Directory for synced tracks (default: modify tracks in-place)",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1)",
+    )
+
+    add_repair_arguments(parser)
+
+    return parser
+
+
+def create_follow_parser():
+    parser = ArgumentParser(
+        prog="subtune follow",
+        description="Shift cues of a growing SRT file into an output file as they arrive",
+        epilog="Examples:\n"
+        "  subtune follow live.srt -o 2000 shifted.srt\n"
+        "  subtune follow live.srt -o -500 shifted.srt --idle-timeout 600",
+        formatter_class=ArgumentParser().formatter_class,
+    )
+
+    parser.add_argument("input_file", help="SRT file being appended to")
+
+    parser.add_argument(
+        "-o",
+        "--offset",
+        type=int,
+        required=True,
+        help="Time offset in milliseconds (positive=forward, negative=backward)",
+    )
+
+    parser.add_argument("output_file", help="Output SRT file, rewritten from the start")
+
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        help="Stop after this many seconds without new input (default: run until interrupted)",
+    )
+
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=FOLLOW_POLL_INTERVAL,
+        help=f"Seconds between checks for new input (default: {FOLLOW_POLL_INTERVAL})",
+    )
+
+    return parser
+
+
+def create_run_parser():
+    parser = ArgumentParser(
+        prog="subtune run",
+        description="Run shift jobs from a CSV or JSON Lines manifest, resuming after interruption",
+        epilog="Manifest columns: input, output (optional, default in-place), offset, backup\n"
+        "\n"
+        "Examples:\n"
+        "  subtune run jobs.csv --workers 8\n"
+        "  subtune run jobs.jsonl --ledger progress.sqlite",
+        formatter_class=ArgumentParser().formatter_class,
+    )
+
+    parser.add_argument("manifest", help="Job manifest (.csv, .jsonl or .ndjson)")
+
+    parser.add_argument(
+        "--ledger",
+        help=f"Progress ledger path (default: manifest path + {LEDGER_SUFFIX})",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1)",
+    )
+
+    parser.add_argument(
+        "--io-threads",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Overlap reads and writes with shifting using N threads each (default: off)",
+    )
+
+    parser.add_argument(
+        "--dedupe",
+        nargs="?",
+        const="link",
+        choices=DEDUPE_MODES,
+        help="Shift byte-identical inputs once and hard link (default) or copy the other outputs",
+    )
+
+    add_incremental_arguments(parser)
+    add_metrics_arguments(parser)
+
+    return parser
+
+
+def create_stats_parser():
+    parser = ArgumentParser(
+        prog="subtune stats",
+        description="Report timing statistics for SRT files or whole libraries",
+        epilog="Examples:\n  subtune stats movie.srt\n  subtune stats library/ --workers 8 --json",
+        formatter_class=ArgumentParser().formatter_class,
+    )
+
+    parser.add_argument("paths", nargs="+", help="SRT files or directories to scan")
+
+    parser.add_argument("--json", action="store_true", help="Print statistics as JSON")
+
+    parser.add_argument(
+        "--per-file",
+        action="store_true",
+        help="Also report statistics for every file",
+    )
+
+    parser.add_argument(
+        "--seek-index",
+        action="store_true",
+        help="Save a sparse seek index beside each file for fast random access",
+    )
+
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1)",
+    )
+
+    return parser
+
+
+def create_diff_parser():
+    parser = ArgumentParser(
+        prog="subtune diff",
+        description="Compare cue timings of two SRT files, or of two directories "
+        "of same-named files, and classify the difference as an offset or drift",
+        epilog="Examples:\n"
+        "  subtune diff before.srt after.srt --cues\n"
+        "  subtune diff original/ shifted/ --expect-offset 1500 --workers 8",
+        formatter_class=ArgumentParser().formatter_class,
+    )
+
+    parser.add_argument("first", help="Original SRT file or directory")
+    parser.add_argument("second", help="Changed SRT file or directory")
+
+    parser.add_argument(
+        "--by",
+        choices=DIFF_ALIGNMENTS,
+        default="auto",
+        help="Pair cues by subtitle number or by text (default: auto, numbers when "
+        "both files are numbered alike)",
+    )
+
+    parser.add_argument(
+        "--cues",
+        action="store_true",
+        help="Also list start and end deltas for every matched cue",
+    )
+
+    parser.add_argument(
+        "--expect-offset",
+        type=int,
+        metavar="MS",
+        help="Fail unless every pair differs by exactly this constant offset",
+    )
+
+    parser.add_argument("--json", action="store_true", help="Print the comparison as JSON")
+
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1)",
+    )
+
+    return parser
+
+
+def create_index_parser():
+    parser = ArgumentParser(
+        prog="subtune index",
+        description="Build or update a full-text search index of cue text",
+        epilog="Examples:\n  subtune index library/\n  subtune index a.srt b.srt --index cues.sqlite",
+        formatter_class=ArgumentParser().formatter_class,
+    )
+
+    parser.add_argument("paths", nargs="+", help="SRT files or directories to index")
+
+    add_index_argument(parser)
+
+    return parser
+
+
+def create_undo_parser():
+    parser = ArgumentParser(
+        prog="subtune undo",
+        description="Reverse in-place shifts recorded with --journal",
+        epilog="Examples:\n"
+        "  subtune undo movie.srt          # Undo the latest shift of movie.srt\n"
+        "  subtune undo --all              # Restore every journaled file to its original",
+        formatter_class=ArgumentParser().formatter_class,
+    )
+
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Files to restore (default: every file in the journal)",
+    )
+
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Undo every journaled shift of each file, not just the latest",
+    )
+
+    add_journal_argument(parser)
+
+    return parser
+
+
+def create_search_parser():
+    parser = ArgumentParser(
+        prog="subtune search",
+        description="Search indexed cue text (SQLite FTS5 query syntax)",
+        epilog="Examples:\n"
+        "  subtune search 'where is'\n"
+        "  subtune search '\"we need to talk\"' --json\n"
+        "  subtune search 'hello NOT goodbye' --limit 10",
+        formatter_class=ArgumentParser().formatter_class,
+    )
+
+    parser.add_argument("query", help='Words, "phrases", prefix* or boolean FTS5 queries')
+
+    add_index_argument(parser)
+
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=SEARCH_RESULT_LIMIT,
+        help=f"Maximum number of results (default: {SEARCH_RESULT_LIMIT})",
+    )
+
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+
+    return parser
+
+
+def add_index_argument(parser):
+    parser.add_argument(
+        "--index",
+        default=SEARCH_INDEX_FILE,
+        help=f"Search index file (default: {SEARCH_INDEX_FILE})",
+    )
+
+
+def run_shift(args):
+    input_path = Path(args.input_file)
+    output_path = Path(args.output) if args.output else input_path
+
+    metrics = Metrics() if args.metrics_file else None
+    processor = SubtitleProcessor(metrics=metrics)
+    repair_options = repair_options_from_args(args)
 
     try:
-        args = parser.parse_args()
+        if args.incremental:
+            run_incremental_shift(processor, args, input_path, output_path, repair_options)
+        else:
+            run_plain_shift(processor, args, input_path, output_path, repair_options)
+    except BaseException:
+        write_metrics_after_error(metrics, args.metrics_file)
+        raise
 
-        input_path = Path(args.input_file)
-        output_path = Path(args.output) if args.output else input_path
+    if metrics is not None:
+        metrics.write(args.metrics_file)
 
-        processor = SubtitleProcessor()
 
+def run_plain_shift(processor, args, input_path, output_path, repair_options):
+    journal = UndoJournal(Path(args.journal_file)) if args.journal else None
+    try:
         processor.shift_srt_file(
             input_path=input_path,
             output_path=output_path,
             offset_ms=args.offset,
             create_backup=args.backup,
+            repair_options=repair_options,
+            journal=journal,
+            seek_index=args.seek_index,
+        )
+    finally:
+        if journal is not None:
+            journal.close()
+
+    if args.output:
+        print(f"Shifted timestamps by {args.offset}ms and saved to {args.output}")
+    else:
+        print(f"Shifted timestamps by {args.offset}ms in-place")
+
+
+def write_metrics_after_error(metrics, metrics_file):
+    # The run's own error and exit code win; a metrics failure is only reported
+    if metrics is None:
+        return
+    try:
+        metrics.write(metrics_file)
+    except SubtuneError as e:
+        print(f"Warning: {e}", file=sys.stderr)
+
+
+def repair_options_from_args(args):
+    if not (
+        args.fix_overlaps
+        or args.min_gap
+        or args.min_duration
+        or args.stacked != "keep"
+        or args.sort
+        or args.renumber
+    ):
+        return None
+
+    return RepairOptions(
+        fix_overlaps=args.fix_overlaps,
+        min_gap_ms=args.min_gap,
+        min_duration_ms=args.min_duration,
+        stacked=args.stacked,
+        sort=args.sort,
+        renumber=args.renumber,
+    )
+
+
+def run_incremental_shift(processor, args, input_path, output_path, repair_options):
+    build_state = BuildState(Path(args.state))
+    try:
+        result = processor.shift_file(
+            input_path,
+            output_path,
+            args.offset,
+            args.backup,
+            build_state=build_state,
+            repair_options=repair_options,
+            seek_index=args.seek_index,
         )
+    finally:
+        build_state.close()
+
+    if result.backup_path:
+        print(f"Created backup: {result.backup_path}")
+
+    if result.up_to_date:
+        print(f"Output is up to date: {output_path}")
+    elif result.unchanged:
+        print(f"Output already has the shifted content, left untouched: {output_path}")
+    else:
+        print(f"Shifted timestamps by {args.offset}ms and saved to {output_path}")
+
+    if result.repair is not None:
+        print(f"Repaired timings: {result.repair.summary()}")
+
+
+def run_merge(args):
+    processor = SubtitleProcessor()
+
+    processor.merge_srt_files(
+        input_paths=[Path(input_file) for input_file in args.input_files],
+        output_path=Path(args.output),
+        offsets_ms=args.offsets,
+    )
+
+    print(f"Merged {len(args.input_files)} files into {args.output}")
+
+
+def run_archive(args):
+    input_path = Path(args.input_archive)
+    output_path = Path(args.output) if args.output else input_path
+
+    summary = shift_archive(
+        input_path,
+        output_path,
+        args.offset,
+        workers=args.workers,
+        repair_options=repair_options_from_args(args),
+    )
 
-        if args.output:
-            print(f"Shifted timestamps by {args.offset}ms and saved to {args.output}")
+    for member_name, _exit_code, error in summary.failures:
+        print(f"{input_path}:{member_name}: {error}", file=sys.stderr)
+    for member_name in summary.skipped:
+        print(
+            f"Warning: {input_path}:{member_name}: left out, not supported in {output_path}",
+            file=sys.stderr,
+        )
+
+    print(
+        f"Shifted {summary.subtitle_count} subtitles in {summary.shifted} files, "
+        f"copied {summary.copied} other members unchanged, saved to {output_path}"
+    )
+
+    if summary.failures:
+        sys.exit(max(exit_code for _member_name, exit_code, _error in summary.failures))
+
+
+def run_hls(args):
+    summary = segment_hls(
+        Path(args.input_file),
+        Path(args.output_dir),
+        args.offset,
+        segment_seconds=args.segment_duration,
+        duration_ms=None if args.duration is None else round(args.duration * 1000),
+        workers=args.workers,
+        mpegts=args.mpegts,
+    )
+
+    print(
+        f"Wrote {summary.segments} segments with {summary.cues} cues "
+        f"({summary.cue_placements} placements), playlist: {summary.playlist_path}"
+    )
+
+
+def run_align(args):
+    input_path = Path(args.input_file)
+    output_path = Path(args.output) if args.output else input_path
+
+    alignment = align_to_audio(
+        input_path, Path(args.audio), max_offset_ms=round(args.max_offset * 1000), drift=args.drift
+    )
+    speed = f", speed factor {alignment.factor:.5f}" if alignment.factor != 1.0 else ""
+    print(f"Estimated offset {alignment.offset_ms:+d}ms{speed} (correlation {alignment.score:.2f})")
+    if args.dry_run:
+        return
+
+    count = apply_alignment(input_path, output_path, alignment, create_backup=args.backup)
+    print(f"Aligned {count} subtitles and saved to {output_path}")
+
+
+def run_sync(args):
+    if (args.offset is None) == (args.reference is None):
+        raise InvalidOffsetError("Give exactly one of --offset or --reference")
+    if args.reference is not None and args.anchor is None:
+        raise InvalidOffsetError("--reference needs --anchor, the track to compare it with")
+
+    tracks = expand_tracks(args.tracks)
+    offset_ms = args.offset
+    if offset_ms is None:
+        offset_ms = estimate_offset(Path(args.reference), Path(args.anchor))
+        print(f"Estimated offset from {args.reference}: {offset_ms}ms")
+
+    reports = sync_tracks(
+        tracks,
+        offset_ms,
+        output_dir=args.output_dir,
+        workers=args.workers,
+        repair_options=repair_options_from_args(args),
+    )
+
+    for report in reports:
+        if report.ok:
+            repaired = f", repaired: {report.repair.summary()}" if report.repair else ""
+            print(
+                f"{report.track}: {report.subtitle_count} subtitles -> {report.output_path}{repaired}"
+            )
         else:
-            print(f"Shifted timestamps by {args.offset}ms in-place")
+            print(f"{report.track}: {report.error}", file=sys.stderr)
+
+    failed = [report for report in reports if not report.ok]
+    print(f"Shifted {len(reports) - len(failed)} of {len(reports)} tracks by {offset_ms}ms")
 
-    except FileProcessingError as e:
-        print(f"File error: {e}", file=sys.stderr)
-        sys.exit(1)
+    if failed:
+        sys.exit(max(report.exit_code for report in failed))
+
+
+def run_follow(args):
+    # Ctrl-C ends the session cleanly, writing any cue still pending
+    stop = threading.Event()
+    previous_handler = signal.signal(signal.SIGINT, lambda *_: stop.set())
+    try:
+        summary = follow(
+            Path(args.input_file),
+            Path(args.output_file),
+            args.offset,
+            stop=stop,
+            idle_timeout=args.idle_timeout,
+            poll_interval=args.poll_interval,
+        )
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+
+    details = [f"{summary.dropped_blocks} skipped"] if summary.dropped_blocks else []
+    if summary.truncations:
+        details.append(f"{summary.truncations} truncations")
+    if summary.rotations:
+        details.append(f"{summary.rotations} rotations")
+    print(
+        f"Followed {args.input_file}: {summary.cues} cues written to {args.output_file}"
+        + (f" ({', '.join(details)})" if details else "")
+    )
 
-    except InvalidSRTFormatError as e:
-        print(f"SRT format error: {e}", file=sys.stderr)
-        sys.exit(2)
 
-    except InvalidTimestampError as e:
-        print(f"Timestamp error: {e}", file=sys.stderr)
-        sys.exit(3)
+def run_manifest(args):
+    manifest_path = Path(args.manifest)
+    ledger_path = Path(args.ledger) if args.ledger else Path(f"{manifest_path}{LEDGER_SUFFIX}")
 
-    except InvalidOffsetError as e:
-        print(f"Offset error: {e}", file=sys.stderr)
-        sys.exit(4)
+    jobs = load_manifest(manifest_path)
+    ledger = JobLedger(ledger_path)
+    metrics = Metrics() if args.metrics_file else None
+    try:
+        summary = run_jobs(
+            jobs,
+            ledger,
+            workers=args.workers,
+            on_outcome=_report_failed_job,
+            state_path=args.state if args.incremental else None,
+            metrics=metrics,
+            io_threads=args.io_threads,
+            dedupe=args.dedupe,
+        )
+    except BaseException:
+        write_metrics_after_error(metrics, args.metrics_file)
+        raise
+    finally:
+        ledger.close()
+
+    if metrics is not None:
+        metrics.write(args.metrics_file)
+
+    print(
+        f"Processed {summary.total} jobs: {summary.succeeded} succeeded, "
+        f"{summary.failed} failed, {summary.skipped} already done"
+        + (f", {summary.up_to_date} up to date" if args.incremental else "")
+    )
+    if args.dedupe and summary.succeeded:
+        unique = summary.succeeded - summary.deduplicated
+        print(
+            f"Deduplicated {summary.deduplicated} outputs from {unique} shifted files "
+            f"(ratio {summary.succeeded / max(unique, 1):.2f})"
+        )
+
+    if summary.failed:
+        sys.exit(summary.highest_exit_code)
+
+
+def _report_failed_job(outcome):
+    if outcome.status != "done":
+        print(f"{outcome.job.input_path}: {outcome.error}", file=sys.stderr)
+
+
+def run_index(args):
+    index = SubtitleIndex(Path(args.index))
+    try:
+        summary = index.update(args.paths)
+    finally:
+        index.close()
+
+    for file_path, _exit_code, error in summary.failed:
+        print(f"{file_path}: {error}", file=sys.stderr)
+
+    print(
+        f"Indexed {summary.cues} cues: {summary.added} files added, {summary.updated} updated, "
+        f"{summary.unchanged} unchanged, {summary.removed} removed, {len(summary.failed)} failed"
+    )
+
+    if summary.failed:
+        sys.exit(max(exit_code for _file_path, exit_code, _error in summary.failed))
+
+
+def run_undo(args):
+    journal_path = Path(args.journal_file)
+    if not journal_path.is_file():
+        raise FileProcessingError(f"Undo journal not found: {journal_path}")
+
+    journal = UndoJournal(journal_path)
+    failed = []
+    try:
+        paths = [Path(path) for path in args.paths] or journal.paths()
+        if not paths:
+            print("Nothing to undo")
+        for path in paths:
+            try:
+                while True:
+                    result = undo_shift(path, journal)
+                    note = "" if result.exact else " (cues restored, file not byte-identical)"
+                    print(f"Undid {result.offset_ms:+d}ms shift of {path}{note}")
+                    if not (args.all and result.remaining):
+                        break
+            except SubtuneError as e:
+                exit_code, label = describe_error(e)
+                print(f"{label}: {e}", file=sys.stderr)
+                failed.append(exit_code)
+    finally:
+        journal.close()
+
+    if failed:
+        sys.exit(max(failed))
+
+
+def run_search(args):
+    index_path = Path(args.index)
+    if not index_path.is_file():
+        raise FileProcessingError(f"Search index not found: {index_path} (run 'subtune index')")
+
+    index = SubtitleIndex(index_path)
+    try:
+        hits = index.search(args.query, limit=args.limit)
+    finally:
+        index.close()
+
+    if args.json:
+        print(json.dumps([asdict(hit) for hit in hits], indent=2, ensure_ascii=False))
+        return
+
+    for hit in hits:
+        text = hit.text.replace("\n", " / ")
+        print(f"{hit.path}:{hit.number}  {format_timing_line(hit.start_ms, hit.end_ms)}  {text}")
+
+    if not hits:
+        print("No matches")
+
+
+def run_stats(args):
+    total, per_file, errors = library_stats(
+        args.paths, workers=args.workers, seek_index=args.seek_index
+    )
+
+    for file_path, _exit_code, error in errors:
+        print(f"{file_path}: {error}", file=sys.stderr)
+
+    if args.json:
+        report = {"total": total.to_dict()}
+        if args.per_file:
+            report["files"] = {str(path): stats.to_dict() for path, stats in per_file}
+        print(json.dumps(report, indent=2))
+    else:
+        if args.per_file:
+            for file_path, stats in per_file:
+                print(f"{file_path}\n{stats.to_table()}\n")
+        print(total.to_table())
+
+    if errors:
+        sys.exit(max(exit_code for _file_path, exit_code, _error in errors))
+
+
+def run_diff(args):
+    diffs, errors = library_diff(
+        args.first, args.second, by=args.by, workers=args.workers, keep_deltas=args.cues
+    )
+
+    for file_path, _exit_code, error in errors:
+        print(f"{file_path}: {error}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps([diff.to_dict() for diff in diffs], indent=2))
+    else:
+        for diff in diffs:
+            print(f"{diff.path_a} -> {diff.path_b}: {diff.summary()}")
+            for number_a, number_b, start_delta, end_delta in diff.deltas:
+                print(
+                    f"  #{number_a} -> #{number_b}  start {start_delta:+d}ms  end {end_delta:+d}ms"
+                )
+
+    if args.expect_offset is not None:
+        # Both kinds allow DIFF_TOLERANCE_MS of jitter, so 0 is gated like any other offset
+        mismatched = [
+            diff
+            for diff in diffs
+            if diff.kind not in ("identical", "offset") or diff.offset_ms != args.expect_offset
+        ]
+        if mismatched:
+            raise SubtuneError(
+                f"{len(mismatched)} of {len(diffs)} pairs are not shifted by exactly "
+                f"{args.expect_offset}ms"
+            )
+
+    if errors:
+        sys.exit(max(exit_code for _file_path, exit_code, _error in errors))
+
+
+COMMANDS = {
+    "align": (create_align_parser, run_align),
+    "archive": (create_archive_parser, run_archive),
+    "diff": (create_diff_parser, run_diff),
+    "follow": (create_follow_parser, run_follow),
+    "hls": (create_hls_parser, run_hls),
+    "index": (create_index_parser, run_index),
+    "merge": (create_merge_parser, run_merge),
+    "run": (create_run_parser, run_manifest),
+    "search": (create_search_parser, run_search),
+    "stats": (create_stats_parser, run_stats),
+    "sync": (create_sync_parser, run_sync),
+    "undo": (create_undo_parser, run_undo),
+}
+
+
+def parse_command(argv):
+    if argv and argv[0] in COMMANDS:
+        command_parser, handler = COMMANDS[argv[0]]
+        parser = command_parser()
+        argv = argv[1:]
+    else:
+        parser, handler = create_parser(), run_shift
+
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    check_repair_arguments(parser, args)
+    return handler, args
+
+
+def run_profiled(handler, args):
+    # The profile is also written when the command fails
+    with Profiler(args.profile, args.profile_mode) as profiler:
+        handler(args)
+
+    written = [profiler.collapsed_path]
+    if profiler.mode == "cprofile":
+        written.insert(0, profiler.pstats_path)
+    print(f"Profile written to {', '.join(map(str, written))}", file=sys.stderr)
+
+
+def main():
+    try:
+        handler, args = parse_command(sys.argv[1:])
+        if args.profile:
+            run_profiled(handler, args)
+        else:
+            handler(args)
 
     except SubtuneError as e:
-        print(f"Error: {e}", file=sys.stderr)
-        sys.exit(5)
+        exit_code, label = describe_error(e)
+        print(f"{label}: {e}", file=sys.stderr)
+        sys.exit(exit_code)
 
     except KeyboardInterrupt:
         print("\nOperation cancelled by user", file=sys.stderr)
@@ -96,7 +1126,7 @@ def main():
 
     except Exception as e:
         print(f"Unexpected error: {e}", file=sys.stderr)
-        sys.exit(99)
+        sys.exit(UNEXPECTED_ERROR_EXIT_CODE)
 
 
 if __name__ == "__main__":
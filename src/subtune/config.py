@@ -1,5 +1,7 @@
 """Configuration constants for subtune application."""
 
+VERSION = "1.0.0"
+
 # File validation settings
 MAX_FILE_SIZE_BYTES = 10 * 1024 * 1024  # 10MB warning threshold
 FILE_ENCODING = "utf-8"
@@ -14,9 +16,76 @@ MIN_OFFSET_MS = -86400000  # -24 hours in milliseconds
 SRT_TIMESTAMP_PATTERN = r"^\d{2}:\d{2}:\d{2},\d{3}$"
 SRT_TIMING_LINE_PATTERN = r"^(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})\s*$"
 
+# Subtitle texts up to this length are interned so repeated lines ("♪") share storage
+TEXT_INTERN_MAX_LENGTH = 32
+
 # File extension validation
 VALID_SRT_EXTENSIONS = [".srt", ".SRT"]
 
+# Compressed subtitle files, detected by magic bytes first and extension second
+COMPRESSION_MAGIC = {b"\x1f\x8b": "gzip", b"BZh": "bz2", b"\xfd7zXZ\x00": "xz"}
+COMPRESSION_EXTENSIONS = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+
+# External merge sort for out-of-order files
+SORT_RUN_SIZE = 100000  # cues sorted in memory per spilled run
+
+# Batch job manifests
+JSONL_MANIFEST_EXTENSIONS = [".jsonl", ".ndjson"]
+LEDGER_SUFFIX = ".ledger.sqlite"
+JOB_WINDOW_PER_WORKER = 4  # jobs queued per worker process
+
+# Async API
+ASYNC_CONCURRENCY = 8  # files shifted at once by the async batch functions
+
+# Follow mode for growing caption files
+FOLLOW_POLL_INTERVAL = 0.05  # seconds between checks for new input
+
+# Offset estimation between language tracks (sync --reference)
+SYNC_MAX_OFFSET_MS = 60000  # largest offset considered
+SYNC_VOTE_BUCKET_MS = 100  # width of the offset histogram buckets
+SYNC_MATCH_TOLERANCE_MS = 500  # how far a cue may sit from its reference cue once shifted
+
+# HLS WebVTT segmenting
+HLS_SEGMENT_SECONDS = 6
+HLS_PLAYLIST_NAME = "subtitles.m3u8"
+HLS_SEGMENT_NAME = "segment{index:05d}.vtt"
+
+# Audio alignment (align --audio)
+ALIGN_FRAME_MS = 10  # envelope resolution; audio is reduced to one value per frame
+ALIGN_BLOCK_FRAMES = 1 << 18  # audio frames read per block
+ALIGN_MAX_OFFSET_MS = 120000
+ALIGN_DRIFT_FACTORS = (25 / 23.976, 23.976 / 25, 24 / 23.976, 23.976 / 24, 25 / 24, 24 / 25)
+
+# Profiling (--profile)
+PROFILE_SAMPLE_INTERVAL = 0.005  # seconds between stack samples in sample mode
+PROFILE_MAX_DEPTH = 128  # frames kept per collapsed stack
+
+# Metrics export
+METRICS_PREFIX = "subtune"
+METRICS_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 60.0)
+
+# Incremental processing state
+INCREMENTAL_STATE_FILE = ".subtune-state.sqlite"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Undo journal of in-place shifts
+UNDO_JOURNAL_FILE = ".subtune-journal.sqlite"
+
+# Full-text search index
+SEARCH_INDEX_FILE = ".subtune-index.sqlite"
+SEARCH_RESULT_LIMIT = 50
+
+# Sparse seek index sidecars for random access into large files
+SEEK_INDEX_SUFFIX = ".seekidx"
+SEEK_INDEX_INTERVAL = 256  # one entry per this many cues
+
+# Timing statistics
+STATS_BUCKET_MS = 10  # histogram resolution for duration and gap percentiles
+STATS_PERCENTILES = (50, 90, 99)
+
+# Timing diffs
+DIFF_TOLERANCE_MS = 1  # deviation still counted as a constant offset or clean drift
+
 # Size calculation constants
 BYTES_PER_MB = 1024 * 1024
 
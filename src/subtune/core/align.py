@@ -0,0 +1,188 @@
+import wave
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..config import ALIGN_BLOCK_FRAMES, ALIGN_DRIFT_FACTORS, ALIGN_FRAME_MS, ALIGN_MAX_OFFSET_MS
+from ..utils.backup import BackupManager
+from .exceptions import FileProcessingError, InvalidOffsetError, SubtuneError
+from .validator import FileValidator
+from .workflow import SubtitleProcessor
+
+
+@dataclass(frozen=True)
+class AudioAlignment:
+    """Timing correction that best matches a subtitle file to an audio track.
+
+    A cue at ``t`` ms belongs at ``t * factor + offset_ms``. ``score`` is the
+    normalized correlation between speech activity and cue activity there.
+    """
+
+    offset_ms: int
+    factor: float
+    score: float
+
+    def apply(self, subtitles):
+        for subtitle in subtitles:
+            yield subtitle.retime(
+                round(subtitle.start_ms * self.factor) + self.offset_ms,
+                round(subtitle.end_ms * self.factor) + self.offset_ms,
+            )
+
+
+def align_to_audio(
+    srt_path, wav_path, max_offset_ms=ALIGN_MAX_OFFSET_MS, drift=False, frame_ms=ALIGN_FRAME_MS
+):
+    """Find the offset, and with ``drift`` the speed factor, syncing cues to the audio.
+
+    The WAV file is reduced to a speech activity envelope at one value per
+    ``frame_ms``, and the cues to a matching on/off signal. The offset within
+    ``max_offset_ms`` that maximizes their cross-correlation wins; with
+    ``drift`` the common frame rate conversions in ``ALIGN_DRIFT_FACTORS`` are
+    tried as well. Needs NumPy.
+    """
+    if max_offset_ms <= 0:
+        raise InvalidOffsetError(f"Maximum offset must be positive: {max_offset_ms}ms")
+
+    np = _numpy()
+
+    srt_path, wav_path = Path(srt_path), Path(wav_path)
+    FileValidator.validate_input_file(srt_path)
+    FileValidator.validate_input_file(wav_path)
+    cues = [
+        (subtitle.start_ms, subtitle.end_ms) for subtitle in FileValidator.iter_srt_file(srt_path)
+    ]
+    envelope, frame_seconds = speech_envelope(wav_path, frame_ms)
+
+    frame_ms = frame_seconds * 1000
+    max_lag = int(max_offset_ms / frame_ms)
+    best = None
+    for factor in (1.0, *ALIGN_DRIFT_FACTORS) if drift else (1.0,):
+        activity = cue_activity(cues, frame_ms, factor)
+        lag, score = _best_lag(np, envelope, activity, max_lag)
+        if best is None or score > best.score:
+            best = AudioAlignment(round(lag * frame_ms), factor, score)
+
+    return best
+
+
+def apply_alignment(input_path, output_path, alignment, create_backup=False, on_warning=None):
+    """Write ``input_path`` corrected by ``alignment`` and return the subtitle count.
+
+    A pure offset goes through ``SubtitleProcessor.shift_file``; a speed
+    factor retimes every cue on the way out instead.
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    if alignment.factor == 1.0:
+        processor = SubtitleProcessor(on_warning=on_warning)
+        return processor.shift_file(
+            input_path, output_path, alignment.offset_ms, create_backup
+        ).subtitle_count
+
+    FileValidator.validate_output_location(output_path)
+    if create_backup:
+        BackupManager.create_backup(input_path, on_warning=on_warning)
+    subtitles = FileValidator.iter_srt_file(input_path)
+    return FileValidator.write_subtitles(alignment.apply(subtitles), output_path)
+
+
+def speech_envelope(wav_path, frame_ms=ALIGN_FRAME_MS):
+    """Return ``(envelope, frame_seconds)`` for a PCM WAV file, read block by block.
+
+    Each value is the log energy of one frame mapped onto 0..1 between the
+    file's noise floor (10th percentile) and speech level (90th percentile).
+    Frames hold a whole number of samples, so ``frame_seconds`` can differ
+    slightly from ``frame_ms``.
+    """
+    np = _numpy()
+
+    try:
+        with wave.open(str(wav_path), "rb") as wav:
+            channels = wav.getnchannels()
+            width = wav.getsampwidth()
+            hop = max(round(wav.getframerate() * frame_ms / 1000), 1)
+            frame_seconds = hop / wav.getframerate()
+            block_frames = max(ALIGN_BLOCK_FRAMES // hop, 1) * hop
+
+            energies = []
+            while True:
+                data = wav.readframes(block_frames)
+                samples = _samples(np, data, width, channels)
+                usable = len(samples) // hop * hop
+                if not usable:
+                    break
+                frames = samples[:usable].reshape(-1, hop)
+                energies.append(np.einsum("ij,ij->i", frames, frames) / hop)
+    except (wave.Error, EOFError) as e:
+        raise SubtuneError(f"Cannot read {wav_path} as PCM WAV: {e}") from e
+    except OSError as e:
+        raise FileProcessingError(f"Error reading audio file: {e}") from e
+
+    if not energies:
+        raise SubtuneError(f"Audio file {wav_path} is too short to align against")
+
+    loudness = np.log10(np.concatenate(energies) + 1e-9)
+    floor, speech = np.percentile(loudness, [10, 90])
+    if speech - floor < 1e-6:
+        return np.zeros_like(loudness), frame_seconds
+    return np.clip((loudness - floor) / (speech - floor), 0, 1), frame_seconds
+
+
+def cue_activity(cues, frame_ms, factor=1.0):
+    """Return a 0/1 array marking the frames covered by any ``(start_ms, end_ms)`` cue."""
+    np = _numpy()
+
+    if not cues:
+        return np.zeros(1)
+
+    timings = np.asarray(cues, dtype=np.float64) * factor / frame_ms
+    starts = np.floor(timings[:, 0]).astype(np.int64)
+    ends = np.maximum(np.ceil(timings[:, 1]).astype(np.int64), starts + 1)
+
+    # Count cue starts minus cue ends up to each frame
+    edges = np.zeros(ends.max() + 1)
+    np.add.at(edges, starts, 1)
+    np.add.at(edges, ends, -1)
+    return (np.cumsum(edges)[:-1] > 0).astype(np.float64)
+
+
+def _best_lag(np, envelope, activity, max_lag):
+    # Zero-mean signals, so silence matching silence also counts; lags are
+    # found for all shifts at once through the FFT
+    audio = envelope - envelope.mean()
+    cues = activity - activity.mean()
+    size = 1 << (len(audio) + len(cues)).bit_length()
+    correlation = np.fft.irfft(np.fft.rfft(audio, size) * np.conj(np.fft.rfft(cues, size)), size)
+
+    # Only lags where the signals still overlap; larger ones would wrap around
+    lags = np.arange(max(-max_lag, 1 - len(cues)), min(max_lag, len(audio) - 1) + 1)
+    scores = correlation[lags % size]
+    best = int(np.argmax(scores))
+    norm = np.linalg.norm(audio) * np.linalg.norm(cues)
+    return int(lags[best]), float(scores[best] / norm) if norm else 0.0
+
+
+def _samples(np, data, width, channels):
+    if width == 1:
+        samples = np.frombuffer(data, dtype=np.uint8).astype(np.float32) - 128
+    elif width == 2:
+        samples = np.frombuffer(data, dtype="<i2").astype(np.float32)
+    elif width == 3:
+        raw = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        values = raw[:, 0] | (raw[:, 1] << 8) | (raw[:, 2] << 16)
+        samples = (values - ((values & 0x800000) << 1)).astype(np.float32)
+    elif width == 4:
+        samples = np.frombuffer(data, dtype="<i4").astype(np.float32)
+    else:
+        raise SubtuneError(f"Unsupported WAV sample width: {width} bytes")
+
+    return samples.reshape(-1, channels).mean(axis=1)
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise SubtuneError(
+            "Audio alignment needs NumPy; install it with: pip install 'subtune[audio]'"
+        ) from e
+    return numpy
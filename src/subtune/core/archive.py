@@ -0,0 +1,285 @@
+import io
+import logging
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ..config import JOB_WINDOW_PER_WORKER, TEMP_FILE_SUFFIX, VALID_SRT_EXTENSIONS
+from ..utils.compression import Compression
+from ..utils.profiling import process_pool
+from .exceptions import FileProcessingError, SubtuneError, describe_error
+from .validator import FileValidator
+from .workflow import SubtitleProcessor
+
+logger = logging.getLogger(__name__)
+
+_processor = SubtitleProcessor(on_warning=logger.warning)
+
+TAR_WRITE_MODES = {None: "w", "gzip": "w:gz", "bz2": "w:bz2", "xz": "w:xz"}
+TAR_SHORT_SUFFIXES = {".tgz": "gzip", ".tbz2": "bz2", ".txz": "xz"}
+
+
+@dataclass
+class ArchiveSummary:
+    """Counts for one archive run; ``failures`` holds ``(member, exit_code, message)``.
+
+    ``skipped`` names members the output format cannot hold, such as tar links
+    converted to zip.
+    """
+
+    members: int = 0
+    shifted: int = 0
+    copied: int = 0
+    subtitle_count: int = 0
+    failures: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)
+
+
+def shift_archive(input_path, output_path, offset_ms, workers=1, repair_options=None):
+    """Shift every SRT member of a zip or tar archive into a new archive.
+
+    Other members are copied unchanged, as are SRT members that fail to parse
+    (those are listed in ``failures``). Members the output format cannot hold,
+    like symlinks and hardlinks going from tar to zip, are left out and listed
+    in ``skipped``. Members are read and written one at a
+    time, and with ``workers`` > 1 a bounded window of them is shifted in
+    parallel while output order is preserved. The output format follows the
+    output extension (``.zip``, or ``.tar`` with optional compression) and the
+    output is replaced atomically.
+    """
+    FileValidator.validate_input_file(input_path)
+    FileValidator.validate_output_location(output_path)
+    FileValidator.validate_offset(offset_ms)
+
+    summary = ArchiveSummary()
+    temp_path = None
+
+    try:
+        with _open_reader(input_path) as reader:
+            with tempfile.NamedTemporaryFile(
+                delete=False, suffix=TEMP_FILE_SUFFIX, dir=output_path.parent
+            ) as temp_file:
+                temp_path = Path(temp_file.name)
+
+            with _open_writer(temp_path, output_path) as writer:
+                members = reader.members()
+                results = _shift_members(members, offset_ms, repair_options, workers)
+                for member, data, result in results:
+                    if writer.add(member, data):
+                        _record(summary, member, result)
+                    else:
+                        summary.members += 1
+                        summary.skipped.append(member.name)
+
+        shutil.move(str(temp_path), str(output_path))
+        return summary
+
+    except Exception as e:
+        if temp_path is not None and temp_path.exists():
+            temp_path.unlink()
+        if isinstance(e, SubtuneError):
+            raise
+        raise FileProcessingError(f"Error processing archive {input_path}: {e}") from e
+
+
+def is_srt_member(name):
+    extensions = {extension.lower() for extension in VALID_SRT_EXTENSIONS}
+    return Path(name).suffix.lower() in extensions
+
+
+def _record(summary, member, result):
+    summary.members += 1
+    if result is None:
+        summary.copied += 1
+        return
+
+    subtitle_count, exit_code, error = result
+    if error is None:
+        summary.shifted += 1
+        summary.subtitle_count += subtitle_count
+    else:
+        summary.copied += 1
+        summary.failures.append((member.name, exit_code, error))
+
+
+def _shift_members(members, offset_ms, repair_options, workers):
+    # Yields (member, data, result) in archive order; result is None for copied members
+    if workers <= 1:
+        for member, data in members:
+            if not member.is_srt:
+                yield member, data, None
+                continue
+            shifted, *result = _shift_member(data, offset_ms, repair_options)
+            yield member, shifted, tuple(result)
+        return
+
+    window = workers * JOB_WINDOW_PER_WORKER
+    with process_pool(workers) as executor:
+        in_flight = deque()
+        for member, data in members:
+            if member.is_srt:
+                in_flight.append(
+                    (member, executor.submit(_shift_member, data, offset_ms, repair_options))
+                )
+            else:
+                in_flight.append((member, data))
+            if len(in_flight) >= window:
+                yield _resolve(*in_flight.popleft())
+
+        while in_flight:
+            yield _resolve(*in_flight.popleft())
+
+
+def _resolve(member, pending):
+    if not member.is_srt:
+        return member, pending, None
+    shifted, *result = pending.result()
+    return member, shifted, tuple(result)
+
+
+def _shift_member(data, offset_ms, repair_options):
+    try:
+        result = _processor.shift_bytes(data, offset_ms, repair_options=repair_options)
+    except SubtuneError as e:
+        exit_code, label = describe_error(e)
+        return data, 0, exit_code, f"{label}: {e}"
+    return result.content, result.subtitle_count, 0, None
+
+
+@dataclass(frozen=True)
+class _Member:
+    name: str
+    info: object
+    is_srt: bool
+
+
+class _ZipReader:
+    def __init__(self, path):
+        self.archive = zipfile.ZipFile(path)
+
+    def members(self):
+        for info in self.archive.infolist():
+            data = None if info.is_dir() else self.archive.read(info)
+            yield (
+                _Member(info.filename, info, not info.is_dir() and is_srt_member(info.filename)),
+                data,
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.archive.close()
+
+
+class _TarReader:
+    def __init__(self, path):
+        self.archive = tarfile.open(path, "r:*")
+
+    def members(self):
+        for info in self.archive:
+            data = self.archive.extractfile(info).read() if info.isfile() else None
+            yield _Member(info.name, info, info.isfile() and is_srt_member(info.name)), data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.archive.close()
+
+
+class _ZipWriter:
+    def __init__(self, path):
+        self.archive = zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED)
+
+    def add(self, member, data):
+        info = member.info
+        if not isinstance(info, zipfile.ZipInfo):
+            info = _zip_info_from_tar(info)
+            if info is None:
+                return False
+        self.archive.writestr(info, data if data is not None else b"")
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.archive.close()
+
+
+class _TarWriter:
+    def __init__(self, path, compression):
+        self.archive = tarfile.open(path, TAR_WRITE_MODES[compression])
+
+    def add(self, member, data):
+        info = member.info
+        if not isinstance(info, tarfile.TarInfo):
+            info = _tar_info_from_zip(info)
+        if data is None:
+            self.archive.addfile(info)
+            return True
+        info.size = len(data)
+        self.archive.addfile(info, io.BytesIO(data))
+        return True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.archive.close()
+
+
+def _open_reader(input_path):
+    if zipfile.is_zipfile(input_path):
+        return _ZipReader(input_path)
+    if tarfile.is_tarfile(input_path):
+        return _TarReader(input_path)
+    raise FileProcessingError(f"Input is not a zip or tar archive: {input_path}")
+
+
+def _open_writer(temp_path, output_path):
+    suffix = output_path.suffix.lower()
+    if suffix == ".zip":
+        return _ZipWriter(temp_path)
+    if suffix in TAR_SHORT_SUFFIXES:
+        return _TarWriter(temp_path, TAR_SHORT_SUFFIXES[suffix])
+    if Compression.strip_extension(output_path).suffix.lower() == ".tar":
+        return _TarWriter(temp_path, Compression.from_extension(output_path))
+    raise FileProcessingError(
+        f"Cannot tell archive format from output name (use .zip, .tar, .tar.gz, ...): {output_path}"
+    )
+
+
+def _zip_info_from_tar(tar_info):
+    if not (tar_info.isfile() or tar_info.isdir()):
+        return None
+    name = tar_info.name + "/" if tar_info.isdir() else tar_info.name
+    info = zipfile.ZipInfo(name, date_time=_zip_date_time(tar_info.mtime))
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = (tar_info.mode & 0xFFFF) << 16
+    return info
+
+
+def _tar_info_from_zip(zip_info):
+    info = tarfile.TarInfo(zip_info.filename.rstrip("/"))
+    info.mtime = _timestamp(zip_info.date_time)
+    if zip_info.is_dir():
+        info.type = tarfile.DIRTYPE
+        info.mode = 0o755
+    else:
+        info.mode = (zip_info.external_attr >> 16) & 0o7777 or 0o644
+    return info
+
+
+def _zip_date_time(mtime):
+    return max(time.localtime(mtime)[:6], (1980, 1, 1, 0, 0, 0))
+
+
+def _timestamp(date_time):
+    return int(time.mktime((*date_time, 0, 0, -1)))
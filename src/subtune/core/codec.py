@@ -0,0 +1,70 @@
+from .exceptions import InvalidTimestampError
+from .timestamp import MAX_TIMESTAMP_MS, MILLISECONDS_PER_HOUR
+
+TIMING_LINE_LENGTH = 29
+ARROW = " --> "
+
+# Fields sit at fixed offsets in "HH:MM:SS,mmm --> HH:MM:SS,mmm". Parsing slices them
+# out and converts them with dict lookups that also validate digits and ranges;
+# formatting joins precomputed zero-padded strings.
+_TWO_DIGITS = [f"{value:02d}" for value in range(100)]
+_THREE_DIGITS = [f"{value:03d}" for value in range(1000)]
+
+_HOURS = {text: value * MILLISECONDS_PER_HOUR for value, text in enumerate(_TWO_DIGITS)}
+_MINUTES = {text: value * 60000 for value, text in enumerate(_TWO_DIGITS[:60])}
+_SECONDS = {text: value * 1000 for value, text in enumerate(_TWO_DIGITS[:60])}
+_MILLISECONDS = {text: value for value, text in enumerate(_THREE_DIGITS)}
+
+
+def parse_timestamp(text, start=0):
+    """Return the milliseconds of the timestamp at ``text[start:start + 12]``, or None.
+
+    None means the fast path could not decode it: bad separators, non-ASCII
+    digits or out-of-range fields. Callers fall back to ``SRTTimestamp`` for the
+    exact error.
+    """
+    if len(text) < start + 12:
+        return None
+    if text[start + 2] != ":" or text[start + 5] != ":" or text[start + 8] != ",":
+        return None
+
+    try:
+        return (
+            _HOURS[text[start : start + 2]]
+            + _MINUTES[text[start + 3 : start + 5]]
+            + _SECONDS[text[start + 6 : start + 8]]
+            + _MILLISECONDS[text[start + 9 : start + 12]]
+        )
+    except KeyError:
+        return None
+
+
+def parse_timing_line(line):
+    """Return ``(start_ms, end_ms)`` for a well-formed timing line, or None."""
+    line = line.rstrip()
+    if len(line) != TIMING_LINE_LENGTH or line[12:17] != ARROW:
+        return None
+
+    start_ms = parse_timestamp(line)
+    end_ms = parse_timestamp(line, 17)
+    if start_ms is None or end_ms is None:
+        return None
+
+    return start_ms, end_ms
+
+
+def format_timestamp(total_ms):
+    if not 0 <= total_ms <= MAX_TIMESTAMP_MS:
+        raise InvalidTimestampError(f"Timestamp out of SRT range: {total_ms}ms")
+
+    hours, remainder = divmod(total_ms, MILLISECONDS_PER_HOUR)
+    minutes, remainder = divmod(remainder, 60000)
+    seconds, milliseconds = divmod(remainder, 1000)
+    return (
+        f"{_TWO_DIGITS[hours]}:{_TWO_DIGITS[minutes]}:"
+        f"{_TWO_DIGITS[seconds]},{_THREE_DIGITS[milliseconds]}"
+    )
+
+
+def format_timing_line(start_ms, end_ms):
+    return f"{format_timestamp(start_ms)}{ARROW}{format_timestamp(end_ms)}"
@@ -0,0 +1,110 @@
+import os
+import secrets
+import shutil
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ..config import TEMP_FILE_SUFFIX
+from ..utils.compression import Compression
+from .exceptions import FileProcessingError
+from .incremental import file_digest
+from .validator import FileValidator
+
+DEDUPE_MODES = ("link", "copy")
+
+
+@dataclass
+class DedupePlan:
+    """Jobs split into ``leaders`` to run and the ``copies`` each leader's output serves."""
+
+    leaders: list = field(default_factory=list)
+    copies: dict = field(default_factory=dict)
+
+    @property
+    def duplicates(self):
+        return sum(len(followers) for followers in self.copies.values())
+
+
+def plan_duplicates(jobs):
+    """Group jobs that would produce byte-identical outputs.
+
+    Jobs match when their inputs have the same content and they apply the same
+    offset into the same output format. Sizes are compared first so only files
+    that share a size with another candidate are hashed. Jobs reading a path
+    another job writes are never grouped, since their input may change mid-run.
+    """
+    writers = {_resolve(job.output_path): job for job in jobs}
+    by_size = defaultdict(list)
+    for job in jobs:
+        input_path = _resolve(job.input_path)
+        if writers.get(input_path, job) is not job:
+            continue
+        try:
+            size = input_path.stat().st_size
+        except OSError:
+            continue
+        by_size[size, _transform(job)].append(job)
+
+    leader_of = {}
+    for candidates in by_size.values():
+        if len(candidates) < 2:
+            continue
+        first_by_digest = {}
+        for job in candidates:
+            try:
+                digest = file_digest(job.input_path)
+            except OSError:
+                continue
+            leader_of[job] = first_by_digest.setdefault(digest, job)
+
+    plan = DedupePlan()
+    for job in jobs:
+        leader = leader_of.get(job, job)
+        if leader is job:
+            plan.leaders.append(job)
+        else:
+            plan.copies.setdefault(leader, []).append(job)
+    return plan
+
+
+def materialize(source_path, output_path, mode="link"):
+    """Place the content of ``source_path`` at ``output_path`` atomically.
+
+    With ``mode`` "link" a hard link is tried first, falling back to a copy
+    across file systems or where links are unsupported. Returns the method used,
+    or None when ``output_path`` already is ``source_path``.
+    """
+    source_path = Path(source_path)
+    output_path = Path(output_path)
+    if output_path.exists() and os.path.samefile(source_path, output_path):
+        return None
+
+    FileValidator.validate_output_location(output_path)
+    temp_path = output_path.with_name(
+        f".{output_path.name}.{secrets.token_hex(4)}{TEMP_FILE_SUFFIX}"
+    )
+
+    try:
+        method = "copy"
+        if mode == "link":
+            try:
+                os.link(source_path, temp_path)
+                method = "link"
+            except OSError:
+                pass
+        if method == "copy":
+            shutil.copyfile(source_path, temp_path)
+        os.replace(temp_path, output_path)
+        return method
+    except OSError as e:
+        FileValidator.discard_temp_file(temp_path)
+        raise FileProcessingError(f"Error writing output file: {e}") from e
+
+
+def _transform(job):
+    return job.offset_ms, Compression.from_extension(Path(job.output_path))
+
+
+def _resolve(path):
+    return Path(path).resolve()
@@ -0,0 +1,243 @@
+import statistics
+from array import array
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from itertools import repeat
+from operator import mul, sub
+from pathlib import Path
+
+from ..config import DIFF_TOLERANCE_MS
+from ..utils.profiling import process_pool
+from .exceptions import FileProcessingError, SubtuneError, describe_error
+from .stats import expand_srt_paths
+from .validator import FileValidator
+
+DIFF_ALIGNMENTS = ("auto", "number", "text")
+
+
+@dataclass
+class TimingDiff:
+    """Timing comparison of two versions of a subtitle file.
+
+    ``kind`` is ``identical``, ``offset`` (every matched cue moved by
+    ``offset_ms``), ``drift`` (deltas grow linearly with time: ``offset_ms``
+    at zero plus ``drift_ppm`` millionths of the elapsed time), ``irregular``
+    or ``unmatched``. Cues clamped at zero in the second file are left out of
+    the classification. ``deltas`` holds ``(number_a, number_b, start_delta,
+    end_delta)`` for each matched cue when requested.
+    """
+
+    path_a: Path
+    path_b: Path
+    aligned_by: str
+    cues_a: int
+    cues_b: int
+    matched: int = 0
+    clamped: int = 0
+    text_changes: int = 0
+    kind: str = "unmatched"
+    offset_ms: int = 0
+    drift_ppm: float = 0.0
+    max_residual_ms: float = 0.0
+    deltas: list = field(default_factory=list)
+
+    def summary(self):
+        if self.kind == "identical":
+            text = "identical timings"
+        elif self.kind == "offset":
+            text = f"offset {self.offset_ms:+d}ms"
+        elif self.kind == "drift":
+            text = f"drift {self.drift_ppm:+.1f} ppm, {self.offset_ms:+d}ms at 00:00"
+        elif self.kind == "irregular":
+            text = f"irregular, up to {self.max_residual_ms:.0f}ms off the best linear fit"
+        else:
+            text = "no cues matched"
+
+        text += f" ({self.matched}/{max(self.cues_a, self.cues_b)} cues by {self.aligned_by}"
+        for count, label in (
+            (self.cues_a - self.matched, "only in first"),
+            (self.cues_b - self.matched, "only in second"),
+            (self.clamped, "clamped at zero"),
+            (self.text_changes, "text changes"),
+        ):
+            if count:
+                text += f", {count} {label}"
+        return text + ")"
+
+    def to_dict(self):
+        report = asdict(self)
+        report["path_a"], report["path_b"] = str(self.path_a), str(self.path_b)
+        return report
+
+
+class _Timings:
+    def __init__(self, subtitles):
+        self.numbers = array("q")
+        self.starts = array("q")
+        self.ends = array("q")
+        self.texts = []
+        for subtitle in subtitles:
+            self.numbers.append(subtitle.number)
+            self.starts.append(subtitle.start_ms)
+            self.ends.append(subtitle.end_ms)
+            self.texts.append("\n".join(subtitle.text))
+
+    def has_unique_numbers(self):
+        return len(set(self.numbers)) == len(self.numbers)
+
+
+def diff_files(path_a, path_b, by="auto", keep_deltas=True):
+    """Align the cues of two SRT files and classify how their timings differ.
+
+    With ``by="number"`` cues pair up by subtitle number, with ``by="text"``
+    the k-th cue with a given text in one file pairs with the k-th cue with the
+    same text in the other. ``auto`` uses numbers when both files carry the
+    same set of unique numbers and text otherwise. Deltas are ``b - a``.
+    """
+    if by not in DIFF_ALIGNMENTS:
+        raise SubtuneError(f"Unknown alignment {by!r}, expected one of {DIFF_ALIGNMENTS}")
+
+    for path in (path_a, path_b):
+        FileValidator.validate_input_file(path)
+    a = _Timings(FileValidator.iter_srt_file(path_a))
+    b = _Timings(FileValidator.iter_srt_file(path_b))
+
+    if by == "auto":
+        numbered = a.has_unique_numbers() and b.has_unique_numbers()
+        by = "number" if numbered and set(a.numbers) == set(b.numbers) else "text"
+    index_a, index_b = _align_by_number(a, b) if by == "number" else _align_by_text(a, b)
+
+    diff = TimingDiff(path_a, path_b, by, len(a.starts), len(b.starts), len(index_a))
+    if not index_a:
+        return diff
+
+    starts_a = array("q", map(a.starts.__getitem__, index_a))
+    ends_a = array("q", map(a.ends.__getitem__, index_a))
+    starts_b = array("q", map(b.starts.__getitem__, index_b))
+    start_deltas = array("q", map(sub, starts_b, starts_a))
+    end_deltas = array("q", map(sub, map(b.ends.__getitem__, index_b), ends_a))
+
+    if by == "number":
+        texts_a = map(a.texts.__getitem__, index_a)
+        diff.text_changes = sum(map(str.__ne__, texts_a, map(b.texts.__getitem__, index_b)))
+    if keep_deltas:
+        diff.deltas = list(
+            zip(
+                map(a.numbers.__getitem__, index_a),
+                map(b.numbers.__getitem__, index_b),
+                start_deltas,
+                end_deltas,
+            )
+        )
+
+    # A cue moved to zero by a negative shift no longer carries the offset
+    kept = [index for index, start in enumerate(starts_b) if start > 0 or starts_a[index] == 0]
+    diff.clamped = len(index_a) - len(kept)
+    if kept:
+        times = [starts_a[index] for index in kept] + [ends_a[index] for index in kept]
+        deltas = [start_deltas[index] for index in kept] + [end_deltas[index] for index in kept]
+        _classify(diff, times, deltas)
+    return diff
+
+
+def library_diff(path_a, path_b, by="auto", workers=1, keep_deltas=False):
+    """Diff two files, or every pair of same-named files under two directories.
+
+    Returns ``(diffs, errors)`` where ``errors`` holds ``(path, exit_code,
+    message)`` for failing pairs and files present on one side only.
+    """
+    pairs, errors = pair_paths(path_a, path_b)
+
+    if workers > 1 and len(pairs) > 1:
+        with process_pool(workers) as executor:
+            outcomes = list(
+                executor.map(_safe_diff, pairs, repeat(by), repeat(keep_deltas), chunksize=16)
+            )
+    else:
+        outcomes = [_safe_diff(pair, by, keep_deltas) for pair in pairs]
+
+    diffs = []
+    for (first, _second), (diff, exit_code, error) in zip(pairs, outcomes):
+        if error is None:
+            diffs.append(diff)
+        else:
+            errors.append((first, exit_code, error))
+    return diffs, errors
+
+
+def pair_paths(path_a, path_b):
+    path_a, path_b = Path(path_a), Path(path_b)
+    if path_a.is_dir() != path_b.is_dir():
+        raise FileProcessingError("Compare two files or two directories, not one of each")
+    if not path_a.is_dir():
+        return [(path_a, path_b)], []
+
+    files_a = {path.relative_to(path_a): path for path in expand_srt_paths([path_a])}
+    files_b = {path.relative_to(path_b): path for path in expand_srt_paths([path_b])}
+    common = files_a.keys() & files_b.keys()
+    pairs = [(files_a[name], files_b[name]) for name in sorted(common)]
+
+    errors = []
+    for files, other in ((files_a, path_b), (files_b, path_a)):
+        for name in sorted(files.keys() - common):
+            errors.append((files[name], 1, f"File error: no counterpart in {other}"))
+    return pairs, errors
+
+
+def _align_by_number(a, b):
+    positions = {number: index for index, number in enumerate(b.numbers)}
+    index_a = array("q")
+    index_b = array("q")
+    for index, number in enumerate(a.numbers):
+        match = positions.pop(number, None)
+        if match is not None:
+            index_a.append(index)
+            index_b.append(match)
+    return index_a, index_b
+
+
+def _align_by_text(a, b):
+    positions = defaultdict(deque)
+    for index, text in enumerate(b.texts):
+        positions[text].append(index)
+
+    index_a = array("q")
+    index_b = array("q")
+    for index, text in enumerate(a.texts):
+        candidates = positions.get(text)
+        if candidates:
+            index_a.append(index)
+            index_b.append(candidates.popleft())
+    return index_a, index_b
+
+
+def _classify(diff, times, deltas):
+    median = round(statistics.median(deltas))
+    if max(abs(delta - median) for delta in deltas) <= DIFF_TOLERANCE_MS:
+        diff.kind = "identical" if not any(deltas) else "offset"
+        diff.offset_ms = median
+        diff.max_residual_ms = float(max(abs(delta - median) for delta in deltas))
+        return
+
+    # Least squares fit of delta = intercept + slope * time
+    count = len(times)
+    sum_t = sum(times)
+    sum_d = sum(deltas)
+    spread = count * sum(map(mul, times, times)) - sum_t * sum_t
+    slope = (count * sum(map(mul, times, deltas)) - sum_t * sum_d) / spread if spread else 0.0
+    intercept = (sum_d - slope * sum_t) / count
+
+    diff.offset_ms = round(intercept)
+    diff.drift_ppm = slope * 1_000_000
+    diff.max_residual_ms = max(
+        abs(delta - intercept - slope * time) for time, delta in zip(times, deltas)
+    )
+    diff.kind = "drift" if diff.max_residual_ms <= DIFF_TOLERANCE_MS else "irregular"
+
+
+def _safe_diff(pair, by, keep_deltas):
+    try:
+        return diff_files(*pair, by=by, keep_deltas=keep_deltas), 0, None
+    except SubtuneError as e:
+        exit_code, label = describe_error(e)
+        return None, exit_code, f"{label}: {e}"
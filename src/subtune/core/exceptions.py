@@ -26,3 +26,35 @@ class InvalidOffsetError(SubtuneError):
     """Raised when offset value is invalid."""
 
     pass
+
+
+class InvalidManifestError(SubtuneError):
+    """Raised when a job manifest cannot be parsed."""
+
+    pass
+
+
+class InvalidQueryError(SubtuneError):
+    """Raised when a search query cannot be parsed."""
+
+    pass
+
+
+ERROR_EXIT_CODES = (
+    (FileProcessingError, 1, "File error"),
+    (InvalidSRTFormatError, 2, "SRT format error"),
+    (InvalidTimestampError, 3, "Timestamp error"),
+    (InvalidOffsetError, 4, "Offset error"),
+    (SubtuneError, 5, "Error"),
+)
+
+UNEXPECTED_ERROR_EXIT_CODE = 99
+
+
+def describe_error(error):
+    """Return the ``(exit_code, label)`` pair the CLI reports for an exception."""
+    for error_class, exit_code, label in ERROR_EXIT_CODES:
+        if isinstance(error, error_class):
+            return exit_code, label
+
+    return UNEXPECTED_ERROR_EXIT_CODE, "Unexpected error"
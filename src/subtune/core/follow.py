@@ -0,0 +1,178 @@
+import logging
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..config import FILE_ENCODING, FOLLOW_POLL_INTERVAL
+from .exceptions import FileProcessingError, SubtuneError
+from .processor import SRTSubtitle
+from .validator import FileValidator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FollowSummary:
+    """Counts for one follow session."""
+
+    cues: int = 0
+    dropped_blocks: int = 0
+    truncations: int = 0
+    rotations: int = 0
+
+
+def follow(
+    input_path,
+    output_path,
+    offset_ms,
+    stop=None,
+    idle_timeout=None,
+    poll_interval=FOLLOW_POLL_INTERVAL,
+    on_cue=None,
+):
+    """Tail a growing SRT file and append each cue, shifted, to ``output_path``.
+
+    A cue is written and flushed as soon as the blank line ending it arrives.
+    If the input is truncated it is re-read from the start, and if it is
+    replaced (log rotation) the new file is followed once the old one is
+    drained; in both cases output keeps growing. Runs until ``stop`` (a
+    ``threading.Event``) is set or no data arrived for ``idle_timeout`` seconds,
+    then writes a final unterminated cue if there is one.
+    """
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    FileValidator.validate_input_file(input_path)
+    FileValidator.validate_output_location(output_path)
+    offset = FileValidator.validate_offset(offset_ms)
+    if input_path.resolve() == output_path.resolve():
+        raise FileProcessingError("Follow mode needs an output file separate from the input")
+
+    summary = FollowSummary()
+    block = []
+
+    try:
+        with _Tail(input_path, summary) as tail:
+            with open(output_path, "w", encoding=FILE_ENCODING) as output:
+
+                def emit():
+                    try:
+                        subtitle = SRTSubtitle.from_lines(block).shift(offset)
+                    except SubtuneError as e:
+                        summary.dropped_blocks += 1
+                        logger.warning("Skipped cue in %s: %s", input_path, e)
+                        return
+                    if summary.cues:
+                        output.write("\n")
+                    output.write("\n".join(subtitle.to_lines()))
+                    output.flush()
+                    summary.cues += 1
+                    if on_cue is not None:
+                        on_cue(subtitle)
+
+                for line in tail.lines(stop, idle_timeout, poll_interval):
+                    if line is None:
+                        block.clear()
+                    elif line.strip():
+                        block.append(line.rstrip())
+                    elif block:
+                        emit()
+                        block.clear()
+                if block:
+                    emit()
+    except OSError as e:
+        raise FileProcessingError(f"Error following {input_path}: {e}") from e
+
+    return summary
+
+
+class _Tail:
+    """Reads complete lines from a file that may grow, shrink or be replaced."""
+
+    def __init__(self, path, summary):
+        self.path = path
+        self.summary = summary
+        self.file = open(path, "rb")
+        self.identity = _identity(os.fstat(self.file.fileno()))
+        self.partial = b""
+        self.at_start = True
+
+    def lines(self, stop, idle_timeout, poll_interval):
+        # Yields decoded lines, or None when the input was truncated and any
+        # half-read cue must be discarded
+        idle_since = time.monotonic()
+        while stop is None or not stop.is_set():
+            data = self.file.read()
+            if data:
+                idle_since = time.monotonic()
+                *complete, self.partial = (self.partial + data).split(b"\n")
+                for raw in complete:
+                    yield self._decode(raw)
+                continue
+
+            restart = self._reopen_if_replaced()
+            if restart:
+                if restart == "rotated":
+                    # The old file's end also ends its last cue
+                    if self.partial:
+                        yield self._decode(self.partial)
+                    yield ""
+                else:
+                    yield None
+                self.partial = b""
+                self.at_start = True
+                continue
+
+            if idle_timeout is not None and time.monotonic() - idle_since >= idle_timeout:
+                break
+            if stop is None:
+                time.sleep(poll_interval)
+            else:
+                stop.wait(poll_interval)
+
+        if self.partial:
+            yield self._decode(self.partial)
+            self.partial = b""
+
+    def _reopen_if_replaced(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            # Rotated away and not recreated yet
+            return None
+
+        if _identity(stat) != self.identity:
+            if self.file.read(1):
+                # The old file grew after the last read; drain it first
+                self.file.seek(-1, os.SEEK_CUR)
+                return None
+            self.file.close()
+            self.file = open(self.path, "rb")
+            self.identity = _identity(os.fstat(self.file.fileno()))
+            self.summary.rotations += 1
+            return "rotated"
+
+        if stat.st_size < self.file.tell():
+            self.file.seek(0)
+            self.summary.truncations += 1
+            return "truncated"
+
+        return None
+
+    def _decode(self, raw):
+        # Replace rather than fail on bad bytes so one corrupt cue cannot end a live session
+        line = raw.decode(FILE_ENCODING, errors="replace")
+        if self.at_start:
+            line = line.removeprefix("\ufeff")
+            self.at_start = False
+        return line
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.file.close()
+
+
+def _identity(stat):
+    return stat.st_dev, stat.st_ino
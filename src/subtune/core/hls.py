@@ -0,0 +1,143 @@
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..config import HLS_PLAYLIST_NAME, HLS_SEGMENT_NAME, HLS_SEGMENT_SECONDS
+from ..utils.profiling import thread_pool
+from .codec import format_timestamp
+from .exceptions import SubtuneError
+from .processor import SRTFile
+from .validator import FileValidator
+
+
+@dataclass(frozen=True)
+class HLSSummary:
+    """Result of segmenting one subtitle file for HLS."""
+
+    playlist_path: Path
+    segments: int
+    cues: int
+    cue_placements: int
+
+
+def segment_hls(
+    input_path,
+    output_dir,
+    offset_ms=0,
+    segment_seconds=HLS_SEGMENT_SECONDS,
+    duration_ms=None,
+    workers=1,
+    mpegts=None,
+):
+    """Shift an SRT file and split it into WebVTT segments plus an HLS playlist.
+
+    Segments are ``segment_seconds`` long and cover ``duration_ms`` (default:
+    up to the last cue end). A cue spanning a boundary is repeated in every
+    segment it overlaps. Segments are written by ``workers`` threads, each
+    atomically, and the playlist last so it never names a missing segment.
+    With ``mpegts`` each segment carries an ``X-TIMESTAMP-MAP`` header mapping
+    time zero to that MPEG-TS timestamp.
+    """
+    segment_ms = round(segment_seconds * 1000)
+    if segment_ms <= 0:
+        raise SubtuneError(f"Segment duration must be positive, got {segment_seconds}")
+    if duration_ms is not None and duration_ms <= 0:
+        raise SubtuneError(f"Total duration must be positive, got {duration_ms}ms")
+
+    input_path = Path(input_path)
+    output_dir = Path(output_dir)
+    playlist_path = output_dir / HLS_PLAYLIST_NAME
+    FileValidator.validate_input_file(input_path)
+    FileValidator.validate_output_location(playlist_path)
+    offset = FileValidator.validate_offset(offset_ms)
+
+    cues = SRTFile(list(FileValidator.iter_srt_file(input_path))).shift(offset).subtitles
+    if duration_ms is None:
+        duration_ms = max((cue.end_ms for cue in cues), default=0)
+        if duration_ms <= 0:
+            raise SubtuneError(
+                f"No cue in {input_path} ends after 00:00 once shifted; give a total duration"
+            )
+    count = max(math.ceil(duration_ms / segment_ms), 1)
+
+    header = _vtt_header(mpegts)
+    segments = assign_segments(cues, segment_ms, count)
+    names = [HLS_SEGMENT_NAME.format(index=index) for index in range(count)]
+
+    def write(index):
+        content = header + "".join(_vtt_cue(cue) for cue in segments[index])
+        path = output_dir / names[index]
+        FileValidator.commit_output(FileValidator.write_temp_file([content], path), path)
+
+    with thread_pool(max(workers, 1)) as executor:
+        # list() re-raises the first failed write
+        list(executor.map(write, range(count)))
+
+    playlist = _playlist(names, segment_ms, duration_ms)
+    FileValidator.commit_output(
+        FileValidator.write_temp_file([playlist], playlist_path), playlist_path
+    )
+
+    return HLSSummary(playlist_path, count, len(cues), sum(len(segment) for segment in segments))
+
+
+def assign_segments(cues, segment_ms, count):
+    """Return, for each of ``count`` segments, the cues overlapping it in start order.
+
+    Cues are indexed once by start and once by end, then a single sweep adds
+    cues as segments reach their start and retires them once a segment begins
+    at or after their end. That is O(n + segments + placements) for files
+    already in time order, where the sorts are linear, rather than a rescan
+    of every cue per segment.
+    """
+    by_start = sorted(range(len(cues)), key=lambda index: cues[index].start_ms)
+    by_end = sorted(range(len(cues)), key=lambda index: cues[index].end_ms)
+    active = {}
+    next_start = next_end = 0
+    segments = []
+
+    for segment in range(count):
+        segment_start = segment * segment_ms
+        segment_end = segment_start + segment_ms
+
+        while next_start < len(cues) and cues[by_start[next_start]].start_ms < segment_end:
+            active[by_start[next_start]] = cues[by_start[next_start]]
+            next_start += 1
+        while next_end < len(cues) and cues[by_end[next_end]].end_ms <= segment_start:
+            active.pop(by_end[next_end], None)
+            next_end += 1
+
+        segments.append(list(active.values()))
+
+    return segments
+
+
+def _vtt_header(mpegts):
+    if mpegts is None:
+        return "WEBVTT\n\n"
+    return f"WEBVTT\nX-TIMESTAMP-MAP=MPEGTS:{mpegts},LOCAL:00:00:00.000\n\n"
+
+
+def _vtt_cue(cue):
+    timing = f"{_vtt_timestamp(cue.start_ms)} --> {_vtt_timestamp(cue.end_ms)}"
+    return "\n".join([str(cue.number), timing, *cue.text]) + "\n\n"
+
+
+def _vtt_timestamp(total_ms):
+    # WebVTT uses a dot before the milliseconds where SRT uses a comma
+    return format_timestamp(total_ms).replace(",", ".")
+
+
+def _playlist(names, segment_ms, duration_ms):
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:3",
+        f"#EXT-X-TARGETDURATION:{math.ceil(segment_ms / 1000)}",
+        "#EXT-X-MEDIA-SEQUENCE:0",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+    ]
+    for index, name in enumerate(names):
+        length_ms = min(segment_ms, duration_ms - index * segment_ms)
+        lines += [f"#EXTINF:{length_ms / 1000:.3f},", name]
+    lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
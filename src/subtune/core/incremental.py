@@ -0,0 +1,86 @@
+import hashlib
+import json
+import sqlite3
+
+from ..config import HASH_CHUNK_SIZE, VERSION
+from .exceptions import FileProcessingError
+
+
+class BuildState:
+    """SQLite record of what produced each output, used to skip unchanged work.
+
+    An output is up to date when its recorded fingerprint (input hash, offset,
+    options and tool version) matches and the file on disk still has the size and
+    mtime recorded when it was produced. Input hashes are cached by size and mtime
+    so unchanged inputs are not re-read.
+    """
+
+    def __init__(self, state_path):
+        try:
+            self.connection = sqlite3.connect(str(state_path), timeout=30)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS outputs ("
+                "path TEXT PRIMARY KEY, fingerprint TEXT, size INTEGER, mtime_ns INTEGER)"
+            )
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS inputs ("
+                "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, digest TEXT)"
+            )
+            self.connection.commit()
+        except sqlite3.Error as e:
+            raise FileProcessingError(f"Cannot open state file {state_path}: {e}") from e
+
+    def fingerprint(self, input_path, offset_ms, options=None):
+        payload = [self.input_digest(input_path), int(offset_ms), options or {}, VERSION]
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def input_digest(self, input_path):
+        key = str(input_path.resolve())
+        stat = input_path.stat()
+
+        row = self.connection.execute(
+            "SELECT digest FROM inputs WHERE path = ? AND size = ? AND mtime_ns = ?",
+            (key, stat.st_size, stat.st_mtime_ns),
+        ).fetchone()
+        if row:
+            return row[0]
+
+        digest = file_digest(input_path)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO inputs VALUES (?, ?, ?, ?)",
+            (key, stat.st_size, stat.st_mtime_ns, digest),
+        )
+        self.connection.commit()
+        return digest
+
+    def is_up_to_date(self, output_path, fingerprint):
+        if not output_path.is_file():
+            return False
+
+        stat = output_path.stat()
+        row = self.connection.execute(
+            "SELECT 1 FROM outputs WHERE path = ? AND fingerprint = ? AND size = ? "
+            "AND mtime_ns = ?",
+            (str(output_path.resolve()), fingerprint, stat.st_size, stat.st_mtime_ns),
+        ).fetchone()
+        return row is not None
+
+    def record(self, output_path, fingerprint):
+        stat = output_path.stat()
+        self.connection.execute(
+            "INSERT OR REPLACE INTO outputs VALUES (?, ?, ?, ?)",
+            (str(output_path.resolve()), fingerprint, stat.st_size, stat.st_mtime_ns),
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+def file_digest(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,392 @@
+import csv
+import json
+import logging
+import sqlite3
+import time
+from concurrent.futures import FIRST_COMPLETED, as_completed, wait
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..config import FILE_ENCODING, JOB_WINDOW_PER_WORKER, JSONL_MANIFEST_EXTENSIONS
+from ..utils.backup import BackupManager
+from ..utils.metrics import Metrics
+from ..utils.profiling import process_pool
+from .dedup import DedupePlan, materialize, plan_duplicates
+from .exceptions import FileProcessingError, InvalidManifestError, SubtuneError, describe_error
+from .incremental import BuildState, file_digest
+from .pipeline import run_pipeline
+from .workflow import SubtitleProcessor
+
+logger = logging.getLogger(__name__)
+
+_processor = SubtitleProcessor(on_warning=logger.warning)
+_build_states = {}
+
+TRUE_VALUES = {"1", "true", "yes", "y"}
+
+
+@dataclass(frozen=True)
+class Job:
+    """One manifest row: shift ``input_path`` by ``offset_ms`` into ``output_path``."""
+
+    input_path: str
+    output_path: str
+    offset_ms: int
+    backup: bool = False
+
+    @property
+    def key(self):
+        return f"{self.input_path}\t{self.output_path}\t{self.offset_ms}\t{int(self.backup)}"
+
+
+@dataclass(frozen=True)
+class JobOutcome:
+    """Result of running a single job, as stored in the ledger."""
+
+    job: Job
+    status: str
+    exit_code: int = 0
+    error: str = ""
+    subtitle_count: int = 0
+    up_to_date: bool = False
+    metrics: object = None
+
+
+@dataclass
+class RunSummary:
+    """Counts for a manifest run."""
+
+    total: int = 0
+    skipped: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    up_to_date: int = 0
+    deduplicated: int = 0
+    highest_exit_code: int = 0
+
+
+def load_manifest(manifest_path):
+    """Read jobs from a CSV or JSON Lines manifest with input/output/offset/backup fields."""
+    try:
+        with open(manifest_path, encoding=FILE_ENCODING, newline="") as f:
+            if manifest_path.suffix.lower() in JSONL_MANIFEST_EXTENSIONS:
+                rows = [
+                    _parse_json_row(line, n) for n, line in enumerate(f, start=1) if line.strip()
+                ]
+            else:
+                rows = list(csv.DictReader(f))
+    except OSError as e:
+        raise FileProcessingError(f"Error reading manifest: {e}") from e
+
+    return [_job_from_row(row, row_number) for row_number, row in enumerate(rows, start=1)]
+
+
+class JobLedger:
+    """Durable SQLite record of finished jobs, used to resume interrupted runs.
+
+    In-place jobs are also recorded as ``started``, with a digest of their
+    input, before they are dispatched. A resumed run can then tell whether an
+    interrupted in-place job already rewrote its file.
+    """
+
+    def __init__(self, ledger_path):
+        try:
+            self.connection = sqlite3.connect(str(ledger_path))
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "key TEXT PRIMARY KEY, input TEXT, output TEXT, offset_ms INTEGER, "
+                "status TEXT, exit_code INTEGER, error TEXT, subtitle_count INTEGER, "
+                "updated_at REAL, input_digest TEXT)"
+            )
+            columns = {row[1] for row in self.connection.execute("PRAGMA table_info(jobs)")}
+            if "input_digest" not in columns:
+                self.connection.execute("ALTER TABLE jobs ADD COLUMN input_digest TEXT")
+            self.connection.commit()
+        except sqlite3.Error as e:
+            raise FileProcessingError(f"Cannot open job ledger {ledger_path}: {e}") from e
+
+    def completed_keys(self):
+        rows = self.connection.execute("SELECT key FROM jobs WHERE status = 'done'")
+        return {key for (key,) in rows}
+
+    def started_digests(self):
+        rows = self.connection.execute(
+            "SELECT key, input_digest FROM jobs WHERE status = 'started'"
+        )
+        return dict(rows)
+
+    def start(self, job, input_digest):
+        self._write(job, "started", 0, "", 0, input_digest)
+
+    def record(self, outcome):
+        self._write(
+            outcome.job, outcome.status, outcome.exit_code, outcome.error, outcome.subtitle_count
+        )
+
+    def _write(self, job, status, exit_code, error, subtitle_count, input_digest=None):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO jobs (key, input, output, offset_ms, status, exit_code, "
+            "error, subtitle_count, updated_at, input_digest) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                job.key,
+                job.input_path,
+                job.output_path,
+                job.offset_ms,
+                status,
+                exit_code,
+                error,
+                subtitle_count,
+                time.time(),
+                input_digest,
+            ),
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+def run_jobs(
+    jobs,
+    ledger,
+    workers=1,
+    on_outcome=None,
+    state_path=None,
+    metrics=None,
+    io_threads=0,
+    dedupe=None,
+):
+    """Run jobs not yet completed in ``ledger``, recording each outcome as it finishes.
+
+    With ``state_path`` jobs run incrementally against a shared ``BuildState``.
+    With ``metrics`` every job's counters and timings, including those from
+    worker processes, are merged into it. With ``io_threads`` reads and writes
+    run on that many threads each, overlapping with shifting (see
+    ``run_pipeline``); outcomes then arrive in completion order. With
+    ``dedupe`` ("link" or "copy") jobs whose outputs would be identical are
+    shifted once and the other outputs materialized from the first; if that
+    job fails, its duplicates are run on their own.
+
+    An in-place job left ``started`` by an interrupted run is skipped when its
+    input no longer matches the digest taken before it was dispatched, so a
+    resumed run never applies the offset twice.
+    """
+    if io_threads and state_path is not None:
+        raise SubtuneError("Pipelined I/O cannot be combined with incremental mode")
+
+    summary = RunSummary(total=len(jobs))
+    completed = ledger.completed_keys()
+    collect_metrics = metrics is not None
+    started = ledger.started_digests()
+
+    pending = []
+    for job in jobs:
+        if job.key in completed:
+            summary.skipped += 1
+            continue
+        completed.add(job.key)
+        if _rewritten_since(job, started.get(job.key)):
+            logger.warning(
+                "%s changed after an interrupted run started shifting it; not shifting it again",
+                job.input_path,
+            )
+            ledger.record(JobOutcome(job, "done"))
+            summary.skipped += 1
+            continue
+        pending.append(job)
+
+    def start(jobs):
+        # Runs as the dispatcher pulls each job, so the row exists before any write
+        for job in jobs:
+            if _in_place(job):
+                ledger.start(job, _input_digest(job))
+            yield job
+
+    def record(outcome):
+        ledger.record(outcome)
+        if metrics is not None:
+            metrics.merge(outcome.metrics)
+        if outcome.status == "done":
+            summary.succeeded += 1
+            summary.up_to_date += outcome.up_to_date
+        else:
+            summary.failed += 1
+            summary.highest_exit_code = max(summary.highest_exit_code, outcome.exit_code)
+        if on_outcome is not None:
+            on_outcome(outcome)
+
+    plan = plan_duplicates(pending) if dedupe else DedupePlan(leaders=pending)
+    orphans = []
+
+    leaders = start(plan.leaders)
+    for outcome in _dispatch(leaders, workers, state_path, io_threads, collect_metrics):
+        record(outcome)
+        duplicates = plan.copies.get(outcome.job, [])
+        if outcome.status != "done":
+            orphans.extend(duplicates)
+            continue
+        for duplicate in start(duplicates):
+            copied = _copy_job(duplicate, outcome, dedupe, collect_metrics)
+            summary.deduplicated += copied.status == "done"
+            record(copied)
+
+    for outcome in _dispatch(start(orphans), workers, state_path, io_threads, collect_metrics):
+        record(outcome)
+
+    return summary
+
+
+def run_job(job, state_path=None, collect_metrics=False):
+    input_path = Path(job.input_path)
+    output_path = Path(job.output_path)
+    metrics = Metrics() if collect_metrics else None
+    processor = SubtitleProcessor(logger.warning, metrics) if collect_metrics else _processor
+
+    try:
+        build_state = _open_build_state(state_path)
+        result = processor.shift_file(
+            input_path, output_path, job.offset_ms, job.backup, build_state=build_state
+        )
+    except Exception as e:
+        return _failed(job, e, metrics)
+
+    return _done(job, result, metrics)
+
+
+def _failed(job, error, metrics):
+    exit_code, label = describe_error(error)
+    return JobOutcome(job, "failed", exit_code, f"{label}: {error}", metrics=metrics)
+
+
+def _done(job, result, metrics):
+    return JobOutcome(
+        job,
+        "done",
+        subtitle_count=result.subtitle_count,
+        up_to_date=result.up_to_date,
+        metrics=metrics,
+    )
+
+
+def _in_place(job):
+    return Path(job.input_path).resolve() == Path(job.output_path).resolve()
+
+
+def _input_digest(job):
+    # A missing or unreadable input fails in the job itself
+    try:
+        return file_digest(job.input_path)
+    except OSError:
+        return None
+
+
+def _rewritten_since(job, started_digest):
+    if started_digest is None:
+        return False
+    return _input_digest(job) not in (started_digest, None)
+
+
+def _open_build_state(state_path):
+    # One connection per process, reused by every job the process runs
+    if state_path is None:
+        return None
+    if state_path not in _build_states:
+        _build_states[state_path] = BuildState(state_path)
+    return _build_states[state_path]
+
+
+def _dispatch(jobs, workers, state_path, io_threads, collect_metrics):
+    if io_threads:
+        return _execute_pipelined(jobs, workers, io_threads, collect_metrics)
+    return _execute(jobs, workers, state_path, collect_metrics)
+
+
+def _copy_job(job, source, mode, collect_metrics):
+    # Materialize a duplicate job's output from the finished job it duplicates
+    metrics = Metrics() if collect_metrics else None
+    try:
+        if job.backup:
+            BackupManager.create_backup(Path(job.input_path), on_warning=logger.warning)
+        materialize(source.job.output_path, job.output_path, mode)
+    except Exception as e:
+        if metrics is not None:
+            metrics.record_error(e)
+        return _failed(job, e, metrics)
+
+    if metrics is not None:
+        metrics.inc("files_deduplicated_total")
+    return JobOutcome(
+        job,
+        "done",
+        subtitle_count=source.subtitle_count,
+        up_to_date=source.up_to_date,
+        metrics=metrics,
+    )
+
+
+def _execute(jobs, workers, state_path, collect_metrics):
+    if workers <= 1:
+        for job in jobs:
+            yield run_job(job, state_path, collect_metrics)
+        return
+
+    window = workers * JOB_WINDOW_PER_WORKER
+    with process_pool(workers) as executor:
+        in_flight = set()
+        for job in jobs:
+            in_flight.add(executor.submit(run_job, job, state_path, collect_metrics))
+            if len(in_flight) >= window:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+        for future in as_completed(in_flight):
+            yield future.result()
+
+
+def _execute_pipelined(jobs, workers, io_threads, collect_metrics):
+    for job, result, error in run_pipeline(jobs, io_threads, workers):
+        metrics = Metrics() if collect_metrics else None
+        if error is not None:
+            if metrics is not None:
+                metrics.record_error(error)
+            yield _failed(job, error, metrics)
+            continue
+        if metrics is not None:
+            metrics.record_result(result)
+        yield _done(job, result, metrics)
+
+
+def _parse_json_row(line, line_number):
+    try:
+        row = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise InvalidManifestError(f"Invalid JSON on manifest line {line_number}: {e}") from e
+
+    if not isinstance(row, dict):
+        raise InvalidManifestError(f"Manifest line {line_number} is not an object")
+
+    return row
+
+
+def _job_from_row(row, row_number):
+    input_path = str(row.get("input") or "").strip()
+    if not input_path:
+        raise InvalidManifestError(f"Manifest row {row_number} has no input")
+
+    output_path = str(row.get("output") or "").strip() or input_path
+
+    try:
+        offset_ms = int(row.get("offset"))
+    except (TypeError, ValueError) as e:
+        raise InvalidManifestError(
+            f"Manifest row {row_number} has invalid offset: {row.get('offset')!r}"
+        ) from e
+
+    backup = row.get("backup")
+    if not isinstance(backup, bool):
+        backup = str(backup or "").strip().lower() in TRUE_VALUES
+
+    return Job(input_path, output_path, offset_ms, backup)
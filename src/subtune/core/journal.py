@@ -0,0 +1,154 @@
+import json
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+from .exceptions import FileProcessingError, SubtuneError
+from .incremental import file_digest
+from .processor import ONE_MILLISECOND
+from .validator import FileValidator
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    """One recorded in-place shift of a file."""
+
+    id: int
+    path: str
+    offset_ms: int
+    clamped: dict
+    before_digest: str
+    after_digest: str
+
+
+@dataclass(frozen=True)
+class UndoResult:
+    """Outcome of undoing the latest shift of one file."""
+
+    path: Path
+    offset_ms: int
+    subtitle_count: int
+    exact: bool
+    remaining: int
+
+
+class UndoJournal:
+    """SQLite journal of in-place shifts, holding just enough to reverse each one.
+
+    A shift is reversed by the opposite offset, except for cues clamped at zero,
+    whose original timings are the only cue data stored. Each entry also keeps
+    digests of the file before and after the shift, so undo refuses files edited
+    since and can tell whether the restored file is byte-identical.
+    """
+
+    def __init__(self, journal_path):
+        try:
+            self.connection = sqlite3.connect(str(journal_path), timeout=30)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS shifts ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, path TEXT, offset_ms INTEGER, "
+                "clamped TEXT, before_digest TEXT, after_digest TEXT)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS shifts_path ON shifts (path)")
+            self.connection.commit()
+        except sqlite3.Error as e:
+            raise FileProcessingError(f"Cannot open undo journal {journal_path}: {e}") from e
+
+    def record(self, path, offset_ms, clamped, before_digest):
+        self.connection.execute(
+            "INSERT INTO shifts (path, offset_ms, clamped, before_digest, after_digest) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                _key(path),
+                int(offset_ms),
+                json.dumps(sorted(clamped.items()), separators=(",", ":")),
+                before_digest,
+                file_digest(path),
+            ),
+        )
+        self.connection.commit()
+
+    def latest(self, path):
+        row = self.connection.execute(
+            "SELECT id, path, offset_ms, clamped, before_digest, after_digest FROM shifts "
+            "WHERE path = ? ORDER BY id DESC LIMIT 1",
+            (_key(path),),
+        ).fetchone()
+        if row is None:
+            return None
+
+        entry_id, key, offset_ms, clamped, before_digest, after_digest = row
+        clamped = {index: tuple(timing) for index, timing in json.loads(clamped)}
+        return JournalEntry(entry_id, key, offset_ms, clamped, before_digest, after_digest)
+
+    def count(self, path):
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM shifts WHERE path = ?", (_key(path),)
+        ).fetchone()[0]
+
+    def paths(self):
+        rows = self.connection.execute("SELECT DISTINCT path FROM shifts ORDER BY path")
+        return [Path(row[0]) for row in rows]
+
+    def remove(self, entry):
+        self.connection.execute("DELETE FROM shifts WHERE id = ?", (entry.id,))
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+
+def track_clamped(subtitles, offset, clamped):
+    """Shift ``subtitles``, noting in ``clamped`` the original timings of cues cut at zero.
+
+    ``clamped`` maps each such cue's position in the stream to its original
+    ``(start_ms, end_ms)``.
+    """
+    offset_ms = offset // ONE_MILLISECOND
+    for index, subtitle in enumerate(subtitles):
+        if subtitle.start_ms + offset_ms < 0:
+            clamped[index] = (subtitle.start_ms, subtitle.end_ms)
+        yield subtitle.shift(offset)
+
+
+def undo_shift(path, journal):
+    """Reverse the latest journaled shift of ``path`` in place.
+
+    Cues are shifted back by the recorded offset and clamped cues get their
+    original timings back. ``UndoResult.exact`` is False when the restored file
+    still differs from the original, e.g. because malformed blocks were dropped
+    or formatting was normalized when it was shifted.
+    """
+    path = Path(path)
+    entry = journal.latest(path)
+    if entry is None:
+        raise SubtuneError(f"No journaled shift to undo for {path}")
+
+    FileValidator.validate_input_file(path)
+    if file_digest(path) != entry.after_digest:
+        raise FileProcessingError(f"{path} was modified after it was shifted; not undoing")
+
+    reverse_ms = -entry.offset_ms
+
+    def restored():
+        for index, subtitle in enumerate(FileValidator.iter_srt_file(path)):
+            if index in entry.clamped:
+                yield subtitle.retime(*entry.clamped[index])
+            else:
+                yield subtitle.retime(subtitle.start_ms + reverse_ms, subtitle.end_ms + reverse_ms)
+
+    subtitle_count = FileValidator.write_subtitles(restored(), path)
+    journal.remove(entry)
+
+    return UndoResult(
+        path,
+        entry.offset_ms,
+        subtitle_count,
+        file_digest(path) == entry.before_digest,
+        journal.count(path),
+    )
+
+
+def _key(path):
+    return str(Path(path).resolve())
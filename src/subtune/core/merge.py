@@ -0,0 +1,84 @@
+import heapq
+import json
+import tempfile
+from contextlib import ExitStack
+from datetime import timedelta
+from itertools import islice
+
+from ..config import FILE_ENCODING, SORT_RUN_SIZE
+from .processor import SRTSubtitle
+
+
+def merge_subtitles(streams, offsets=None):
+    """Merge start-ordered subtitle streams into one renumbered stream.
+
+    Only one pending subtitle per stream is held in memory. Subtitles with equal
+    start times keep the order of the streams they came from.
+    """
+    if offsets is None:
+        offsets = [timedelta(0)] * len(streams)
+
+    shifted_streams = [_shift_stream(stream, offset) for stream, offset in zip(streams, offsets)]
+    merged = heapq.merge(*shifted_streams, key=_start_key)
+
+    return renumber_subtitles(merged)
+
+
+def renumber_subtitles(subtitles, start=1):
+    for number, subtitle in enumerate(subtitles, start=start):
+        yield subtitle.renumber(number)
+
+
+def sort_subtitles(subtitles, run_size=SORT_RUN_SIZE, temp_dir=None):
+    """Sort a subtitle stream by start time using at most ``run_size`` cues of memory.
+
+    Input is cut into runs of ``run_size`` cues, each sorted in memory and
+    spilled to an anonymous temp file, then the runs are merged lazily. Runs
+    hold one JSON line per cue, so every cue reads back exactly, including
+    cues without text. Input that fits in one run is never spilled. The sort
+    is stable, so cues sharing a start time keep their file order.
+    """
+    subtitles = iter(subtitles)
+    first_run = sorted(islice(subtitles, run_size), key=_start_key)
+    if len(first_run) < run_size:
+        yield from first_run
+        return
+
+    with ExitStack() as stack:
+        runs = [_spill(first_run, stack, temp_dir)]
+        del first_run
+        while True:
+            run = sorted(islice(subtitles, run_size), key=_start_key)
+            if not run:
+                break
+            runs.append(_spill(run, stack, temp_dir))
+
+        yield from heapq.merge(*runs, key=_start_key)
+
+
+def _spill(run, stack, temp_dir):
+    run_file = stack.enter_context(
+        tempfile.TemporaryFile("w+", encoding=FILE_ENCODING, dir=temp_dir)
+    )
+    for subtitle in run:
+        cue = [subtitle.number, subtitle.start_ms, subtitle.end_ms, subtitle.text]
+        run_file.write(json.dumps(cue, ensure_ascii=False))
+        run_file.write("\n")
+    run_file.seek(0)
+    return _read_run(run_file)
+
+
+def _read_run(run_file):
+    for line in run_file:
+        number, start_ms, end_ms, text = json.loads(line)
+        yield SRTSubtitle.from_milliseconds(number, start_ms, end_ms, text)
+
+
+def _shift_stream(stream, offset):
+    if not offset:
+        return iter(stream)
+    return (subtitle.shift(offset) for subtitle in stream)
+
+
+def _start_key(subtitle):
+    return subtitle.start_ms
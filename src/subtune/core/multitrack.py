@@ -0,0 +1,134 @@
+import glob
+import statistics
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..config import SYNC_MATCH_TOLERANCE_MS, SYNC_MAX_OFFSET_MS, SYNC_VOTE_BUCKET_MS
+from ..utils.profiling import process_pool
+from .exceptions import FileProcessingError, InvalidOffsetError, SubtuneError, describe_error
+from .repair import RepairReport, repair_subtitles
+from .validator import FileValidator
+
+
+@dataclass(frozen=True)
+class TrackReport:
+    """Outcome of syncing one language track."""
+
+    track: Path
+    output_path: Path
+    subtitle_count: int = 0
+    exit_code: int = 0
+    error: str = ""
+    repair: object = None
+
+    @property
+    def ok(self):
+        return not self.error
+
+
+def expand_tracks(patterns):
+    """Expand glob patterns and plain paths into a sorted, de-duplicated track list."""
+    tracks = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        tracks.extend(Path(match) for match in matches)
+
+    unique = list(dict.fromkeys(tracks))
+    if not unique:
+        raise FileProcessingError(f"No tracks match: {' '.join(patterns)}")
+    return unique
+
+
+def estimate_offset(reference_path, track_path, max_offset_ms=SYNC_MAX_OFFSET_MS):
+    """Estimate the offset that moves ``track_path`` onto ``reference_path``.
+
+    Tracks rarely have the same cues, so starts are not paired by position.
+    Instead every track start votes for its difference to each reference start
+    within ``max_offset_ms``; the true offset lines up many cues at once and
+    gets the most votes. Each track cue is then matched to the reference start
+    nearest to it under that offset, and the median of the close matches is
+    returned.
+    """
+    reference = sorted(
+        subtitle.start_ms for subtitle in FileValidator.iter_srt_file(reference_path)
+    )
+    track = sorted(subtitle.start_ms for subtitle in FileValidator.iter_srt_file(track_path))
+
+    votes = Counter()
+    for start in track:
+        low = bisect_left(reference, start - max_offset_ms)
+        high = bisect_right(reference, start + max_offset_ms)
+        votes.update((other - start) // SYNC_VOTE_BUCKET_MS for other in reference[low:high])
+    if not votes:
+        raise InvalidOffsetError(
+            f"No cues of {track_path} lie within {max_offset_ms}ms of {reference_path}"
+        )
+
+    # Neighbouring buckets count too, so an offset on a bucket edge is not split
+    bucket = max(votes, key=lambda b: (votes[b - 1] + votes[b] + votes[b + 1], votes[b]))
+    coarse = bucket * SYNC_VOTE_BUCKET_MS + SYNC_VOTE_BUCKET_MS // 2
+
+    differences = []
+    for start in track:
+        index = bisect_left(reference, start + coarse)
+        nearest = min(
+            reference[max(index - 1, 0) : index + 1], key=lambda other: abs(other - start - coarse)
+        )
+        if abs(nearest - start - coarse) <= SYNC_MATCH_TOLERANCE_MS:
+            differences.append(nearest - start)
+    return round(statistics.median(differences))
+
+
+def sync_tracks(tracks, offset_ms, output_dir=None, workers=1, repair_options=None):
+    """Apply one offset to every track and return a ``TrackReport`` per track.
+
+    The offset and output locations are validated once up front rather than per
+    track. Outputs go to ``output_dir`` under each track's file name, or replace
+    the tracks in place when it is None. A failing track does not stop the rest.
+    """
+    offset = FileValidator.validate_offset(offset_ms)
+    outputs = _output_paths(tracks, output_dir)
+
+    for parent in {output_path.parent for output_path in outputs}:
+        FileValidator.validate_output_location(parent / "track.srt")
+
+    jobs = [(track, output, offset, repair_options) for track, output in zip(tracks, outputs)]
+    if workers > 1 and len(jobs) > 1:
+        with process_pool(workers) as executor:
+            return list(executor.map(_sync_track, jobs))
+    return [_sync_track(job) for job in jobs]
+
+
+def _output_paths(tracks, output_dir):
+    if output_dir is None:
+        return list(tracks)
+
+    outputs = [Path(output_dir) / track.name for track in tracks]
+    seen = {}
+    for track, output in zip(tracks, outputs):
+        if output in seen:
+            raise FileProcessingError(
+                f"Tracks {seen[output]} and {track} would both be written to {output}"
+            )
+        seen[output] = track
+    return outputs
+
+
+def _sync_track(job):
+    track, output_path, offset, repair_options = job
+    report = None
+
+    try:
+        FileValidator.validate_input_file(track)
+        shifted = (subtitle.shift(offset) for subtitle in FileValidator.iter_srt_file(track))
+        if repair_options is not None:
+            report = RepairReport()
+            shifted = repair_subtitles(shifted, repair_options, report)
+        count = FileValidator.write_subtitles(shifted, output_path)
+    except SubtuneError as e:
+        exit_code, label = describe_error(e)
+        return TrackReport(track, output_path, exit_code=exit_code, error=f"{label}: {e}")
+
+    return TrackReport(track, output_path, count, repair=report)
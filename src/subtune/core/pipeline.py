@@ -0,0 +1,114 @@
+import logging
+import queue
+import time
+from contextlib import ExitStack
+from pathlib import Path
+
+from ..config import JOB_WINDOW_PER_WORKER
+from ..utils.backup import BackupManager
+from ..utils.profiling import process_pool, thread_pool
+from .validator import FileValidator
+from .workflow import ShiftResult, SubtitleProcessor
+
+logger = logging.getLogger(__name__)
+
+_processor = SubtitleProcessor(on_warning=logger.warning)
+
+
+def run_pipeline(jobs, io_threads=4, workers=1):
+    """Run shift jobs through overlapping read, shift and write stages.
+
+    Reader threads validate and read upcoming inputs, ``workers`` shift them
+    (a process pool when above 1, otherwise one thread) and writer threads make
+    the backups and atomic writes, so storage latency overlaps with parsing.
+    At most a bounded window of jobs is in flight, which caps the file contents
+    held in memory. Yields ``(job, result, error)`` as each job finishes, with
+    exactly one of ``result`` and ``error`` set.
+    """
+    window = 2 * io_threads + max(workers, 1) * JOB_WINDOW_PER_WORKER
+    finished = queue.Queue()
+
+    with ExitStack() as stack:
+        readers = stack.enter_context(thread_pool(io_threads, "subtune-read"))
+        writers = stack.enter_context(thread_pool(io_threads, "subtune-write"))
+        if workers > 1:
+            shifters = stack.enter_context(process_pool(workers))
+        else:
+            shifters = stack.enter_context(thread_pool(1, "subtune-shift"))
+
+        # Each stage hands its output to the next from a done callback; any
+        # failure, including a broken pool, finishes the job so none is lost.
+        def after_read(job, future):
+            try:
+                result, content, started = future.result()
+                shifted = shifters.submit(_shift, content, job.offset_ms)
+                shifted.add_done_callback(lambda f: after_shift(job, result, started, f))
+            except Exception as e:
+                finished.put((job, None, e))
+
+        def after_shift(job, result, started, future):
+            try:
+                written = writers.submit(_write, job, result, future.result(), started)
+                written.add_done_callback(lambda f: after_write(job, f))
+            except Exception as e:
+                finished.put((job, None, e))
+
+        def after_write(job, future):
+            try:
+                finished.put((job, future.result(), None))
+            except Exception as e:
+                finished.put((job, None, e))
+
+        in_flight = 0
+        for job in jobs:
+            if in_flight >= window:
+                yield finished.get()
+                in_flight -= 1
+            read = readers.submit(_read, job)
+            read.add_done_callback(lambda f, job=job: after_read(job, f))
+            in_flight += 1
+
+        for _ in range(in_flight):
+            yield finished.get()
+
+
+def _read(job):
+    started = time.perf_counter()
+    input_path = Path(job.input_path)
+    output_path = Path(job.output_path)
+    result = ShiftResult(input_path=input_path, output_path=output_path)
+
+    FileValidator.validate_input_file(input_path)
+    for warning in FileValidator.collect_file_warnings(input_path):
+        _processor.warn(result, warning)
+    FileValidator.validate_output_location(output_path)
+    FileValidator.validate_offset(job.offset_ms)
+    result.input_bytes = input_path.stat().st_size
+
+    content = FileValidator.read_text(input_path)
+    result.timings["read"] = time.perf_counter() - started
+    return result, content, started
+
+
+def _shift(content, offset_ms):
+    return _processor.shift_text(content, offset_ms)
+
+
+def _write(job, result, shifted, started):
+    stage_started = time.perf_counter()
+    result.subtitle_count = shifted.subtitle_count
+    result.dropped_blocks = shifted.dropped_blocks
+    for stage in ("parse", "shift", "format"):
+        result.timings[stage] = shifted.timings[stage]
+
+    if job.backup:
+        result.backup_path = BackupManager.create_backup(
+            result.input_path, on_warning=lambda message: _processor.warn(result, message)
+        )
+
+    temp_path = FileValidator.write_temp_file([shifted.content], result.output_path)
+    FileValidator.commit_output(temp_path, result.output_path)
+
+    result.timings["write"] = time.perf_counter() - stage_started
+    result.timings["total"] = time.perf_counter() - started
+    return result
@@ -1,26 +1,74 @@
 import re
+import sys
 from dataclasses import dataclass
+from datetime import timedelta
 
-from ..config import SRT_TIMING_LINE_PATTERN
-from .exceptions import InvalidSRTFormatError
-from .timestamp import SRTTimestamp
+from ..config import SRT_TIMING_LINE_PATTERN, TEXT_INTERN_MAX_LENGTH
+from .codec import format_timing_line, parse_timing_line
+from .exceptions import InvalidSRTFormatError, InvalidTimestampError
+from .timestamp import MAX_TIMESTAMP_MS, MILLISECONDS_PER_HOUR, SRTTimestamp
+
+ONE_MILLISECOND = timedelta(milliseconds=1)
 
 
-@dataclass(frozen=True)
 class SRTSubtitle:
-    """Immutable SRT subtitle entry with parsing and formatting capabilities."""
+    """Immutable SRT subtitle entry with parsing and formatting capabilities.
 
-    number: int
-    start: SRTTimestamp
-    end: SRTTimestamp
-    text: list
+    Timings are stored inline as integer milliseconds and the text as one
+    newline-joined string (interned when short) that is split on access.
+    """
 
-    def __post_init__(self):
-        if self.number <= 0:
-            raise InvalidSRTFormatError(f"Subtitle number must be positive, got {self.number}")
+    __slots__ = ("_number", "_start_ms", "_end_ms", "_text")
+
+    def __init__(self, number, start, end, text):
+        if number <= 0:
+            raise InvalidSRTFormatError(f"Subtitle number must be positive, got {number}")
 
-        if self.end.to_timedelta() < self.start.to_timedelta():
-            object.__setattr__(self, "end", self.start)
+        start_ms = start.to_milliseconds()
+        self._number = number
+        self._start_ms = start_ms
+        self._end_ms = max(end.to_milliseconds(), start_ms)
+        self._text = _pack_text(text)
+
+    @classmethod
+    def from_milliseconds(cls, number, start_ms, end_ms, text):
+        if number <= 0:
+            raise InvalidSRTFormatError(f"Subtitle number must be positive, got {number}")
+
+        return cls._create(number, start_ms, max(end_ms, start_ms), _pack_text(text))
+
+    @classmethod
+    def _create(cls, number, start_ms, end_ms, packed_text):
+        subtitle = cls.__new__(cls)
+        subtitle._number = number
+        subtitle._start_ms = start_ms
+        subtitle._end_ms = end_ms
+        subtitle._text = packed_text
+        return subtitle
+
+    @property
+    def number(self):
+        return self._number
+
+    @property
+    def start_ms(self):
+        return self._start_ms
+
+    @property
+    def end_ms(self):
+        return self._end_ms
+
+    @property
+    def start(self):
+        return SRTTimestamp.from_milliseconds(self._start_ms)
+
+    @property
+    def end(self):
+        return SRTTimestamp.from_milliseconds(self._end_ms)
+
+    @property
+    def text(self):
+        return self._text.split("\n") if self._text else []
 
     @classmethod
     def from_lines(cls, lines):
@@ -34,35 +82,60 @@ class SRTSubtitle:
         except ValueError as e:
             raise InvalidSRTFormatError(f"Invalid subtitle number: {lines[0]}") from e
 
-        timing_match = re.match(SRT_TIMING_LINE_PATTERN, lines[1])
-        if not timing_match:
-            raise InvalidSRTFormatError(f"Invalid timing format: {lines[1]}")
-
-        start_str, end_str = timing_match.groups()
-        start = SRTTimestamp.from_string(start_str)
-        end = SRTTimestamp.from_string(end_str)
+        timing = parse_timing_line(lines[1]) or _parse_timing_line_strict(lines[1])
+        start_ms, end_ms = timing
 
         text = [line.rstrip() for line in lines[2:]]
 
-        return cls(number, start, end, text)
+        return cls.from_milliseconds(number, start_ms, end_ms, text)
 
     def to_lines(self):
         lines = [
-            str(self.number),
-            f"{self.start.to_string()} --> {self.end.to_string()}",
+            str(self._number),
+            format_timing_line(self._start_ms, self._end_ms),
             *self.text,
             "",
         ]
         return lines
 
     def shift(self, offset):
-        new_start = self.start.shift(offset)
-        new_end = self.end.shift(offset)
+        offset_ms = offset // ONE_MILLISECOND
+        return self.retime(self._start_ms + offset_ms, self._end_ms + offset_ms)
 
-        if new_end.to_timedelta() < new_start.to_timedelta():
-            new_end = new_start
+    def retime(self, start_ms, end_ms):
+        start_ms = max(start_ms, 0)
+        end_ms = max(end_ms, start_ms)
 
-        return SRTSubtitle(self.number, new_start, new_end, self.text)
+        if end_ms > MAX_TIMESTAMP_MS:
+            hours = end_ms // MILLISECONDS_PER_HOUR
+            raise InvalidTimestampError(f"Hours exceed SRT format limit: {hours}")
+
+        return self._create(self._number, start_ms, end_ms, self._text)
+
+    def renumber(self, number):
+        if number <= 0:
+            raise InvalidSRTFormatError(f"Subtitle number must be positive, got {number}")
+
+        return self._create(number, self._start_ms, self._end_ms, self._text)
+
+    def __eq__(self, other):
+        if not isinstance(other, SRTSubtitle):
+            return NotImplemented
+        return (
+            self._number == other._number
+            and self._start_ms == other._start_ms
+            and self._end_ms == other._end_ms
+            and self._text == other._text
+        )
+
+    def __hash__(self):
+        return hash((self._number, self._start_ms, self._end_ms, self._text))
+
+    def __repr__(self):
+        return (
+            f"SRTSubtitle(number={self._number}, start={self.start!r}, "
+            f"end={self.end!r}, text={self.text!r})"
+        )
 
 
 @dataclass
@@ -77,37 +150,7 @@ class SRTFile:
 
     @classmethod
     def from_content(cls, content):
-        if not content.strip():
-            raise InvalidSRTFormatError("File is empty")
-
-        subtitles = []
-        current_subtitle_lines = []
-
-        for line in content.split("\n"):
-            line = line.rstrip()
-
-            if line == "" and current_subtitle_lines:
-                if len(current_subtitle_lines) >= 3:
-                    try:
-                        subtitle = SRTSubtitle.from_lines(current_subtitle_lines)
-                        subtitles.append(subtitle)
-                    except InvalidSRTFormatError:
-                        pass
-                current_subtitle_lines = []
-            elif line:
-                current_subtitle_lines.append(line)
-
-        if current_subtitle_lines and len(current_subtitle_lines) >= 3:
-            try:
-                subtitle = SRTSubtitle.from_lines(current_subtitle_lines)
-                subtitles.append(subtitle)
-            except InvalidSRTFormatError:
-                pass
-
-        if not subtitles:
-            raise InvalidSRTFormatError("No valid SRT timestamp format found in file")
-
-        return cls(subtitles)
+        return cls(list(iter_subtitles(content.split("\n"))))
 
     def to_content(self):
         lines = []
@@ -125,3 +168,67 @@ class SRTFile:
 
     def __iter__(self):
         return iter(self.subtitles)
+
+
+def iter_subtitles(lines, on_invalid=None):
+    """Lazily parse subtitles from an iterable of lines, skipping malformed blocks.
+
+    ``on_invalid`` is called with the lines of every skipped block.
+    """
+    found_content = False
+    found_subtitle = False
+    current_subtitle_lines = []
+
+    for line in lines:
+        line = line.rstrip()
+
+        if line == "" and current_subtitle_lines:
+            subtitle = _parse_block(current_subtitle_lines, on_invalid)
+            if subtitle is not None:
+                found_subtitle = True
+                yield subtitle
+            current_subtitle_lines = []
+        elif line:
+            found_content = True
+            current_subtitle_lines.append(line)
+
+    if current_subtitle_lines:
+        subtitle = _parse_block(current_subtitle_lines, on_invalid)
+        if subtitle is not None:
+            found_subtitle = True
+            yield subtitle
+
+    if not found_content:
+        raise InvalidSRTFormatError("File is empty")
+
+    if not found_subtitle:
+        raise InvalidSRTFormatError("No valid SRT timestamp format found in file")
+
+
+def _parse_block(lines, on_invalid):
+    try:
+        return SRTSubtitle.from_lines(lines)
+    except InvalidSRTFormatError:
+        if on_invalid is not None:
+            on_invalid(lines)
+        return None
+
+
+def _parse_timing_line_strict(line):
+    # Slow path for lines the codec rejects; raises the precise error
+    timing_match = re.match(SRT_TIMING_LINE_PATTERN, line)
+    if not timing_match:
+        raise InvalidSRTFormatError(f"Invalid timing format: {line}")
+
+    start_str, end_str = timing_match.groups()
+    return (
+        SRTTimestamp.from_string(start_str).to_milliseconds(),
+        SRTTimestamp.from_string(end_str).to_milliseconds(),
+    )
+
+
+def _pack_text(lines):
+    text = "\n".join(lines)
+    if len(text) <= TEXT_INTERN_MAX_LENGTH:
+        return sys.intern(text)
+    return text
@@ -0,0 +1,157 @@
+from dataclasses import dataclass
+
+from .exceptions import InvalidOffsetError, InvalidSRTFormatError
+from .merge import renumber_subtitles, sort_subtitles
+from .processor import SRTFile, SRTSubtitle
+
+STACKED_POLICIES = ("keep", "merge", "trim")
+
+
+@dataclass(frozen=True)
+class RepairOptions:
+    """Settings for the overlap, gap and duration repair stage.
+
+    Cues sharing a start time are treated as intentionally stacked. ``keep``
+    leaves them overlapping each other, ``merge`` joins them into one cue and
+    ``trim`` repairs them like any other overlap. A cue that trimming would
+    shrink to nothing keeps up to ``min_duration_ms`` instead and is not
+    counted as fixed, so without a minimum duration all but the last cue of a
+    trimmed stack end up zero-length. ``min_duration_ms`` never extends a cue
+    past the start of the next one. ``sort`` orders cues by start time first
+    (with bounded memory) and ``renumber`` numbers the repaired cues from 1.
+    """
+
+    fix_overlaps: bool = False
+    min_gap_ms: int = 0
+    min_duration_ms: int = 0
+    stacked: str = "keep"
+    sort: bool = False
+    renumber: bool = False
+
+    def __post_init__(self):
+        if self.min_gap_ms < 0:
+            raise InvalidOffsetError(f"Minimum gap cannot be negative: {self.min_gap_ms}ms")
+        if self.min_duration_ms < 0:
+            raise InvalidOffsetError(
+                f"Minimum duration cannot be negative: {self.min_duration_ms}ms"
+            )
+        if self.stacked not in STACKED_POLICIES:
+            raise InvalidOffsetError(f"Unknown stacked cue policy: {self.stacked}")
+
+
+@dataclass
+class RepairReport:
+    """Counts of the changes made by the repair stage."""
+
+    overlaps_fixed: int = 0
+    gaps_widened: int = 0
+    durations_extended: int = 0
+    stacked_groups: int = 0
+    cues_merged: int = 0
+
+    @property
+    def changes(self):
+        return self.overlaps_fixed + self.gaps_widened + self.durations_extended + self.cues_merged
+
+    def summary(self):
+        return (
+            f"{self.overlaps_fixed} overlaps fixed, {self.gaps_widened} gaps widened, "
+            f"{self.durations_extended} durations extended, {self.cues_merged} stacked cues merged"
+        )
+
+
+def repair_subtitles(subtitles, options, report=None):
+    """Repair a start-ordered subtitle stream in a single sweep.
+
+    Only the current group of cues sharing a start time is buffered, so the
+    stream is never held in memory. Unordered input raises unless
+    ``options.sort`` runs it through an external sort first.
+    """
+    if report is None:
+        report = RepairReport()
+
+    if options.sort:
+        subtitles = sort_subtitles(subtitles)
+    repaired = _repair_ordered(subtitles, options, report)
+    if options.renumber:
+        return renumber_subtitles(repaired)
+    return repaired
+
+
+def _repair_ordered(subtitles, options, report):
+    group = []
+    for subtitle in subtitles:
+        if group and subtitle.start_ms < group[0].start_ms:
+            raise InvalidSRTFormatError(
+                f"Subtitle {subtitle.number} starts before subtitle {group[0].number}; "
+                "cues must be in start-time order to repair"
+            )
+
+        if group and subtitle.start_ms == group[0].start_ms and options.stacked != "trim":
+            group.append(subtitle)
+            continue
+
+        yield from _flush_group(group, subtitle.start_ms, options, report)
+        group = [subtitle]
+
+    yield from _flush_group(group, None, options, report)
+
+
+def repair_srt_file(srt_file, options, report=None):
+    ordered = sorted(srt_file, key=_start_key)
+    return SRTFile(list(repair_subtitles(ordered, options, report)))
+
+
+def _flush_group(group, next_start_ms, options, report):
+    if not group:
+        return
+
+    if len(group) > 1:
+        report.stacked_groups += 1
+        if options.stacked == "merge":
+            report.cues_merged += len(group) - 1
+            group = [_merge_group(group)]
+
+    for subtitle in group:
+        yield _repair_cue(subtitle, next_start_ms, options, report)
+
+
+def _repair_cue(subtitle, next_start_ms, options, report):
+    start_ms = subtitle.start_ms
+    end_ms = max(subtitle.end_ms, start_ms + options.min_duration_ms)
+
+    if next_start_ms is not None:
+        limit_ms = max(next_start_ms - options.min_gap_ms, start_ms)
+        if subtitle.end_ms > next_start_ms:
+            end_ms = subtitle.end_ms
+            if options.fix_overlaps:
+                if limit_ms > start_ms:
+                    end_ms = limit_ms
+                else:
+                    # Trimming would erase the cue; keep up to min_duration_ms of it
+                    end_ms = min(start_ms + options.min_duration_ms, subtitle.end_ms)
+                if end_ms <= next_start_ms:
+                    report.overlaps_fixed += 1
+        elif end_ms > limit_ms:
+            if subtitle.end_ms > limit_ms:
+                report.gaps_widened += 1
+            end_ms = limit_ms
+
+    if end_ms == subtitle.end_ms:
+        return subtitle
+
+    if end_ms > subtitle.end_ms:
+        report.durations_extended += 1
+
+    return subtitle.retime(start_ms, end_ms)
+
+
+def _merge_group(group):
+    text = [line for subtitle in group for line in subtitle.text]
+    end_ms = max(subtitle.end_ms for subtitle in group)
+    first = group[0]
+    return SRTSubtitle.from_milliseconds(first.number, first.start_ms, end_ms, text)
+
+
+def _start_key(subtitle):
+    return subtitle.start_ms
@@ -0,0 +1,169 @@
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ..config import SEARCH_RESULT_LIMIT
+from .exceptions import FileProcessingError, InvalidQueryError, SubtuneError, describe_error
+from .incremental import file_digest
+from .stats import expand_srt_paths
+from .validator import FileValidator
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS files ("
+    "id INTEGER PRIMARY KEY, path TEXT UNIQUE, size INTEGER, mtime_ns INTEGER, digest TEXT)",
+    "CREATE TABLE IF NOT EXISTS cues ("
+    "id INTEGER PRIMARY KEY, file_id INTEGER, number INTEGER, "
+    "start_ms INTEGER, end_ms INTEGER, text TEXT)",
+    "CREATE INDEX IF NOT EXISTS cues_file ON cues (file_id)",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS cue_text USING fts5("
+    "text, content='cues', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS cues_insert AFTER INSERT ON cues BEGIN "
+    "INSERT INTO cue_text (rowid, text) VALUES (new.id, new.text); END",
+    "CREATE TRIGGER IF NOT EXISTS cues_delete AFTER DELETE ON cues BEGIN "
+    "INSERT INTO cue_text (cue_text, rowid, text) VALUES ('delete', old.id, old.text); END",
+)
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """One cue matching a search query."""
+
+    path: str
+    number: int
+    start_ms: int
+    end_ms: int
+    text: str
+
+
+@dataclass
+class IndexSummary:
+    """Counts for an index update; ``failed`` holds ``(path, exit_code, message)``."""
+
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    cues: int = 0
+    failed: list = field(default_factory=list)
+
+
+class SubtitleIndex:
+    """Persistent SQLite FTS5 index of cue text with file, number and timings.
+
+    Files are re-parsed only when their content hash changes; the hash itself is
+    only recomputed when size or mtime differ from the indexed copy. Cues are
+    parsed with the same parser the shift commands use, so indexed timings
+    match what subtune would shift.
+    """
+
+    def __init__(self, index_path):
+        try:
+            self.connection = sqlite3.connect(str(index_path))
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+            self.connection.commit()
+        except sqlite3.Error as e:
+            raise FileProcessingError(f"Cannot open search index {index_path}: {e}") from e
+
+    def update(self, paths, prune=True):
+        """Index SRT files and directories, dropping files that no longer exist."""
+        summary = IndexSummary()
+
+        for file_path in expand_srt_paths(paths):
+            try:
+                status = self._index_file(file_path.resolve(), summary)
+            except SubtuneError as e:
+                exit_code, label = describe_error(e)
+                summary.failed.append((file_path, exit_code, f"{label}: {e}"))
+                continue
+            if status == "added":
+                summary.added += 1
+            elif status == "updated":
+                summary.updated += 1
+            else:
+                summary.unchanged += 1
+
+        if prune:
+            summary.removed = self._prune()
+
+        return summary
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT):
+        try:
+            rows = self.connection.execute(
+                "SELECT files.path, cues.number, cues.start_ms, cues.end_ms, cues.text "
+                "FROM cue_text JOIN cues ON cues.id = cue_text.rowid "
+                "JOIN files ON files.id = cues.file_id "
+                "WHERE cue_text MATCH ? ORDER BY cue_text.rank LIMIT ?",
+                (query, limit),
+            ).fetchall()
+        except sqlite3.OperationalError as e:
+            raise InvalidQueryError(f"Invalid search query {query!r}: {e}") from e
+
+        return [SearchHit(*row) for row in rows]
+
+    def close(self):
+        self.connection.close()
+
+    def _index_file(self, file_path, summary):
+        FileValidator.validate_input_file(file_path)
+        key = str(file_path)
+        stat = file_path.stat()
+        row = self.connection.execute(
+            "SELECT id, size, mtime_ns, digest FROM files WHERE path = ?", (key,)
+        ).fetchone()
+
+        if row and (row[1], row[2]) == (stat.st_size, stat.st_mtime_ns):
+            return "unchanged"
+
+        digest = file_digest(file_path)
+        if row and row[3] == digest:
+            with self.connection:
+                self.connection.execute(
+                    "UPDATE files SET size = ?, mtime_ns = ? WHERE id = ?",
+                    (stat.st_size, stat.st_mtime_ns, row[0]),
+                )
+            return "unchanged"
+
+        try:
+            cues = [
+                (subtitle.number, subtitle.start_ms, subtitle.end_ms, "\n".join(subtitle.text))
+                for subtitle in FileValidator.iter_srt_file(file_path)
+            ]
+        except SubtuneError:
+            if row:
+                with self.connection:
+                    self._delete_file(row[0])
+            raise
+
+        with self.connection:
+            if row:
+                self._delete_file(row[0])
+            file_id = self.connection.execute(
+                "INSERT INTO files (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+                (key, stat.st_size, stat.st_mtime_ns, digest),
+            ).lastrowid
+            self.connection.executemany(
+                "INSERT INTO cues (file_id, number, start_ms, end_ms, text) VALUES (?, ?, ?, ?, ?)",
+                [(file_id, *cue) for cue in cues],
+            )
+
+        summary.cues += len(cues)
+        return "updated" if row else "added"
+
+    def _prune(self):
+        missing = [
+            file_id
+            for file_id, path in self.connection.execute("SELECT id, path FROM files").fetchall()
+            if not Path(path).is_file()
+        ]
+        with self.connection:
+            for file_id in missing:
+                self._delete_file(file_id)
+        return len(missing)
+
+    def _delete_file(self, file_id):
+        self.connection.execute("DELETE FROM cues WHERE file_id = ?", (file_id,))
+        self.connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
@@ -0,0 +1,185 @@
+import json
+import logging
+import os
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from ..config import ERROR_MESSAGES, FILE_ENCODING, SEEK_INDEX_INTERVAL, SEEK_INDEX_SUFFIX
+from ..utils.compression import Compression
+from .exceptions import FileProcessingError, InvalidSRTFormatError
+from .processor import iter_subtitles
+from .validator import FileValidator
+
+logger = logging.getLogger(__name__)
+
+SEEK_INDEX_VERSION = 1
+
+
+@dataclass
+class SeekIndex:
+    """Sparse sidecar index mapping every Nth cue to its byte offset in an SRT file.
+
+    Each entry is ``(offset, start_ms, max_end_before)``, where the last field
+    is the latest end time of any earlier cue. That running maximum only grows,
+    so the entry to seek to for a window is found by bisection, and no cue
+    before it can reach into the window.
+    """
+
+    size: int
+    mtime_ns: int
+    interval: int = SEEK_INDEX_INTERVAL
+    ordered: bool = True
+    entries: list = field(default_factory=list)
+
+    @staticmethod
+    def sidecar_path(source_path):
+        return Path(f"{source_path}{SEEK_INDEX_SUFFIX}")
+
+    @classmethod
+    def load(cls, source_path):
+        """Return the index for ``source_path``, or None if missing, unreadable or stale."""
+        try:
+            with open(cls.sidecar_path(source_path), encoding=FILE_ENCODING) as f:
+                data = json.load(f)
+            stat = os.stat(source_path)
+        except (OSError, ValueError):
+            return None
+
+        if data.get("version") != SEEK_INDEX_VERSION:
+            return None
+        if (data.get("size"), data.get("mtime_ns")) != (stat.st_size, stat.st_mtime_ns):
+            return None
+
+        return cls(
+            data["size"],
+            data["mtime_ns"],
+            data["interval"],
+            data["ordered"],
+            [tuple(entry) for entry in data["entries"]],
+        )
+
+    def save(self, source_path):
+        data = {"version": SEEK_INDEX_VERSION, **vars(self)}
+        sidecar = self.sidecar_path(source_path)
+        temp_path = FileValidator.write_temp_file(
+            [json.dumps(data, separators=(",", ":"))], sidecar
+        )
+        FileValidator.commit_output(temp_path, sidecar)
+
+    def seek_offset(self, start_ms):
+        # Last entry whose earlier cues all end by start_ms
+        position = bisect_right([entry[2] for entry in self.entries], start_ms) - 1
+        return self.entries[position][0] if position >= 0 else 0
+
+
+class SeekIndexBuilder:
+    """Collect a ``SeekIndex`` cue by cue while a file is read or written."""
+
+    def __init__(self, interval=SEEK_INDEX_INTERVAL):
+        self.index = SeekIndex(0, 0, interval)
+        self.block_offset = 0
+        self.count = 0
+        self.max_end = 0
+        self.last_start = 0
+
+    def lines(self, raw_lines):
+        # Decodes binary lines, noting where each block starts. iter_subtitles
+        # yields a cue on the blank line after it, before the next block
+        # begins, so block_offset then still points at that cue.
+        offset = 0
+        in_block = False
+        for raw in raw_lines:
+            line = raw.decode(FILE_ENCODING)
+            if line.strip():
+                if not in_block:
+                    self.block_offset = offset
+                    in_block = True
+            else:
+                in_block = False
+            offset += len(raw)
+            yield line
+
+    def add(self, subtitle, offset=None):
+        if offset is not None:
+            self.block_offset = offset
+        if self.count % self.index.interval == 0:
+            self.index.entries.append((self.block_offset, subtitle.start_ms, self.max_end))
+        self.count += 1
+        self.max_end = max(self.max_end, subtitle.end_ms)
+        self.index.ordered = self.index.ordered and subtitle.start_ms >= self.last_start
+        self.last_start = subtitle.start_ms
+
+    def save(self, source_path, stat=None):
+        """Save the index for ``source_path`` as it is on disk, or as of ``stat``.
+
+        The index is only an accelerator, so a failed save is logged rather than
+        raised.
+        """
+        try:
+            stat = stat or os.stat(source_path)
+            self.index.size, self.index.mtime_ns = stat.st_size, stat.st_mtime_ns
+            self.index.save(source_path)
+        except (OSError, FileProcessingError) as e:
+            logger.warning("Could not save seek index for %s: %s", source_path, e)
+
+
+def iter_srt_file_indexed(file_path, on_invalid=None, interval=SEEK_INDEX_INTERVAL):
+    """Parse like ``FileValidator.iter_srt_file`` and save a seek index once fully read.
+
+    Compressed files cannot be seeked into, so they are parsed without one.
+    """
+    file_path = Path(file_path)
+    if Compression.detect(file_path) is not None:
+        yield from FileValidator.iter_srt_file(file_path, on_invalid)
+        return
+
+    try:
+        with open(file_path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            builder = SeekIndexBuilder(interval)
+            for subtitle in iter_subtitles(builder.lines(f), on_invalid):
+                builder.add(subtitle)
+                yield subtitle
+    except UnicodeDecodeError as e:
+        raise InvalidSRTFormatError(ERROR_MESSAGES["invalid_utf8"]) from e
+    except OSError as e:
+        raise FileProcessingError(f"Error reading input file: {e}") from e
+
+    builder.save(file_path, stat)
+
+
+def read_window(file_path, start_ms, end_ms):
+    """Return the cues overlapping ``[start_ms, end_ms)`` without parsing the whole file.
+
+    A fresh seek index is used to jump close to the window, and reading stops
+    at the first cue starting after it when the file is in time order. A
+    missing or stale index is rebuilt by one full pass first.
+    """
+    file_path = Path(file_path)
+    FileValidator.validate_input_file(file_path)
+
+    index = SeekIndex.load(file_path)
+    if index is None:
+        return [
+            subtitle
+            for subtitle in iter_srt_file_indexed(file_path)
+            if subtitle.start_ms < end_ms and subtitle.end_ms > start_ms
+        ]
+
+    window = []
+    try:
+        with open(file_path, "rb") as f:
+            f.seek(index.seek_offset(start_ms))
+            lines = (raw.decode(FILE_ENCODING) for raw in f)
+            for subtitle in iter_subtitles(lines):
+                if index.ordered and subtitle.start_ms >= end_ms:
+                    break
+                if subtitle.start_ms < end_ms and subtitle.end_ms > start_ms:
+                    window.append(subtitle)
+    except UnicodeDecodeError as e:
+        raise InvalidSRTFormatError(ERROR_MESSAGES["invalid_utf8"]) from e
+    except OSError as e:
+        raise FileProcessingError(f"Error reading input file: {e}") from e
+
+    return window
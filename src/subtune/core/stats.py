@@ -0,0 +1,240 @@
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import repeat
+from operator import gt, sub
+from pathlib import Path
+
+from ..config import STATS_BUCKET_MS, STATS_PERCENTILES, VALID_SRT_EXTENSIONS
+from ..utils.compression import Compression
+from ..utils.profiling import process_pool
+from .exceptions import SubtuneError, describe_error
+from .seekindex import iter_srt_file_indexed
+from .timestamp import MILLISECONDS_PER_HOUR
+from .validator import FileValidator
+
+
+@dataclass
+class TimingStats:
+    """Mergeable timing statistics for one file or a whole library.
+
+    Durations and gaps are kept as fixed-width histograms rather than raw
+    values, so merging is a cheap sum and percentiles have ``STATS_BUCKET_MS``
+    resolution.
+    """
+
+    files: int = 0
+    cues: int = 0
+    characters: int = 0
+    total_duration_ms: int = 0
+    max_duration_ms: int = 0
+    overlaps: int = 0
+    first_start_ms: object = None
+    last_end_ms: object = None
+    duration_histogram: Counter = field(default_factory=Counter)
+    gap_histogram: Counter = field(default_factory=Counter)
+
+    @classmethod
+    def from_subtitles(cls, subtitles):
+        starts = array("q")
+        ends = array("q")
+        characters = 0
+
+        for subtitle in subtitles:
+            starts.append(subtitle.start_ms)
+            ends.append(subtitle.end_ms)
+            characters += sum(len(line) for line in subtitle.text)
+
+        return cls.from_arrays(starts, ends, characters)
+
+    @classmethod
+    def from_arrays(cls, starts, ends, characters=0):
+        stats = cls(files=1, cues=len(starts), characters=characters)
+        if not starts:
+            return stats
+
+        if any(map(gt, starts[:-1], starts[1:])):
+            order = sorted(range(len(starts)), key=starts.__getitem__)
+            starts = array("q", (starts[index] for index in order))
+            ends = array("q", (ends[index] for index in order))
+
+        durations = list(map(sub, ends, starts))
+        gaps = list(map(sub, starts[1:], ends[:-1]))
+
+        stats.total_duration_ms = sum(durations)
+        stats.max_duration_ms = max(durations)
+        stats.overlaps = sum(gap < 0 for gap in gaps)
+        stats.first_start_ms = starts[0]
+        stats.last_end_ms = max(ends)
+        stats.duration_histogram = Counter(duration // STATS_BUCKET_MS for duration in durations)
+        stats.gap_histogram = Counter(gap // STATS_BUCKET_MS for gap in gaps if gap >= 0)
+
+        return stats
+
+    def merge(self, other):
+        self.files += other.files
+        self.cues += other.cues
+        self.characters += other.characters
+        self.total_duration_ms += other.total_duration_ms
+        self.max_duration_ms = max(self.max_duration_ms, other.max_duration_ms)
+        self.overlaps += other.overlaps
+        self.first_start_ms = _optional(min, self.first_start_ms, other.first_start_ms)
+        self.last_end_ms = _optional(max, self.last_end_ms, other.last_end_ms)
+        self.duration_histogram.update(other.duration_histogram)
+        self.gap_histogram.update(other.gap_histogram)
+        return self
+
+    @property
+    def mean_duration_ms(self):
+        return self.total_duration_ms / self.cues if self.cues else 0.0
+
+    @property
+    def characters_per_second(self):
+        if not self.total_duration_ms:
+            return 0.0
+        return self.characters * 1000 / self.total_duration_ms
+
+    def duration_percentiles(self):
+        return _percentiles(self.duration_histogram)
+
+    def gap_percentiles(self):
+        return _percentiles(self.gap_histogram)
+
+    def to_dict(self):
+        return {
+            "files": self.files,
+            "cues": self.cues,
+            "total_duration_ms": self.total_duration_ms,
+            "mean_duration_ms": round(self.mean_duration_ms, 1),
+            "max_duration_ms": self.max_duration_ms,
+            "duration_percentiles_ms": self.duration_percentiles(),
+            "characters": self.characters,
+            "characters_per_second": round(self.characters_per_second, 2),
+            "gap_percentiles_ms": self.gap_percentiles(),
+            "overlaps": self.overlaps,
+            "first_start_ms": self.first_start_ms,
+            "last_end_ms": self.last_end_ms,
+        }
+
+    def to_table(self):
+        durations = self.duration_percentiles()
+        gaps = self.gap_percentiles()
+        labels = "/".join(f"p{percentile}" for percentile in STATS_PERCENTILES)
+
+        rows = [
+            ("Files", str(self.files)),
+            ("Cues", str(self.cues)),
+            ("Total duration", _format_ms(self.total_duration_ms)),
+            ("Mean duration", f"{self.mean_duration_ms / 1000:.2f}s"),
+            ("Max duration", f"{self.max_duration_ms / 1000:.2f}s"),
+            (f"Duration {labels}", _format_seconds(durations.values())),
+            ("Characters/second", f"{self.characters_per_second:.1f}"),
+            (f"Gap {labels}", _format_seconds(gaps.values())),
+            ("Overlaps", str(self.overlaps)),
+            ("First cue start", _format_ms(self.first_start_ms)),
+            ("Last cue end", _format_ms(self.last_end_ms)),
+        ]
+        width = max(len(label) for label, _value in rows) + 2
+        return "\n".join(f"{label + ':':<{width}}{value}" for label, value in rows)
+
+
+def file_stats(file_path, seek_index=False):
+    if seek_index:
+        return TimingStats.from_subtitles(iter_srt_file_indexed(file_path))
+    return TimingStats.from_subtitles(FileValidator.iter_srt_file(file_path))
+
+
+def library_stats(paths, workers=1, seek_index=False):
+    """Compute per-file stats in parallel and reduce them into a library total.
+
+    Returns ``(total, per_file, errors)`` where ``per_file`` pairs each path with
+    its stats and ``errors`` holds ``(path, exit_code, message)`` for failing files.
+    With ``seek_index`` a seek index sidecar is saved beside each file read.
+    """
+    files = expand_srt_paths(paths)
+    total = TimingStats()
+    per_file = []
+    errors = []
+
+    if workers > 1:
+        with process_pool(workers) as executor:
+            outcomes = list(executor.map(_safe_file_stats, files, repeat(seek_index), chunksize=16))
+    else:
+        outcomes = [_safe_file_stats(file_path, seek_index) for file_path in files]
+
+    for file_path, (stats, exit_code, error) in zip(files, outcomes):
+        if error is not None:
+            errors.append((file_path, exit_code, error))
+            continue
+        per_file.append((file_path, stats))
+        total.merge(stats)
+
+    return total, per_file, errors
+
+
+def expand_srt_paths(paths):
+    extensions = {extension.lower() for extension in VALID_SRT_EXTENSIONS}
+    files = []
+
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(
+                sorted(
+                    candidate
+                    for candidate in path.rglob("*")
+                    if candidate.is_file()
+                    and Compression.strip_extension(candidate).suffix.lower() in extensions
+                )
+            )
+        else:
+            files.append(path)
+
+    return files
+
+
+def _safe_file_stats(file_path, seek_index):
+    try:
+        return file_stats(file_path, seek_index), 0, None
+    except SubtuneError as e:
+        exit_code, label = describe_error(e)
+        return None, exit_code, f"{label}: {e}"
+
+
+def _percentiles(histogram):
+    count = sum(histogram.values())
+    result = {}
+    if not count:
+        return {f"p{percentile}": None for percentile in STATS_PERCENTILES}
+
+    buckets = sorted(histogram.items())
+    for percentile in STATS_PERCENTILES:
+        target = count * percentile / 100
+        cumulative = 0
+        for bucket, bucket_count in buckets:
+            cumulative += bucket_count
+            if cumulative >= target:
+                result[f"p{percentile}"] = bucket * STATS_BUCKET_MS
+                break
+
+    return result
+
+
+def _optional(function, first, second):
+    if first is None:
+        return second
+    if second is None:
+        return first
+    return function(first, second)
+
+
+def _format_ms(value):
+    if value is None:
+        return "-"
+    hours, remainder = divmod(value, MILLISECONDS_PER_HOUR)
+    minutes, remainder = divmod(remainder, 60000)
+    seconds, milliseconds = divmod(remainder, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
+
+
+def _format_seconds(values):
+    return " / ".join("-" if value is None else f"{value / 1000:.2f}s" for value in values)
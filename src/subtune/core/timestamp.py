@@ -5,6 +5,9 @@ from datetime import timedelta
 from ..config import SRT_TIMESTAMP_PATTERN
 from .exceptions import InvalidTimestampError
 
+MILLISECONDS_PER_HOUR = 3600000
+MAX_TIMESTAMP_MS = 100 * MILLISECONDS_PER_HOUR - 1
+
 
 @dataclass(frozen=True)
 class SRTTimestamp:
@@ -56,6 +59,23 @@ class SRTTimestamp:
 
         return cls(h, m, s, ms)
 
+    @classmethod
+    def from_milliseconds(cls, total_ms):
+        if total_ms < 0:
+            raise InvalidTimestampError("Cannot format negative timestamp")
+
+        h, remainder = divmod(total_ms, MILLISECONDS_PER_HOUR)
+        m, remainder = divmod(remainder, 60000)
+        s, ms = divmod(remainder, 1000)
+
+        if h > 99:
+            raise InvalidTimestampError(f"Hours exceed SRT format limit: {h}")
+
+        return cls(h, m, s, ms)
+
+    def to_milliseconds(self):
+        return ((self.hours * 60 + self.minutes) * 60 + self.seconds) * 1000 + self.milliseconds
+
     def to_timedelta(self):
         return timedelta(
             hours=self.hours,
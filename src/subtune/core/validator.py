@@ -1,3 +1,4 @@
+import filecmp
 import os
 import shutil
 import tempfile
@@ -13,12 +14,14 @@ from ..config import (
     TEMP_FILE_SUFFIX,
     VALID_SRT_EXTENSIONS,
 )
+from ..utils.compression import CODEC_ERRORS, Compression
 from .exceptions import (
     FileProcessingError,
     InvalidOffsetError,
     InvalidSRTFormatError,
+    SubtuneError,
 )
-from .processor import SRTFile
+from .processor import SRTFile, iter_subtitles
 
 
 class FileValidator:
@@ -49,51 +52,143 @@ class FileValidator:
             raise FileProcessingError(f"Output directory is not writable: {parent_dir}")
 
     @staticmethod
-    def check_file_warnings(file_path):
-        if file_path.suffix.lower() not in [ext.lower() for ext in VALID_SRT_EXTENSIONS]:
-            print(f"Warning: Input file does not have .srt extension: {file_path}")
+    def collect_file_warnings(file_path):
+        warnings = []
+
+        srt_path = Compression.strip_extension(file_path)
+        if srt_path.suffix.lower() not in [ext.lower() for ext in VALID_SRT_EXTENSIONS]:
+            warnings.append(f"Input file does not have .srt extension: {file_path}")
 
         file_size = file_path.stat().st_size
         if file_size > MAX_FILE_SIZE_BYTES:
-            print(f"Warning: Large file detected ({file_size / BYTES_PER_MB:.1f}MB)")
+            warnings.append(f"Large file detected ({file_size / BYTES_PER_MB:.1f}MB)")
+
+        return warnings
+
+    @staticmethod
+    def check_file_warnings(file_path):
+        for warning in FileValidator.collect_file_warnings(file_path):
+            print(f"Warning: {warning}")
 
     @staticmethod
     def read_srt_file(file_path):
+        return SRTFile(list(FileValidator.iter_srt_file(file_path)))
+
+    @staticmethod
+    def iter_srt_file(file_path, on_invalid=None):
+        try:
+            with Compression.open_reader(file_path, FILE_ENCODING) as f:
+                yield from iter_subtitles(f, on_invalid)
+        except UnicodeDecodeError as e:
+            raise InvalidSRTFormatError(ERROR_MESSAGES["invalid_utf8"]) from e
+        except CODEC_ERRORS as e:
+            raise FileProcessingError(f"Error reading input file: {e}") from e
+
+    @staticmethod
+    def read_text(file_path):
         try:
-            with open(file_path, encoding=FILE_ENCODING) as f:
-                content = f.read()
-            return SRTFile.from_content(content)
+            with Compression.open_reader(file_path, FILE_ENCODING) as f:
+                return f.read()
         except UnicodeDecodeError as e:
             raise InvalidSRTFormatError(ERROR_MESSAGES["invalid_utf8"]) from e
-        except OSError as e:
+        except CODEC_ERRORS as e:
             raise FileProcessingError(f"Error reading input file: {e}") from e
 
     @staticmethod
-    def write_srt_file(srt_file, output_path):
-        parent_dir = output_path.parent
+    def write_srt_file(srt_file, output_path, on_unchanged=None):
+        FileValidator.write_subtitles(srt_file, output_path, on_unchanged)
+
+    @staticmethod
+    def write_subtitles(subtitles, output_path, on_unchanged=None, on_block=None):
+        """Write subtitles atomically to ``output_path`` and return how many were written.
+
+        ``on_block(subtitle, offset)`` is called with the byte offset at which
+        each subtitle's block starts in the uncompressed output.
+        """
+        count = 0
+        offset = 0
+
+        def chunks():
+            nonlocal count, offset
+            for subtitle in subtitles:
+                if count:
+                    yield "\n"
+                    offset += len(os.linesep)
+                block = "\n".join(subtitle.to_lines())
+                if on_block is not None:
+                    on_block(subtitle, offset)
+                    # The text stream writes each "\n" as os.linesep
+                    offset += len(block.encode(FILE_ENCODING)) + block.count("\n") * (
+                        len(os.linesep) - 1
+                    )
+                yield block
+                count += 1
+
+        temp_path = FileValidator.write_temp_file(chunks(), output_path)
+        if not count:
+            temp_path.unlink()
+            raise InvalidSRTFormatError("SRT file must contain at least one subtitle")
+
+        FileValidator.commit_output(temp_path, output_path, on_unchanged)
+        return count
+
+    @staticmethod
+    def write_temp_file(chunks, output_path):
+        """Write text chunks to a temp file beside ``output_path`` and return its path.
+
+        The temp file is compressed according to the output extension and is
+        removed again if writing fails. ``commit_output`` moves it into place.
+        """
+        compression = Compression.from_extension(output_path)
         temp_file = None
 
         try:
             with tempfile.NamedTemporaryFile(
-                mode="w",
-                encoding=FILE_ENCODING,
+                mode="wb",
                 delete=False,
                 suffix=TEMP_FILE_SUFFIX,
-                dir=parent_dir,
+                dir=output_path.parent,
             ) as temp_file:
-                temp_path = Path(temp_file.name)
-                temp_file.write(srt_file.to_content())
+                with Compression.open_writer(temp_file, compression, FILE_ENCODING) as stream:
+                    stream.writelines(chunks)
+            return Path(temp_file.name)
+
+        except Exception as e:
+            FileValidator.discard_temp_file(temp_file and Path(temp_file.name))
+            if isinstance(e, SubtuneError):
+                raise
+            raise FileProcessingError(f"Error writing output file: {e}") from e
+
+    @staticmethod
+    def commit_output(temp_path, output_path, on_unchanged=None):
+        # With on_unchanged set, identical outputs are left untouched (mtime included)
+        try:
+            if (
+                on_unchanged is not None
+                and output_path.is_file()
+                and filecmp.cmp(temp_path, output_path, shallow=False)
+            ):
+                temp_path.unlink()
+                on_unchanged(output_path)
+                return
 
             shutil.move(str(temp_path), str(output_path))
 
         except Exception as e:
-            if temp_file and Path(temp_file.name).exists():
-                try:
-                    Path(temp_file.name).unlink()
-                except Exception:
-                    pass
+            FileValidator.discard_temp_file(temp_path)
+            if isinstance(e, SubtuneError):
+                raise
             raise FileProcessingError(f"Error writing output file: {e}") from e
 
+    @staticmethod
+    def discard_temp_file(temp_path):
+        """Remove a temp file from ``write_temp_file``, ignoring ``None`` and errors."""
+        if temp_path is not None:
+            try:
+                temp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
     @staticmethod
     def validate_offset(offset_ms):
         try:
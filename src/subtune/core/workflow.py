@@ -1,36 +1,298 @@
+import time
+from dataclasses import asdict, dataclass, field
+
+from ..config import ERROR_MESSAGES, FILE_ENCODING
 from ..utils.backup import BackupManager
+from ..utils.compression import Compression
+from .exceptions import FileProcessingError, InvalidOffsetError, InvalidSRTFormatError
+from .incremental import file_digest
+from .journal import track_clamped
+from .merge import merge_subtitles
+from .processor import ONE_MILLISECOND, SRTFile, iter_subtitles
+from .repair import RepairReport, repair_srt_file, repair_subtitles
+from .seekindex import SeekIndex, SeekIndexBuilder
 from .validator import FileValidator
 
 
+@dataclass
+class ShiftResult:
+    """Structured outcome of a single shift operation."""
+
+    subtitle_count: int = 0
+    dropped_blocks: int = 0
+    warnings: list = field(default_factory=list)
+    timings: dict = field(default_factory=dict)
+    input_path: object = None
+    output_path: object = None
+    backup_path: object = None
+    content: object = None
+    error: object = None
+    up_to_date: bool = False
+    unchanged: bool = False
+    repair: object = None
+    input_bytes: int = 0
+
+
 class SubtitleProcessor:
-    """Main service orchestrator for SRT subtitle processing operations."""
+    """Main service orchestrator for SRT subtitle processing operations.
+
+    Warnings go to ``on_warning`` when given and are printed otherwise. File
+    results and failures are recorded in ``metrics`` when given. A single
+    instance holds no per-call state and can be reused for any number of files.
+    """
 
-    def __init__(self):
+    def __init__(self, on_warning=None, metrics=None):
         self.validator = FileValidator()
         self.backup_manager = BackupManager()
+        self.on_warning = on_warning
+        self.metrics = metrics
+
+    def shift_srt_file(
+        self,
+        input_path,
+        output_path,
+        offset_ms,
+        create_backup=False,
+        repair_options=None,
+        journal=None,
+        seek_index=False,
+    ):
+        result = self.shift_file(
+            input_path,
+            output_path,
+            offset_ms,
+            create_backup,
+            repair_options=repair_options,
+            journal=journal,
+            seek_index=seek_index,
+        )
+
+        if result.backup_path:
+            print(f"Created backup: {result.backup_path}")
+
+        print(f"Successfully processed {result.subtitle_count} subtitles")
+
+        if result.repair is not None:
+            print(f"Repaired timings: {result.repair.summary()}")
+
+        return result.subtitle_count
+
+    def shift_file(
+        self,
+        input_path,
+        output_path,
+        offset_ms,
+        create_backup=False,
+        build_state=None,
+        skip_identical=False,
+        repair_options=None,
+        journal=None,
+        seek_index=False,
+    ):
+        try:
+            result = self._shift_file(
+                input_path,
+                output_path,
+                offset_ms,
+                create_backup,
+                build_state,
+                skip_identical,
+                repair_options,
+                journal,
+                seek_index,
+            )
+        except Exception as e:
+            if self.metrics is not None:
+                self.metrics.record_error(e)
+            raise
+
+        if self.metrics is not None:
+            self.metrics.record_result(result)
+        return result
+
+    def _shift_file(
+        self,
+        input_path,
+        output_path,
+        offset_ms,
+        create_backup,
+        build_state,
+        skip_identical,
+        repair_options,
+        journal,
+        seek_index,
+    ):
+        result = ShiftResult(input_path=input_path, output_path=output_path)
+        started = time.perf_counter()
 
-    def shift_srt_file(self, input_path, output_path, offset_ms, create_backup=False):
         self.validator.validate_input_file(input_path)
-        self.validator.check_file_warnings(input_path)
+        result.input_bytes = input_path.stat().st_size
+        for warning in self.validator.collect_file_warnings(input_path):
+            self.warn(result, warning)
         self.validator.validate_output_location(output_path)
 
         offset = self.validator.validate_offset(offset_ms)
+        result.timings["validate"] = time.perf_counter() - started
+
+        # Compressed outputs cannot be seeked into, so they get no index
+        seek_index = seek_index and Compression.from_extension(output_path) is None
+
+        fingerprint = None
+        if build_state is not None:
+            if input_path.resolve() == output_path.resolve():
+                raise FileProcessingError(
+                    "Incremental mode needs an output file separate from the input"
+                )
+
+            skip_identical = True
+            options = {"repair": asdict(repair_options)} if repair_options else None
+            fingerprint = build_state.fingerprint(input_path, offset // ONE_MILLISECOND, options)
+            # An up-to-date output missing its seek index is reprocessed to build one;
+            # skip_identical leaves the output itself untouched
+            index_missing = seek_index and SeekIndex.load(output_path) is None
+            if build_state.is_up_to_date(output_path, fingerprint) and not index_missing:
+                result.up_to_date = True
+                result.timings["total"] = time.perf_counter() - started
+                return result
+
+        before_digest = None
+        if journal is not None:
+            if input_path.resolve() != output_path.resolve():
+                raise FileProcessingError("The undo journal only records in-place shifts")
+            if repair_options is not None:
+                raise FileProcessingError("Repaired shifts cannot be recorded for undo")
+            before_digest = file_digest(input_path)
 
-        backup_path = None
         if create_backup:
-            backup_path = self.backup_manager.create_backup(input_path)
-            if backup_path:
-                print(f"Created backup: {backup_path}")
+            stage_started = time.perf_counter()
+            result.backup_path = self.backup_manager.create_backup(
+                input_path, on_warning=lambda message: self.warn(result, message)
+            )
+            result.timings["backup"] = time.perf_counter() - stage_started
+
+        stage_started = time.perf_counter()
+        subtitles = self.validator.iter_srt_file(input_path, self._drop_counter(result))
+        clamped = {}
+        if journal is not None:
+            shifted = track_clamped(subtitles, offset, clamped)
+        else:
+            shifted = (subtitle.shift(offset) for subtitle in subtitles)
+        if repair_options is not None:
+            result.repair = RepairReport()
+            shifted = repair_subtitles(shifted, repair_options, result.repair)
 
-        srt_file = self.validator.read_srt_file(input_path)
+        index_builder = SeekIndexBuilder() if seek_index else None
+
+        result.subtitle_count = self.validator.write_subtitles(
+            shifted,
+            output_path,
+            on_unchanged=self.unchanged_marker(result) if skip_identical else None,
+            on_block=index_builder.add if index_builder is not None else None,
+        )
+        if index_builder is not None:
+            index_builder.save(output_path)
+        result.timings["process"] = time.perf_counter() - stage_started
+
+        if journal is not None:
+            journal.record(output_path, offset // ONE_MILLISECOND, clamped, before_digest)
+        if build_state is not None:
+            build_state.record(output_path, fingerprint)
+        result.timings["total"] = time.perf_counter() - started
+
+        return result
+
+    def shift_text(self, content, offset_ms, repair_options=None):
+        result = ShiftResult()
+        started = time.perf_counter()
+
+        offset = self.validator.validate_offset(offset_ms)
+
+        stage_started = time.perf_counter()
+        srt_file = SRTFile(list(iter_subtitles(content.split("\n"), self._drop_counter(result))))
+        result.timings["parse"] = time.perf_counter() - stage_started
+
+        stage_started = time.perf_counter()
         shifted_srt = self._shift_subtitles(srt_file, offset)
-        self.validator.write_srt_file(shifted_srt, output_path)
+        result.timings["shift"] = time.perf_counter() - stage_started
+
+        if repair_options is not None:
+            stage_started = time.perf_counter()
+            result.repair = RepairReport()
+            shifted_srt = repair_srt_file(shifted_srt, repair_options, result.repair)
+            result.timings["repair"] = time.perf_counter() - stage_started
+
+        stage_started = time.perf_counter()
+        result.content = shifted_srt.to_content()
+        result.timings["format"] = time.perf_counter() - stage_started
+
+        result.subtitle_count = len(shifted_srt)
+        result.timings["total"] = time.perf_counter() - started
+
+        return result
 
-        subtitle_count = len(shifted_srt)
-        print(f"Successfully processed {subtitle_count} subtitles")
+    def shift_bytes(self, data, offset_ms, encoding=FILE_ENCODING, repair_options=None):
+        try:
+            content = data.decode(encoding)
+        except UnicodeDecodeError as e:
+            raise InvalidSRTFormatError(ERROR_MESSAGES["invalid_utf8"]) from e
+
+        result = self.shift_text(content, offset_ms, repair_options)
+        result.content = result.content.encode(encoding)
+
+        return result
+
+    def merge_srt_files(self, input_paths, output_path, offsets_ms=None):
+        if offsets_ms is None:
+            offsets_ms = [0] * len(input_paths)
+
+        if len(offsets_ms) != len(input_paths):
+            raise InvalidOffsetError(
+                f"Expected {len(input_paths)} offsets (one per input), got {len(offsets_ms)}"
+            )
+
+        for input_path in input_paths:
+            self.validator.validate_input_file(input_path)
+            for warning in self.validator.collect_file_warnings(input_path):
+                self._report_warning(warning)
+        self.validator.validate_output_location(output_path)
+
+        offsets = [self.validator.validate_offset(offset_ms) for offset_ms in offsets_ms]
+
+        streams = [self.validator.iter_srt_file(input_path) for input_path in input_paths]
+        subtitle_count = self.validator.write_subtitles(
+            merge_subtitles(streams, offsets), output_path
+        )
+        print(f"Successfully merged {subtitle_count} subtitles from {len(input_paths)} files")
 
         return subtitle_count
 
+    def warn(self, result, message):
+        """Record a warning on ``result`` and pass it on to ``on_warning``."""
+        result.warnings.append(message)
+        self._report_warning(message)
+
+    def _report_warning(self, message):
+        if self.on_warning is None:
+            print(f"Warning: {message}")
+        else:
+            self.on_warning(message)
+
+    @staticmethod
+    def _drop_counter(result):
+        def count_dropped(_lines):
+            result.dropped_blocks += 1
+
+        return count_dropped
+
+    @staticmethod
+    def unchanged_marker(result):
+        """Return an ``on_unchanged`` callback that sets ``result.unchanged``."""
+
+        def mark_unchanged(_output_path):
+            result.unchanged = True
+
+        return mark_unchanged
+
     @staticmethod
     def _shift_subtitles(srt_file, offset):
         return srt_file.shift(offset)
@@ -1,17 +1,21 @@
 import shutil
 
-from ..config import BACKUP_SUFFIX
+from ..config import BACKUP_SUFFIX, WARNINGS
 
 
 class BackupManager:
     """Utility for creating backup files before SRT modifications."""
 
     @staticmethod
-    def create_backup(file_path):
+    def create_backup(file_path, on_warning=None):
         backup_path = file_path.with_suffix(file_path.suffix + BACKUP_SUFFIX)
         try:
             shutil.copy2(file_path, backup_path)
             return backup_path
         except Exception as e:
-            print(f"Warning: Could not create backup file: {e}")
+            message = WARNINGS["backup_failed"].format(error=e)
+            if on_warning is None:
+                print(f"Warning: {message}")
+            else:
+                on_warning(message)
             return None
@@ -0,0 +1,68 @@
+import bz2
+import gzip
+import io
+import lzma
+from pathlib import Path
+
+from ..config import COMPRESSION_EXTENSIONS, COMPRESSION_MAGIC
+
+# Raised by the codecs on corrupt or truncated input, besides OSError
+CODEC_ERRORS = (OSError, EOFError, lzma.LZMAError)
+
+_OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+MAGIC_LENGTH = max(len(magic) for magic in COMPRESSION_MAGIC)
+
+
+class Compression:
+    """Streaming gzip, bz2 and xz support for subtitle files."""
+
+    @staticmethod
+    def detect(file_path):
+        try:
+            with open(file_path, "rb") as f:
+                header = f.read(MAGIC_LENGTH)
+        except OSError:
+            return Compression.from_extension(file_path)
+
+        for magic, compression in COMPRESSION_MAGIC.items():
+            if header.startswith(magic):
+                return compression
+
+        return None
+
+    @staticmethod
+    def from_extension(file_path):
+        return COMPRESSION_EXTENSIONS.get(Path(file_path).suffix.lower())
+
+    @staticmethod
+    def strip_extension(file_path):
+        file_path = Path(file_path)
+        if Compression.from_extension(file_path):
+            return file_path.with_suffix("")
+        return file_path
+
+    @staticmethod
+    def open_reader(file_path, encoding):
+        compression = Compression.detect(file_path)
+        if compression is None:
+            return open(file_path, encoding=encoding)
+        return _OPENERS[compression](file_path, "rt", encoding=encoding)
+
+    @staticmethod
+    def open_writer(raw, compression, encoding):
+        """Wrap the binary file ``raw`` in a text stream that compresses on write.
+
+        Closing the returned stream finishes the compressed stream. Gzip headers
+        carry no name or timestamp, so identical content compresses to
+        identical bytes and unchanged outputs can still be detected.
+        """
+        if compression == "gzip":
+            stream = gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0)
+        elif compression == "bz2":
+            stream = bz2.BZ2File(raw, "wb")
+        elif compression == "xz":
+            stream = lzma.LZMAFile(raw, "wb")
+        else:
+            stream = raw
+
+        return io.TextIOWrapper(stream, encoding=encoding)
@@ -0,0 +1,136 @@
+import os
+import tempfile
+import time
+from bisect import bisect_left
+from collections import Counter
+from pathlib import Path
+
+from ..config import METRICS_LATENCY_BUCKETS, METRICS_PREFIX
+from ..core.exceptions import FileProcessingError
+
+METRICS = {
+    "files_total": ("counter", "Subtitle files written."),
+    "files_up_to_date_total": (
+        "counter",
+        "Subtitle files skipped because outputs were up to date.",
+    ),
+    "files_unchanged_total": ("counter", "Subtitle files whose output already had the content."),
+    "files_deduplicated_total": (
+        "counter",
+        "Subtitle files materialized from an identical job's output.",
+    ),
+    "cues_total": ("counter", "Subtitle cues written."),
+    "bytes_total": ("counter", "Input bytes processed."),
+    "dropped_blocks_total": ("counter", "Malformed subtitle blocks skipped while parsing."),
+    "errors_total": ("counter", "Failed files by exception class."),
+    "stage_duration_seconds": ("histogram", "Time spent per processing stage."),
+    "last_run_timestamp_seconds": ("gauge", "Unix time the metrics were last written."),
+}
+
+
+class Metrics:
+    """Counters and stage latency histograms rendered in Prometheus text format.
+
+    Instances are plain data, so worker processes can return them and the
+    parent can ``merge`` them into one registry.
+    """
+
+    def __init__(self):
+        self.counters = Counter()
+        self.histograms = {}
+
+    def inc(self, name, value=1, **labels):
+        self.counters[name, _label_key(labels)] += value
+
+    def observe(self, name, value, **labels):
+        histogram = self.histograms.setdefault(
+            (name, _label_key(labels)), [[0] * (len(METRICS_LATENCY_BUCKETS) + 1), 0.0]
+        )
+        histogram[0][bisect_left(METRICS_LATENCY_BUCKETS, value)] += 1
+        histogram[1] += value
+
+    def record_result(self, result):
+        if result.up_to_date:
+            self.inc("files_up_to_date_total")
+            return
+
+        self.inc("files_total")
+        self.inc("files_unchanged_total", int(result.unchanged))
+        self.inc("cues_total", result.subtitle_count)
+        self.inc("bytes_total", result.input_bytes)
+        self.inc("dropped_blocks_total", result.dropped_blocks)
+        for stage, seconds in result.timings.items():
+            self.observe("stage_duration_seconds", seconds, stage=stage)
+
+    def record_error(self, error):
+        self.inc("errors_total", error=type(error).__name__)
+
+    def merge(self, other):
+        self.counters.update(other.counters)
+        for key, (buckets, total) in other.histograms.items():
+            if key not in self.histograms:
+                self.histograms[key] = [list(buckets), total]
+                continue
+            mine = self.histograms[key]
+            mine[0] = [a + b for a, b in zip(mine[0], buckets)]
+            mine[1] += total
+        return self
+
+    def to_text(self, now=None):
+        samples = {name: [] for name in METRICS}
+
+        for (name, labels), value in sorted(self.counters.items()):
+            samples[name].append(_sample(name, labels, value))
+
+        for (name, labels), (buckets, total) in sorted(self.histograms.items()):
+            cumulative = 0
+            bounds = [*map(repr, METRICS_LATENCY_BUCKETS), "+Inf"]
+            for bound, count in zip(bounds, buckets):
+                cumulative += count
+                bucket_labels = (*labels, ("le", bound))
+                samples[name].append(_sample(f"{name}_bucket", bucket_labels, cumulative))
+            samples[name].append(_sample(f"{name}_sum", labels, total))
+            samples[name].append(_sample(f"{name}_count", labels, cumulative))
+
+        now = time.time() if now is None else now
+        samples["last_run_timestamp_seconds"].append(
+            _sample("last_run_timestamp_seconds", (), round(now, 3))
+        )
+
+        lines = []
+        for name, (metric_type, description) in METRICS.items():
+            if not samples[name]:
+                continue
+            lines.append(f"# HELP {METRICS_PREFIX}_{name} {description}")
+            lines.append(f"# TYPE {METRICS_PREFIX}_{name} {metric_type}")
+            lines.extend(samples[name])
+        return "\n".join(lines) + "\n"
+
+    def write(self, path):
+        """Atomically replace ``path``, as the node exporter textfile collector expects."""
+        path = Path(path)
+        temp_file = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                "w", dir=path.parent, prefix=f".{path.name}.", delete=False
+            ) as temp_file:
+                temp_file.write(self.to_text())
+            os.replace(temp_file.name, path)
+        except OSError as e:
+            if temp_file is not None:
+                Path(temp_file.name).unlink(missing_ok=True)
+            raise FileProcessingError(f"Cannot write metrics file {path}: {e}") from e
+
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _sample(name, labels, value):
+    label_text = ",".join(f'{key}="{_escape(str(label))}"' for key, label in labels)
+    label_text = f"{{{label_text}}}" if label_text else ""
+    return f"{METRICS_PREFIX}_{name}{label_text} {value}"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
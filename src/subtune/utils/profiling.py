@@ -0,0 +1,243 @@
+import cProfile
+import json
+import os
+import pstats
+import shutil
+import sys
+import tempfile
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import util
+from pathlib import Path
+
+from ..config import FILE_ENCODING, PROFILE_MAX_DEPTH, PROFILE_SAMPLE_INTERVAL
+from ..core.exceptions import FileProcessingError
+
+PROFILE_MODES = ("cprofile", "sample")
+
+
+class Profiler:
+    """Profile a block of work into ``<prefix>.pstats`` and ``<prefix>.collapsed``.
+
+    ``cprofile`` mode traces every call of the calling thread and writes both
+    files, the collapsed stacks being reconstructed from the call graph.
+    ``sample`` mode instead records real stacks of all threads every
+    ``interval`` seconds, which costs far less, and writes only the collapsed
+    stacks. Pools created with ``thread_pool`` or ``process_pool`` while a
+    profiler is active profile each thread or worker the same way, and their
+    results are merged in when the block ends.
+    """
+
+    active = None
+
+    def __init__(self, prefix, mode="cprofile", interval=PROFILE_SAMPLE_INTERVAL):
+        self.prefix = Path(prefix)
+        self.mode = mode
+        self.interval = interval
+        self.worker_dir = None
+        self._profile = None
+        self._sampler = None
+        self._thread_profiles = []
+
+    @property
+    def pstats_path(self):
+        return Path(f"{self.prefix}.pstats")
+
+    @property
+    def collapsed_path(self):
+        return Path(f"{self.prefix}.collapsed")
+
+    def __enter__(self):
+        self.worker_dir = tempfile.mkdtemp(prefix="subtune-profile-")
+        Profiler.active = self
+        self._start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop()
+        Profiler.active = None
+        try:
+            self._write()
+        finally:
+            shutil.rmtree(self.worker_dir, ignore_errors=True)
+
+    def _start(self):
+        if self.mode == "sample":
+            self._sampler = _Sampler(self.interval)
+            self._sampler.start()
+        else:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def _stop(self):
+        if self._sampler is not None:
+            self._sampler.stop()
+        if self._profile is not None:
+            self._profile.disable()
+
+    def _write(self):
+        worker_files = sorted(Path(self.worker_dir).iterdir())
+        stacks = Counter()
+        for path in worker_files:
+            if path.suffix == ".collapsed":
+                with open(path, encoding=FILE_ENCODING) as f:
+                    stacks.update(json.load(f))
+
+        try:
+            if self._profile is not None:
+                stats = pstats.Stats(self._profile)
+                for profile in self._thread_profiles:
+                    stats.add(profile)
+                for path in worker_files:
+                    if path.suffix == ".pstats":
+                        stats.add(str(path))
+                stats.dump_stats(str(self.pstats_path))
+                stacks.update(collapse_stats(stats))
+            else:
+                stacks.update(self._sampler.stacks)
+
+            with open(self.collapsed_path, "w", encoding=FILE_ENCODING) as f:
+                for stack, weight in sorted(stacks.items()):
+                    if weight > 0:
+                        f.write(f"{stack} {weight}\n")
+        except OSError as e:
+            raise FileProcessingError(f"Cannot write profile {self.prefix}: {e}") from e
+
+
+def process_pool(workers):
+    """Return a ``ProcessPoolExecutor`` whose workers join the active profile, if any."""
+    profiler = Profiler.active
+    if profiler is None:
+        return ProcessPoolExecutor(max_workers=workers)
+
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_profile_worker,
+        initargs=(profiler.worker_dir, profiler.mode, profiler.interval),
+    )
+
+
+def thread_pool(workers, thread_name_prefix=""):
+    """Return a ``ThreadPoolExecutor`` whose threads join the active profile, if any."""
+    profiler = Profiler.active
+    if profiler is None or profiler.mode == "sample":
+        # The sampler already sees every thread
+        return ThreadPoolExecutor(workers, thread_name_prefix)
+
+    return ThreadPoolExecutor(
+        workers, thread_name_prefix, initializer=_profile_thread, initargs=(profiler,)
+    )
+
+
+def collapse_stats(stats):
+    """Turn a cProfile call graph into collapsed stacks weighted in microseconds.
+
+    cProfile keeps caller/callee edges rather than whole stacks, so each
+    function's time is split across its callers in proportion to the time
+    spent under each, the same approximation other pstats flame graph tools
+    make. Recursion is cut at the first repeat and paths are cut below a
+    microsecond.
+    """
+    entries = stats.stats
+    callees = defaultdict(dict)
+    for function, (*_, callers) in entries.items():
+        for caller, (*_, cumulative) in callers.items():
+            callees[caller][function] = cumulative
+
+    stacks = Counter()
+
+    def walk(function, path, share):
+        _, _, own, cumulative, _ = entries[function]
+        path = (*path, _label(function))
+        stacks[";".join(path)] += round(own * share * 1_000_000)
+        if len(path) >= PROFILE_MAX_DEPTH:
+            return
+        for callee, edge in callees[function].items():
+            callee_cumulative = entries[callee][3]
+            # Paths under a microsecond are dropped, which also bounds the walk
+            if callee_cumulative and share * edge >= 1e-6 and _label(callee) not in path:
+                walk(callee, path, share * edge / callee_cumulative)
+
+    for function, (*_, callers) in entries.items():
+        if not callers:
+            walk(function, (), 1.0)
+
+    return stacks
+
+
+class _Sampler:
+    def __init__(self, interval):
+        self.interval = interval
+        self.stacks = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="subtune-sampler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stopped.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self.stacks[_frame_stack(names.get(thread_id, thread_id), frame)] += 1
+
+
+def _frame_stack(thread_name, frame):
+    labels = []
+    while frame is not None and len(labels) < PROFILE_MAX_DEPTH:
+        code = frame.f_code
+        labels.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    labels.append(f"thread:{thread_name}")
+    return ";".join(reversed(labels))
+
+
+def _label(function):
+    filename, _line, name = function
+    if filename == "~":
+        return name.replace(";", ",")
+    return f"{os.path.basename(filename)}:{name}"
+
+
+def _profile_thread(profiler):
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except ValueError:
+        # Python 3.12+ profiles through sys.monitoring, which admits one
+        # profiler per process and already covers every thread
+        return
+    profiler._thread_profiles.append(profile)
+
+
+_worker_profiler = None
+
+
+def _profile_worker(worker_dir, mode, interval):
+    global _worker_profiler
+    # A forked worker inherits the parent's running profiler; stop it so the
+    # parent's calls are not counted twice
+    if Profiler.active is not None:
+        Profiler.active._stop()
+        Profiler.active = None
+
+    _worker_profiler = Profiler(Path(worker_dir) / f"worker-{os.getpid()}", mode, interval)
+    _worker_profiler._start()
+    util.Finalize(None, _finish_worker, exitpriority=100)
+
+
+def _finish_worker():
+    profiler = _worker_profiler
+    profiler._stop()
+    if profiler._profile is not None:
+        profiler._profile.dump_stats(str(profiler.pstats_path))
+    else:
+        with open(profiler.collapsed_path, "w", encoding=FILE_ENCODING) as f:
+            json.dump(profiler._sampler.stacks, f)
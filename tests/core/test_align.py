@@ -0,0 +1,137 @@
+import sys
+import wave
+
+import pytest
+
+from subtune.core.align import AudioAlignment, align_to_audio, apply_alignment, cue_activity
+from subtune.core.exceptions import InvalidOffsetError, SubtuneError
+
+RATE = 8000
+
+
+def stamp(ms):
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d},{ms % 1000:03d}"
+
+
+def write_srt(path, cues):
+    blocks = [
+        f"{number}\n{stamp(start)} --> {stamp(end)}\nLine {number}\n"
+        for number, (start, end) in enumerate(cues, start=1)
+    ]
+    path.write_text("\n".join(blocks))
+    return path
+
+
+def write_wav(path, speech, duration_ms, width=2, channels=1):
+    """Write quiet noise with loud noise bursts over the ``speech`` intervals."""
+    np = pytest.importorskip("numpy")
+    rng = np.random.default_rng(7)
+    times_ms = np.arange(duration_ms * RATE // 1000) * 1000 // RATE
+    amplitude = np.full(len(times_ms), 0.01)
+    for start, end in speech:
+        amplitude[(times_ms >= start) & (times_ms < end)] = 0.5
+
+    peak = (1 << (8 * width - 1)) - 1
+    values = np.round(rng.uniform(-1, 1, len(times_ms)) * amplitude * peak).astype("<i4")
+    values = np.repeat(values, channels)
+    if width == 1:
+        data = (values + 128).astype(np.uint8).tobytes()
+    else:
+        data = values.view(np.uint8).reshape(-1, 4)[:, :width].tobytes()
+
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(width)
+        wav.setframerate(RATE)
+        wav.writeframes(data)
+    return path
+
+
+# Irregular cue lengths and gaps so a wrong lag cannot line up as well
+CUES = [
+    (1000 + n * 2300 + (n * 577) % 900, 1000 + n * 2300 + (n * 577) % 900 + 700 + (n * 311) % 1100)
+    for n in range(20)
+]
+
+
+@pytest.fixture
+def numpy():
+    return pytest.importorskip("numpy")
+
+
+@pytest.mark.usefixtures("numpy")
+class TestAlignToAudio:
+    @pytest.mark.parametrize("offset_ms", [1370, -820])
+    def test_finds_offset(self, tmp_path, offset_ms):
+        srt = write_srt(tmp_path / "movie.srt", CUES)
+        speech = [(start + offset_ms, end + offset_ms) for start, end in CUES]
+        wav = write_wav(tmp_path / "movie.wav", speech, 52_000)
+
+        alignment = align_to_audio(srt, wav, max_offset_ms=5000)
+
+        assert alignment.factor == 1.0
+        assert abs(alignment.offset_ms - offset_ms) <= 20
+        assert alignment.score > 0.8
+
+    @pytest.mark.parametrize(("width", "channels"), [(1, 1), (3, 2), (4, 1)])
+    def test_sample_formats(self, tmp_path, width, channels):
+        srt = write_srt(tmp_path / "movie.srt", CUES)
+        speech = [(start + 500, end + 500) for start, end in CUES]
+        wav = write_wav(tmp_path / "movie.wav", speech, 50_000, width, channels)
+
+        assert abs(align_to_audio(srt, wav, max_offset_ms=2000).offset_ms - 500) <= 20
+
+    def test_finds_frame_rate_drift(self, tmp_path):
+        factor = 25 / 23.976
+        srt = write_srt(tmp_path / "movie.srt", CUES)
+        speech = [(round(start * factor) + 300, round(end * factor) + 300) for start, end in CUES]
+        wav = write_wav(tmp_path / "movie.wav", speech, 54_000)
+
+        alignment = align_to_audio(srt, wav, max_offset_ms=2000, drift=True)
+
+        assert alignment.factor == pytest.approx(factor)
+        assert abs(alignment.offset_ms - 300) <= 20
+
+    def test_rejects_non_wav(self, tmp_path):
+        srt = write_srt(tmp_path / "movie.srt", CUES)
+        audio = tmp_path / "movie.wav"
+        audio.write_bytes(b"not a wav file")
+
+        with pytest.raises(SubtuneError, match="PCM WAV"):
+            align_to_audio(srt, audio)
+
+    @pytest.mark.parametrize("max_offset_ms", [0, -1000])
+    def test_rejects_non_positive_max_offset(self, tmp_path, max_offset_ms):
+        srt = write_srt(tmp_path / "movie.srt", CUES)
+        wav = write_wav(tmp_path / "movie.wav", CUES, 50_000)
+
+        with pytest.raises(InvalidOffsetError, match="must be positive"):
+            align_to_audio(srt, wav, max_offset_ms=max_offset_ms)
+
+
+@pytest.mark.usefixtures("numpy")
+class TestCueActivity:
+    def test_marks_covered_frames(self):
+        activity = cue_activity([(0, 25), (40, 50)], 10)
+
+        assert activity.tolist() == [1, 1, 1, 0, 1]
+
+
+@pytest.mark.usefixtures("numpy")
+class TestApplyAlignment:
+    def test_offset_and_drift(self, tmp_path):
+        srt = write_srt(tmp_path / "movie.srt", [(1000, 2000)])
+
+        apply_alignment(srt, tmp_path / "a.srt", AudioAlignment(500, 1.0, 1.0))
+        apply_alignment(srt, tmp_path / "b.srt", AudioAlignment(500, 1.5, 1.0))
+
+        assert "00:00:01,500 --> 00:00:02,500" in (tmp_path / "a.srt").read_text()
+        assert "00:00:02,000 --> 00:00:03,500" in (tmp_path / "b.srt").read_text()
+
+
+class TestWithoutNumpy:
+    def test_missing_numpy_is_reported(self, tmp_path, monkeypatch):
+        monkeypatch.setitem(sys.modules, "numpy", None)
+
+        with pytest.raises(SubtuneError, match=r"subtune\[audio\]"):
+            align_to_audio(tmp_path / "movie.srt", tmp_path / "movie.wav")
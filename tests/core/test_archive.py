@@ -0,0 +1,123 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from subtune.core.archive import shift_archive
+from subtune.core.exceptions import FileProcessingError
+from subtune.core.repair import RepairOptions
+
+SRT_CONTENT = "1\n00:00:01,000 --> 00:00:03,000\nTest subtitle\n"
+SHIFTED_CONTENT = "1\n00:00:02,000 --> 00:00:04,000\nTest subtitle\n"
+
+
+@pytest.fixture
+def zip_pack(tmp_path):
+    path = tmp_path / "pack.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("season/", "")
+        archive.writestr("season/e1.srt", SRT_CONTENT)
+        archive.writestr("season/e2.SRT", SRT_CONTENT)
+        archive.writestr("README.txt", "Vendor notes")
+        archive.writestr("broken.srt", "not subtitles")
+    return path
+
+
+def _tar_pack(path, mode="w:gz"):
+    with tarfile.open(path, mode) as archive:
+        for name, content in [("e1.srt", SRT_CONTENT), ("cover.jpg", "\x89PNG")]:
+            data = content.encode()
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return path
+
+
+class TestShiftArchive:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_zip_to_zip(self, zip_pack, tmp_path, workers):
+        output = tmp_path / "shifted.zip"
+
+        summary = shift_archive(zip_pack, output, 1000, workers=workers)
+
+        assert (summary.members, summary.shifted, summary.copied) == (5, 2, 3)
+        assert summary.subtitle_count == 2
+        assert summary.failures == [
+            ("broken.srt", 2, "SRT format error: No valid SRT timestamp format found in file")
+        ]
+        with zipfile.ZipFile(output) as archive:
+            assert archive.namelist() == [
+                "season/",
+                "season/e1.srt",
+                "season/e2.SRT",
+                "README.txt",
+                "broken.srt",
+            ]
+            assert archive.read("season/e1.srt").decode() == SHIFTED_CONTENT
+            assert archive.read("README.txt") == b"Vendor notes"
+            assert archive.read("broken.srt") == b"not subtitles"
+
+    def test_tar_gz_in_place(self, tmp_path):
+        pack = _tar_pack(tmp_path / "pack.tar.gz")
+
+        summary = shift_archive(pack, pack, 1000)
+
+        assert (summary.shifted, summary.copied) == (1, 1)
+        with tarfile.open(pack) as archive:
+            assert archive.extractfile("e1.srt").read().decode() == SHIFTED_CONTENT
+            assert archive.extractfile("cover.jpg").read() == "\x89PNG".encode()
+        assert [path.name for path in tmp_path.iterdir()] == ["pack.tar.gz"]
+
+    def test_tar_to_zip(self, tmp_path):
+        pack = _tar_pack(tmp_path / "pack.tar", "w")
+        output = tmp_path / "pack.zip"
+
+        shift_archive(pack, output, 1000)
+
+        with zipfile.ZipFile(output) as archive:
+            assert archive.read("e1.srt").decode() == SHIFTED_CONTENT
+
+    def test_tar_links_reported_when_converting_to_zip(self, tmp_path):
+        pack = _tar_pack(tmp_path / "pack.tar", "w")
+        with tarfile.open(pack, "a") as archive:
+            for name, kind in [("latest.srt", tarfile.SYMTYPE), ("copy.srt", tarfile.LNKTYPE)]:
+                info = tarfile.TarInfo(name)
+                info.type = kind
+                info.linkname = "e1.srt"
+                archive.addfile(info)
+        output = tmp_path / "pack.zip"
+
+        summary = shift_archive(pack, output, 1000)
+
+        assert (summary.members, summary.shifted, summary.copied) == (4, 1, 1)
+        assert summary.skipped == ["latest.srt", "copy.srt"]
+        with zipfile.ZipFile(output) as archive:
+            assert archive.namelist() == ["e1.srt", "cover.jpg"]
+
+    def test_repair_options(self, tmp_path):
+        pack = tmp_path / "pack.zip"
+        with zipfile.ZipFile(pack, "w") as archive:
+            archive.writestr(
+                "a.srt",
+                "1\n00:00:01,000 --> 00:00:03,000\nA\n\n2\n00:00:02,000 --> 00:00:04,000\nB\n",
+            )
+        output = tmp_path / "out.zip"
+
+        shift_archive(pack, output, 0, repair_options=RepairOptions(fix_overlaps=True))
+
+        with zipfile.ZipFile(output) as archive:
+            assert "00:00:01,000 --> 00:00:02,000" in archive.read("a.srt").decode()
+
+    def test_not_an_archive(self, tmp_path):
+        input_file = tmp_path / "test.srt"
+        input_file.write_text(SRT_CONTENT)
+
+        with pytest.raises(FileProcessingError, match="not a zip or tar archive"):
+            shift_archive(input_file, tmp_path / "out.zip", 1000)
+
+    def test_unknown_output_format(self, zip_pack, tmp_path):
+        with pytest.raises(FileProcessingError, match="Cannot tell archive format"):
+            shift_archive(zip_pack, tmp_path / "out.rar", 1000)
+
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["pack.zip"]
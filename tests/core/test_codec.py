@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from subtune.core.codec import (
+    format_timestamp,
+    format_timing_line,
+    parse_timestamp,
+    parse_timing_line,
+)
+from subtune.core.exceptions import InvalidSRTFormatError, InvalidTimestampError
+from subtune.core.processor import SRTSubtitle
+from subtune.core.timestamp import MAX_TIMESTAMP_MS, SRTTimestamp
+
+
+class TestCodec:
+    def test_matches_srt_timestamp(self):
+        rng = random.Random(7)
+        values = [0, 999, 59999, 3599999, MAX_TIMESTAMP_MS]
+        values += [rng.randrange(MAX_TIMESTAMP_MS) for _ in range(1000)]
+
+        for value in values:
+            text = SRTTimestamp.from_milliseconds(value).to_string()
+            assert format_timestamp(value) == text
+            assert parse_timestamp(text) == value
+
+    def test_parse_timing_line(self):
+        assert parse_timing_line("01:02:03,004 --> 01:02:05,000 \n") == (3723004, 3725000)
+
+    @pytest.mark.parametrize(
+        "line",
+        [
+            "00:00:01,000 -> 00:00:03,000",
+            "00:00:01.000 --> 00:00:03,000",
+            "00:60:01,000 --> 00:00:03,000",
+            "00:00:01,0a0 --> 00:00:03,000",
+            "0:00:01,000 --> 00:00:03,000",
+            "00:00:01,000 --> 00:00:03,000 X1",
+            "",
+        ],
+    )
+    def test_rejected_lines(self, line):
+        assert parse_timing_line(line) is None
+
+    def test_parse_timestamp_short_input(self):
+        assert parse_timestamp("00:00:01") is None
+
+    def test_format_timing_line(self):
+        assert format_timing_line(1000, 3723004) == "00:00:01,000 --> 01:02:03,004"
+
+    @pytest.mark.parametrize("value", [-1, MAX_TIMESTAMP_MS + 1])
+    def test_format_out_of_range(self, value):
+        with pytest.raises(InvalidTimestampError):
+            format_timestamp(value)
+
+
+class TestSubtitleFallback:
+    def test_out_of_range_field_keeps_timestamp_error(self):
+        with pytest.raises(InvalidTimestampError, match="Minutes must be 0-59, got 75"):
+            SRTSubtitle.from_lines(["1", "00:75:01,000 --> 00:00:03,000", "Text"])
+
+    def test_malformed_line_keeps_format_error(self):
+        with pytest.raises(InvalidSRTFormatError, match="Invalid timing format"):
+            SRTSubtitle.from_lines(["1", "00:00:01,000 -> 00:00:03,000", "Text"])
+
+    def test_non_ascii_digits_still_parse(self):
+        subtitle = SRTSubtitle.from_lines(["1", "00:00:0١,000 --> 00:00:03,000", "Text"])
+
+        assert subtitle.start_ms == 1000
@@ -0,0 +1,121 @@
+import os
+
+import pytest
+
+from subtune.core.dedup import materialize, plan_duplicates
+from subtune.core.jobs import Job, JobLedger, run_jobs
+from subtune.utils.metrics import Metrics
+
+SRT_CONTENT = "1\n00:00:01,000 --> 00:00:03,000\nTest subtitle\n"
+OTHER_CONTENT = "1\n00:00:01,000 --> 00:00:03,000\nTest subtitlf\n"
+
+
+@pytest.fixture
+def library(tmp_path):
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.srt").write_text(SRT_CONTENT)
+    (tmp_path / "other.srt").write_text(OTHER_CONTENT)
+    return tmp_path
+
+
+def job(library, name, offset_ms=1000, output=None, backup=False):
+    output = output or f"{name}.out.srt"
+    return Job(str(library / f"{name}.srt"), str(library / output), offset_ms, backup)
+
+
+class TestPlanDuplicates:
+    def test_groups_identical_content_and_transform(self, library):
+        jobs = [job(library, name) for name in ("a", "b", "other", "c")]
+
+        plan = plan_duplicates(jobs)
+
+        assert plan.leaders == [jobs[0], jobs[2]]
+        assert plan.copies == {jobs[0]: [jobs[1], jobs[3]]}
+        assert plan.duplicates == 2
+
+    @pytest.mark.parametrize(
+        "second",
+        [
+            {"offset_ms": 2000},
+            {"output": "b.out.srt.gz"},
+        ],
+    )
+    def test_different_transforms_are_not_grouped(self, library, second):
+        jobs = [job(library, "a"), job(library, "b", **second)]
+
+        assert plan_duplicates(jobs).leaders == jobs
+
+    def test_same_size_different_content_is_hashed_apart(self, library):
+        jobs = [job(library, "a"), job(library, "other")]
+
+        assert plan_duplicates(jobs).duplicates == 0
+
+    def test_inputs_written_by_other_jobs_are_not_grouped(self, library):
+        jobs = [job(library, "a", output="b.srt"), job(library, "b")]
+
+        assert plan_duplicates(jobs).duplicates == 0
+
+    def test_missing_inputs_stay_leaders(self, library):
+        jobs = [job(library, "missing"), job(library, "a")]
+
+        assert plan_duplicates(jobs).leaders == jobs
+
+
+class TestMaterialize:
+    def test_hard_links_by_default(self, library):
+        output = library / "out" / "copy.srt"
+        output.parent.mkdir()
+
+        assert materialize(library / "a.srt", output) == "link"
+        assert os.path.samefile(library / "a.srt", output)
+        assert materialize(library / "a.srt", output) is None
+
+    def test_copy_mode_replaces_existing_output(self, library):
+        output = library / "b.srt"
+
+        assert materialize(library / "other.srt", output, mode="copy") == "copy"
+        assert output.read_text() == OTHER_CONTENT
+        assert not os.path.samefile(library / "other.srt", output)
+        assert not list(library.glob("*.tmp"))
+
+
+class TestRunJobsDedupe:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_duplicates_shifted_once(self, library, workers):
+        jobs = [job(library, name) for name in ("a", "b", "c", "other")]
+        metrics = Metrics()
+        ledger = JobLedger(library / "ledger.sqlite")
+
+        summary = run_jobs(jobs, ledger, workers=workers, metrics=metrics, dedupe="link")
+        ledger.close()
+
+        assert (summary.succeeded, summary.deduplicated) == (4, 2)
+        assert metrics.counters["files_total", ()] == 2
+        assert metrics.counters["files_deduplicated_total", ()] == 2
+        for name in ("a", "b", "c"):
+            assert "00:00:02,000" in (library / f"{name}.out.srt").read_text()
+        assert os.path.samefile(library / "a.out.srt", library / "c.out.srt")
+
+    def test_in_place_duplicates_with_backup(self, library):
+        jobs = [job(library, name, output=f"{name}.srt", backup=True) for name in ("a", "b")]
+        ledger = JobLedger(library / "ledger.sqlite")
+
+        summary = run_jobs(jobs, ledger, dedupe="copy")
+        ledger.close()
+
+        assert summary.deduplicated == 1
+        assert (library / "b.srt.backup").read_text() == SRT_CONTENT
+        assert (library / "b.srt").read_text() == (library / "a.srt").read_text()
+        assert "00:00:02,000" in (library / "b.srt").read_text()
+
+    def test_duplicates_of_failed_job_run_on_their_own(self, library):
+        blocked = library / "blocked"
+        blocked.write_text("")
+        jobs = [job(library, "a", output="blocked/a.srt"), job(library, "b")]
+        ledger = JobLedger(library / "ledger.sqlite")
+
+        summary = run_jobs(jobs, ledger, dedupe="link")
+        ledger.close()
+
+        assert (summary.succeeded, summary.failed, summary.deduplicated) == (1, 1, 0)
+        assert "00:00:02,000" in (library / "b.out.srt").read_text()
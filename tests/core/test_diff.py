@@ -0,0 +1,101 @@
+import pytest
+
+from subtune.core.diff import diff_files, library_diff
+
+
+def stamp(ms):
+    return f"{ms // 3600000:02d}:{ms // 60000 % 60:02d}:{ms // 1000 % 60:02d},{ms % 1000:03d}"
+
+
+def write_srt(path, cues):
+    blocks = [
+        f"{number}\n{stamp(start)} --> {stamp(end)}\n{text}\n"
+        for number, (start, end, text) in enumerate(cues, start=1)
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(blocks))
+    return path
+
+
+CUES = [(n * 10_000, n * 10_000 + 2000, f"Line {n}") for n in range(1, 40)]
+
+
+def shifted(cues, offset_ms=0, factor=1.0):
+    return [
+        (max(round(start * factor) + offset_ms, 0), max(round(end * factor) + offset_ms, 0), text)
+        for start, end, text in cues
+    ]
+
+
+class TestDiffFiles:
+    def test_identical(self, tmp_path):
+        diff = diff_files(write_srt(tmp_path / "a.srt", CUES), write_srt(tmp_path / "b.srt", CUES))
+
+        assert (diff.kind, diff.aligned_by, diff.matched) == ("identical", "number", 39)
+        assert diff.deltas[0] == (1, 1, 0, 0)
+
+    def test_constant_offset_ignores_clamped_cues(self, tmp_path):
+        a = write_srt(tmp_path / "a.srt", CUES)
+        b = write_srt(tmp_path / "b.srt", shifted(CUES, -15_000))
+
+        diff = diff_files(a, b)
+
+        assert (diff.kind, diff.offset_ms, diff.clamped) == ("offset", -15_000, 1)
+        assert "offset -15000ms" in diff.summary()
+        assert "1 clamped at zero" in diff.summary()
+
+    def test_drift_from_frame_rate_change(self, tmp_path):
+        a = write_srt(tmp_path / "a.srt", CUES)
+        b = write_srt(tmp_path / "b.srt", shifted(CUES, 250, factor=25 / 23.976))
+
+        diff = diff_files(a, b)
+
+        assert diff.kind == "drift"
+        assert diff.offset_ms == 250
+        assert diff.drift_ppm == pytest.approx((25 / 23.976 - 1) * 1_000_000, rel=1e-3)
+
+    def test_irregular(self, tmp_path):
+        cues = list(CUES)
+        cues[20] = (cues[20][0] + 700, cues[20][1] + 700, cues[20][2])
+        a = write_srt(tmp_path / "a.srt", CUES)
+        b = write_srt(tmp_path / "b.srt", shifted(cues, 100))
+
+        diff = diff_files(a, b)
+
+        assert diff.kind == "irregular"
+        assert diff.max_residual_ms > 500
+
+    def test_text_alignment_when_numbering_differs(self, tmp_path):
+        a = write_srt(tmp_path / "a.srt", CUES)
+        b = write_srt(tmp_path / "b.srt", shifted(CUES[5:], 2000))
+
+        diff = diff_files(a, b)
+
+        assert (diff.aligned_by, diff.matched, diff.kind) == ("text", 34, "offset")
+        assert diff.deltas[0] == (6, 1, 2000, 2000)
+        assert "5 only in first" in diff.summary()
+
+    def test_number_alignment_counts_text_changes(self, tmp_path):
+        cues = list(CUES)
+        cues[3] = (cues[3][0], cues[3][1], "Edited")
+        a = write_srt(tmp_path / "a.srt", CUES)
+        b = write_srt(tmp_path / "b.srt", cues)
+
+        diff = diff_files(a, b, by="number")
+
+        assert (diff.kind, diff.text_changes) == ("identical", 1)
+
+
+class TestLibraryDiff:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_pairs_by_relative_path(self, tmp_path, workers):
+        for name in ("x.srt", "sub/y.srt"):
+            write_srt(tmp_path / "before" / name, CUES)
+            write_srt(tmp_path / "after" / name, shifted(CUES, 500))
+        write_srt(tmp_path / "before" / "only.srt", CUES)
+
+        diffs, errors = library_diff(tmp_path / "before", tmp_path / "after", workers=workers)
+
+        assert [(diff.kind, diff.offset_ms) for diff in diffs] == [("offset", 500)] * 2
+        assert diffs[0].deltas == []
+        assert [(path.name, code) for path, code, _error in errors] == [("only.srt", 1)]
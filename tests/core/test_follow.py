@@ -0,0 +1,151 @@
+import os
+import threading
+import time
+
+import pytest
+
+from subtune.core.exceptions import FileProcessingError
+from subtune.core.follow import follow
+
+CUE = "{n}\n00:00:0{n},000 --> 00:00:0{n},500\nLine {n}\n\n"
+POLL = 0.005
+
+
+class Follower:
+    def __init__(self, input_path, output_path, offset_ms=1000):
+        self.output_path = output_path
+        self.stop = threading.Event()
+        self.arrivals = []
+        self.summary = None
+        self.thread = threading.Thread(
+            target=self._run, args=(input_path, output_path, offset_ms), daemon=True
+        )
+        self.thread.start()
+
+    def _run(self, input_path, output_path, offset_ms):
+        self.summary = follow(
+            input_path,
+            output_path,
+            offset_ms,
+            stop=self.stop,
+            poll_interval=POLL,
+            on_cue=lambda subtitle: self.arrivals.append(time.perf_counter()),
+        )
+
+    def wait_for_cues(self, count, timeout=5):
+        deadline = time.monotonic() + timeout
+        while len(self.arrivals) < count:
+            assert time.monotonic() < deadline, f"only {len(self.arrivals)} of {count} cues"
+            time.sleep(POLL)
+
+    def finish(self):
+        self.stop.set()
+        self.thread.join(5)
+        return self.summary
+
+
+def append(path, text):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(text)
+
+
+@pytest.fixture
+def live(tmp_path):
+    input_path = tmp_path / "live.srt"
+    input_path.write_text("")
+    return input_path, tmp_path / "shifted.srt"
+
+
+class TestFollow:
+    def test_cues_written_as_they_complete(self, live):
+        input_path, output_path = live
+        follower = Follower(input_path, output_path)
+
+        append(input_path, CUE.format(n=1) + "2\n00:00:02,000 --> 00:00:02,500\n")
+        follower.wait_for_cues(1)
+        assert output_path.read_text() == "1\n00:00:02,000 --> 00:00:02,500\nLine 1\n"
+
+        append(input_path, "Line 2\n\n")
+        follower.wait_for_cues(2)
+        summary = follower.finish()
+
+        assert summary.cues == 2
+        assert output_path.read_text() == (
+            "1\n00:00:02,000 --> 00:00:02,500\nLine 1\n\n2\n00:00:03,000 --> 00:00:03,500\nLine 2\n"
+        )
+
+    def test_end_to_end_latency(self, live):
+        input_path, output_path = live
+        follower = Follower(input_path, output_path)
+        latencies = []
+
+        for n in range(1, 6):
+            written = time.perf_counter()
+            append(input_path, CUE.format(n=n))
+            follower.wait_for_cues(n)
+            latencies.append(follower.arrivals[-1] - written)
+        follower.finish()
+
+        # A cue lands within a few poll intervals of its blank line being written
+        assert max(latencies) < 0.5
+        assert output_path.read_text().count("-->") == 5
+
+    def test_pending_cue_written_on_stop(self, live):
+        input_path, output_path = live
+        append(input_path, "1\n00:00:01,000 --> 00:00:02,000\nNo blank line")
+        follower = Follower(input_path, output_path)
+        time.sleep(POLL * 4)
+
+        assert follower.finish().cues == 1
+        assert "No blank line" in output_path.read_text()
+
+    def test_truncation_restarts_from_beginning(self, live):
+        input_path, output_path = live
+        follower = Follower(input_path, output_path)
+        append(input_path, CUE.format(n=1) + CUE.format(n=2) + "3\n00:00:0")
+        follower.wait_for_cues(2)
+
+        input_path.write_text(CUE.format(n=4))
+        follower.wait_for_cues(3)
+        summary = follower.finish()
+
+        assert (summary.cues, summary.truncations, summary.dropped_blocks) == (3, 1, 0)
+        assert "Line 4" in output_path.read_text()
+
+    def test_rotation_follows_new_file(self, live):
+        input_path, output_path = live
+        follower = Follower(input_path, output_path)
+        append(input_path, CUE.format(n=1) + "2\n00:00:02,000 --> 00:00:02,500\nLast old")
+        follower.wait_for_cues(1)
+
+        os.rename(input_path, input_path.with_suffix(".srt.1"))
+        time.sleep(POLL * 4)
+        input_path.write_text(CUE.format(n=3))
+        follower.wait_for_cues(3)
+        summary = follower.finish()
+
+        assert (summary.cues, summary.rotations) == (3, 1)
+        content = output_path.read_text()
+        assert content.index("Last old") < content.index("Line 3")
+
+    def test_malformed_cue_skipped(self, live):
+        input_path, output_path = live
+        follower = Follower(input_path, output_path)
+        append(input_path, "garbage\n\n" + CUE.format(n=1))
+        follower.wait_for_cues(1)
+
+        assert follower.finish().dropped_blocks == 1
+
+    def test_idle_timeout_ends_session(self, live):
+        input_path, output_path = live
+        input_path.write_text(CUE.format(n=1))
+
+        summary = follow(input_path, output_path, 0, idle_timeout=0.05, poll_interval=POLL)
+
+        assert summary.cues == 1
+
+    def test_rejects_output_equal_to_input(self, live):
+        input_path, _ = live
+
+        with pytest.raises(FileProcessingError, match="separate"):
+            follow(input_path, input_path, 0, idle_timeout=0)
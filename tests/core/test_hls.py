@@ -0,0 +1,108 @@
+import pytest
+
+from subtune.core.exceptions import SubtuneError
+from subtune.core.hls import assign_segments, segment_hls
+from subtune.core.processor import SRTSubtitle
+
+SRT_CONTENT = (
+    "1\n00:00:01,000 --> 00:00:02,000\nFirst\n\n"
+    "2\n00:00:04,500 --> 00:00:05,500\nAcross\n\n"
+    "3\n00:00:07,000 --> 00:00:13,000\nLong\n"
+)
+
+
+def cue(number, start_ms, end_ms):
+    return SRTSubtitle.from_milliseconds(number, start_ms, end_ms, [f"Cue {number}"])
+
+
+def numbers(segments):
+    return [[subtitle.number for subtitle in segment] for segment in segments]
+
+
+class TestAssignSegments:
+    def test_cues_repeated_in_every_overlapping_segment(self):
+        cues = [cue(1, 0, 1000), cue(2, 1500, 4500), cue(3, 2000, 2500), cue(4, 6000, 7000)]
+
+        assert numbers(assign_segments(cues, 2000, 4)) == [[1, 2], [2, 3], [2], [4]]
+
+    def test_end_on_boundary_is_exclusive(self):
+        assert numbers(assign_segments([cue(1, 0, 2000)], 2000, 2)) == [[1], []]
+
+    def test_unsorted_input_kept_in_start_order(self):
+        cues = [cue(2, 3000, 3500), cue(1, 2500, 5000)]
+
+        assert numbers(assign_segments(cues, 2000, 3)) == [[], [1, 2], [1]]
+
+    def test_matches_brute_force(self):
+        cues = [
+            cue(n, (n * 737) % 20000, (n * 737) % 20000 + (n * 131) % 5000) for n in range(1, 80)
+        ]
+        segments = assign_segments(cues, 1500, 17)
+
+        for index, segment in enumerate(segments):
+            start, end = index * 1500, (index + 1) * 1500
+            expected = sorted(
+                (c for c in cues if c.start_ms < end and c.end_ms > start),
+                key=lambda c: c.start_ms,
+            )
+            assert [c.number for c in segment] == [c.number for c in expected]
+
+
+class TestSegmentHLS:
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_writes_segments_and_playlist(self, tmp_path, workers):
+        input_file = tmp_path / "movie.srt"
+        input_file.write_text(SRT_CONTENT)
+        output_dir = tmp_path / "hls"
+
+        summary = segment_hls(input_file, output_dir, 1000, segment_seconds=6, workers=workers)
+
+        assert (summary.segments, summary.cues, summary.cue_placements) == (3, 3, 5)
+        assert (output_dir / "segment00000.vtt").read_text() == (
+            "WEBVTT\n\n1\n00:00:02.000 --> 00:00:03.000\nFirst\n\n"
+            "2\n00:00:05.500 --> 00:00:06.500\nAcross\n\n"
+        )
+        assert "Long" in (output_dir / "segment00002.vtt").read_text()
+        assert summary.playlist_path.read_text() == (
+            "#EXTM3U\n#EXT-X-VERSION:3\n#EXT-X-TARGETDURATION:6\n"
+            "#EXT-X-MEDIA-SEQUENCE:0\n#EXT-X-PLAYLIST-TYPE:VOD\n"
+            "#EXTINF:6.000,\nsegment00000.vtt\n#EXTINF:6.000,\nsegment00001.vtt\n"
+            "#EXTINF:2.000,\nsegment00002.vtt\n#EXT-X-ENDLIST\n"
+        )
+
+    def test_duration_adds_empty_segments_and_timestamp_map(self, tmp_path):
+        input_file = tmp_path / "movie.srt"
+        input_file.write_text(SRT_CONTENT)
+
+        summary = segment_hls(
+            input_file, tmp_path, segment_seconds=10, duration_ms=40000, mpegts=900000
+        )
+
+        assert summary.segments == 4
+        assert (tmp_path / "segment00003.vtt").read_text() == (
+            "WEBVTT\nX-TIMESTAMP-MAP=MPEGTS:900000,LOCAL:00:00:00.000\n\n"
+        )
+
+    def test_rejects_non_positive_segment_duration(self, tmp_path):
+        input_file = tmp_path / "movie.srt"
+        input_file.write_text(SRT_CONTENT)
+
+        with pytest.raises(SubtuneError, match="Segment duration"):
+            segment_hls(input_file, tmp_path, segment_seconds=0)
+
+    @pytest.mark.parametrize("duration_ms", [0, -1000])
+    def test_rejects_non_positive_total_duration(self, tmp_path, duration_ms):
+        input_file = tmp_path / "movie.srt"
+        input_file.write_text(SRT_CONTENT)
+
+        with pytest.raises(SubtuneError, match="Total duration"):
+            segment_hls(input_file, tmp_path, duration_ms=duration_ms)
+        assert not (tmp_path / "subtitles.m3u8").exists()
+
+    def test_rejects_derived_zero_duration(self, tmp_path):
+        input_file = tmp_path / "movie.srt"
+        input_file.write_text(SRT_CONTENT)
+
+        with pytest.raises(SubtuneError, match="ends after 00:00"):
+            segment_hls(input_file, tmp_path, offset_ms=-20_000)
+        assert not (tmp_path / "subtitles.m3u8").exists()
@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from subtune.core.exceptions import FileProcessingError
+from subtune.core.incremental import BuildState, file_digest
+from subtune.core.workflow import SubtitleProcessor
+
+SRT_CONTENT = "1\n00:00:01,000 --> 00:00:03,000\nTest subtitle\n"
+
+
+@pytest.fixture
+def build_state(tmp_path):
+    state = BuildState(tmp_path / "state.sqlite")
+    yield state
+    state.close()
+
+
+@pytest.fixture
+def input_file(tmp_path):
+    input_file = tmp_path / "input.srt"
+    input_file.write_text(SRT_CONTENT)
+    return input_file
+
+
+class TestBuildState:
+    def test_fingerprint_depends_on_inputs(self, build_state, input_file):
+        fingerprint = build_state.fingerprint(input_file, 1000)
+
+        assert fingerprint == build_state.fingerprint(input_file, 1000)
+        assert fingerprint != build_state.fingerprint(input_file, 2000)
+        assert fingerprint != build_state.fingerprint(input_file, 1000, {"fix": True})
+
+        input_file.write_text(SRT_CONTENT + "\n2\n00:00:04,000 --> 00:00:05,000\nMore\n")
+        assert fingerprint != build_state.fingerprint(input_file, 1000)
+
+    def test_input_digest_cached_by_stat(self, build_state, input_file):
+        digest = build_state.input_digest(input_file)
+
+        assert digest == file_digest(input_file)
+        row = build_state.connection.execute("SELECT digest FROM inputs").fetchone()
+        assert row == (digest,)
+
+    def test_up_to_date_requires_matching_output(self, build_state, input_file, tmp_path):
+        output_file = tmp_path / "output.srt"
+        fingerprint = build_state.fingerprint(input_file, 0)
+
+        assert not build_state.is_up_to_date(output_file, fingerprint)
+
+        output_file.write_text(SRT_CONTENT)
+        build_state.record(output_file, fingerprint)
+        assert build_state.is_up_to_date(output_file, fingerprint)
+        assert not build_state.is_up_to_date(output_file, "other")
+
+        output_file.write_text("edited by hand")
+        assert not build_state.is_up_to_date(output_file, fingerprint)
+
+
+class TestIncrementalShift:
+    def test_second_run_is_skipped(self, build_state, input_file, tmp_path):
+        output_file = tmp_path / "output.srt"
+        processor = SubtitleProcessor()
+
+        first = processor.shift_file(input_file, output_file, 1000, build_state=build_state)
+        mtime = output_file.stat().st_mtime_ns
+        second = processor.shift_file(input_file, output_file, 1000, build_state=build_state)
+
+        assert not first.up_to_date
+        assert first.subtitle_count == 1
+        assert second.up_to_date
+        assert output_file.stat().st_mtime_ns == mtime
+
+    def test_changed_offset_reprocesses(self, build_state, input_file, tmp_path):
+        output_file = tmp_path / "output.srt"
+        processor = SubtitleProcessor()
+
+        processor.shift_file(input_file, output_file, 1000, build_state=build_state)
+        result = processor.shift_file(input_file, output_file, 2000, build_state=build_state)
+
+        assert not result.up_to_date
+        assert "00:00:03,000" in output_file.read_text()
+
+    def test_identical_output_left_untouched(self, input_file, tmp_path):
+        output_file = tmp_path / "output.srt"
+        output_file.write_text("1\n00:00:02,000 --> 00:00:04,000\nTest subtitle\n")
+        os.utime(output_file, ns=(1_000_000_000, 1_000_000_000))
+
+        result = SubtitleProcessor().shift_file(input_file, output_file, 1000, skip_identical=True)
+
+        assert result.unchanged
+        assert output_file.stat().st_mtime_ns == 1_000_000_000
+        assert list(tmp_path.glob("*.tmp")) == []
+
+    def test_in_place_rejected(self, build_state, input_file):
+        with pytest.raises(FileProcessingError, match="separate from the input"):
+            SubtitleProcessor().shift_file(input_file, input_file, 1000, build_state=build_state)
@@ -0,0 +1,164 @@
+import pytest
+
+from subtune.core.exceptions import InvalidManifestError
+from subtune.core.jobs import Job, JobLedger, load_manifest, run_jobs
+from subtune.utils.metrics import Metrics
+
+SRT_CONTENT = "1\n00:00:01,000 --> 00:00:03,000\nTest subtitle\n"
+
+
+@pytest.fixture
+def library(tmp_path):
+    for name in ("a", "b", "c"):
+        (tmp_path / f"{name}.srt").write_text(SRT_CONTENT)
+    return tmp_path
+
+
+class TestLoadManifest:
+    def test_csv_manifest(self, tmp_path):
+        manifest = tmp_path / "jobs.csv"
+        manifest.write_text("input,output,offset,backup\na.srt,out/a.srt,1000,yes\nb.srt,,-500,\n")
+
+        jobs = load_manifest(manifest)
+
+        assert jobs == [
+            Job("a.srt", "out/a.srt", 1000, True),
+            Job("b.srt", "b.srt", -500, False),
+        ]
+
+    def test_jsonl_manifest(self, tmp_path):
+        manifest = tmp_path / "jobs.jsonl"
+        manifest.write_text(
+            '{"input": "a.srt", "output": "o.srt", "offset": 250, "backup": true}\n\n'
+            '{"input": "b.srt", "offset": "100"}\n'
+        )
+
+        jobs = load_manifest(manifest)
+
+        assert jobs == [Job("a.srt", "o.srt", 250, True), Job("b.srt", "b.srt", 100, False)]
+
+    @pytest.mark.parametrize(
+        "content,error_msg",
+        [
+            ("input,offset\n,100\n", "row 1 has no input"),
+            ("input,offset\na.srt,soon\n", "row 1 has invalid offset"),
+        ],
+    )
+    def test_invalid_csv_rows(self, tmp_path, content, error_msg):
+        manifest = tmp_path / "jobs.csv"
+        manifest.write_text(content)
+
+        with pytest.raises(InvalidManifestError, match=error_msg):
+            load_manifest(manifest)
+
+    def test_invalid_json_line(self, tmp_path):
+        manifest = tmp_path / "jobs.jsonl"
+        manifest.write_text('{"input": "a.srt", "offset": 1}\nnot json\n')
+
+        with pytest.raises(InvalidManifestError, match="line 2"):
+            load_manifest(manifest)
+
+
+class TestRunJobs:
+    def test_runs_jobs_and_records_outcomes(self, library):
+        jobs = [
+            Job(str(library / "a.srt"), str(library / "out" / "a.srt"), 1000),
+            Job(str(library / "missing.srt"), str(library / "out" / "m.srt"), 1000),
+        ]
+        ledger = JobLedger(library / "ledger.sqlite")
+
+        summary = run_jobs(jobs, ledger)
+
+        assert (summary.succeeded, summary.failed, summary.skipped) == (1, 1, 0)
+        assert summary.highest_exit_code == 1
+        assert "00:00:02,000" in (library / "out" / "a.srt").read_text()
+
+        rows = dict(ledger.connection.execute("SELECT input, exit_code FROM jobs").fetchall())
+        assert rows == {str(library / "a.srt"): 0, str(library / "missing.srt"): 1}
+        ledger.close()
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_metrics_merged_across_workers(self, library, workers):
+        jobs = [
+            Job(str(library / f"{name}.srt"), str(library / f"{name}.o.srt"), 0) for name in "abc"
+        ]
+        jobs.append(Job(str(library / "missing.srt"), str(library / "m.srt"), 0))
+        metrics = Metrics()
+        ledger = JobLedger(library / "ledger.sqlite")
+
+        run_jobs(jobs, ledger, workers=workers, metrics=metrics)
+        ledger.close()
+
+        assert metrics.counters["files_total", ()] == 3
+        assert metrics.counters["cues_total", ()] == 3
+        assert metrics.counters["errors_total", (("error", "FileProcessingError"),)] == 1
+
+    def test_resume_skips_completed_jobs(self, library):
+        jobs = [
+            Job(str(library / f"{name}.srt"), str(library / f"{name}.out.srt"), 500)
+            for name in "abc"
+        ]
+        ledger_path = library / "ledger.sqlite"
+
+        ledger = JobLedger(ledger_path)
+        run_jobs(jobs[:2], ledger)
+        ledger.close()
+        (library / "a.out.srt").unlink()
+
+        outcomes = []
+        ledger = JobLedger(ledger_path)
+        summary = run_jobs(jobs, ledger, on_outcome=outcomes.append)
+        ledger.close()
+
+        assert (summary.total, summary.skipped, summary.succeeded) == (3, 2, 1)
+        assert [outcome.job for outcome in outcomes] == [jobs[2]]
+        assert not (library / "a.out.srt").exists()
+
+    def test_failed_jobs_are_retried(self, library):
+        job = Job(str(library / "late.srt"), str(library / "late.out.srt"), 0)
+        ledger = JobLedger(library / "ledger.sqlite")
+
+        assert run_jobs([job], ledger).failed == 1
+
+        (library / "late.srt").write_text(SRT_CONTENT)
+        assert run_jobs([job], ledger).succeeded == 1
+        ledger.close()
+
+    def test_worker_pool(self, library):
+        jobs = [
+            Job(str(library / f"{name}.srt"), str(library / f"{name}.out.srt"), 250)
+            for name in "abc"
+        ]
+        ledger = JobLedger(library / "ledger.sqlite")
+
+        summary = run_jobs(jobs, ledger, workers=2)
+        ledger.close()
+
+        assert summary.succeeded == 3
+        for name in "abc":
+            assert "00:00:01,250" in (library / f"{name}.out.srt").read_text()
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_resume_after_crash_shifts_in_place_files_once(self, tmp_path, workers):
+        paths = [tmp_path / f"{index:02d}.srt" for index in range(12)]
+        for path in paths:
+            path.write_text(SRT_CONTENT)
+        jobs = [Job(str(path), str(path), 1000) for path in paths]
+        ledger_path = tmp_path / "ledger.sqlite"
+
+        def crash(_outcome):
+            raise KeyboardInterrupt
+
+        ledger = JobLedger(ledger_path)
+        with pytest.raises(KeyboardInterrupt):
+            run_jobs(jobs, ledger, workers=workers, on_outcome=crash)
+        ledger.close()
+
+        ledger = JobLedger(ledger_path)
+        summary = run_jobs(jobs, ledger, workers=workers)
+        ledger.close()
+
+        assert summary.skipped >= 1
+        assert summary.skipped + summary.succeeded == len(jobs)
+        for path in paths:
+            assert path.read_text().startswith("1\n00:00:02,000 --> 00:00:04,000")
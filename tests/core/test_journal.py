@@ -0,0 +1,95 @@
+import pytest
+
+from subtune.core.exceptions import FileProcessingError, SubtuneError
+from subtune.core.journal import UndoJournal, undo_shift
+from subtune.core.repair import RepairOptions
+from subtune.core.workflow import SubtitleProcessor
+
+SRT_CONTENT = (
+    "1\n00:00:00,200 --> 00:00:00,900\nClamped\n\n"
+    "2\n00:00:00,800 --> 00:00:02,000\nEnd survives\n\n"
+    "3\n00:00:05,000 --> 00:00:06,000\nPlain\n"
+)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = UndoJournal(tmp_path / "journal.sqlite")
+    yield journal
+    journal.close()
+
+
+@pytest.fixture
+def srt_file(tmp_path):
+    path = tmp_path / "movie.srt"
+    path.write_text(SRT_CONTENT)
+    return path
+
+
+def shift(path, offset_ms, journal):
+    processor = SubtitleProcessor(on_warning=lambda _message: None)
+    return processor.shift_file(path, path, offset_ms, journal=journal)
+
+
+class TestUndoJournal:
+    def test_records_only_clamped_cues(self, srt_file, journal):
+        shift(srt_file, -1000, journal)
+
+        entry = journal.latest(srt_file)
+        assert entry.offset_ms == -1000
+        assert entry.clamped == {0: (200, 900), 1: (800, 2000)}
+        assert "00:00:00,000 --> 00:00:00,000\nClamped" in srt_file.read_text()
+
+    def test_undo_restores_exact_original(self, srt_file, journal):
+        shift(srt_file, -1000, journal)
+
+        result = undo_shift(srt_file, journal)
+
+        assert (result.offset_ms, result.subtitle_count, result.exact) == (-1000, 3, True)
+        assert srt_file.read_text() == SRT_CONTENT
+        assert journal.latest(srt_file) is None
+
+    def test_repeated_shifts_undo_in_reverse_order(self, srt_file, journal):
+        shift(srt_file, 500, journal)
+        shift(srt_file, -2000, journal)
+        assert journal.count(srt_file) == 2
+
+        assert undo_shift(srt_file, journal).remaining == 1
+        assert "00:00:05,500 --> 00:00:06,500" in srt_file.read_text()
+        undo_shift(srt_file, journal)
+
+        assert srt_file.read_text() == SRT_CONTENT
+        assert journal.paths() == []
+
+    def test_normalized_input_is_reported_inexact(self, tmp_path, journal):
+        path = tmp_path / "messy.srt"
+        path.write_text("1\n00:00:01,000 --> 00:00:02,000\nText   \n\nbroken\n")
+        shift(path, 300, journal)
+
+        result = undo_shift(path, journal)
+
+        assert not result.exact
+        assert path.read_text() == "1\n00:00:01,000 --> 00:00:02,000\nText\n"
+
+    def test_refuses_file_edited_after_shift(self, srt_file, journal):
+        shift(srt_file, 1000, journal)
+        srt_file.write_text(SRT_CONTENT)
+
+        with pytest.raises(FileProcessingError, match="modified after"):
+            undo_shift(srt_file, journal)
+        assert journal.count(srt_file) == 1
+
+    def test_nothing_to_undo(self, srt_file, journal):
+        with pytest.raises(SubtuneError, match="No journaled shift"):
+            undo_shift(srt_file, journal)
+
+    def test_rejects_separate_output_and_repairs(self, srt_file, tmp_path, journal):
+        processor = SubtitleProcessor(on_warning=lambda _message: None)
+
+        with pytest.raises(FileProcessingError, match="in-place"):
+            processor.shift_file(srt_file, tmp_path / "out.srt", 100, journal=journal)
+        with pytest.raises(FileProcessingError, match="Repaired"):
+            processor.shift_file(
+                srt_file, srt_file, 100, repair_options=RepairOptions(sort=True), journal=journal
+            )
+        assert srt_file.read_text() == SRT_CONTENT
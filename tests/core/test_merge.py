@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+from subtune.core.merge import merge_subtitles, renumber_subtitles, sort_subtitles
+from subtune.core.processor import SRTSubtitle
+from subtune.core.timestamp import SRTTimestamp
+
+
+def make_subtitle(number, start_ms, end_ms, text):
+    start = SRTTimestamp.from_timedelta(timedelta(milliseconds=start_ms))
+    end = SRTTimestamp.from_timedelta(timedelta(milliseconds=end_ms))
+    return SRTSubtitle(number, start, end, [text])
+
+
+class TestMergeSubtitles:
+    def test_merges_by_start_time_and_renumbers(self):
+        dialogue = [make_subtitle(1, 1000, 2000, "A"), make_subtitle(2, 5000, 6000, "C")]
+        signs = [make_subtitle(1, 3000, 4000, "B"), make_subtitle(2, 7000, 8000, "D")]
+
+        merged = list(merge_subtitles([dialogue, signs]))
+
+        assert [subtitle.text[0] for subtitle in merged] == ["A", "B", "C", "D"]
+        assert [subtitle.number for subtitle in merged] == [1, 2, 3, 4]
+
+    def test_ties_keep_input_order(self):
+        first = [make_subtitle(1, 1000, 2000, "first")]
+        second = [make_subtitle(1, 1000, 2000, "second")]
+
+        merged = list(merge_subtitles([first, second]))
+
+        assert [subtitle.text[0] for subtitle in merged] == ["first", "second"]
+
+    def test_per_input_offsets(self):
+        dialogue = [make_subtitle(1, 1000, 2000, "A")]
+        signs = [make_subtitle(1, 1000, 2000, "B")]
+
+        merged = list(merge_subtitles([dialogue, signs], [timedelta(0), timedelta(seconds=-1)]))
+
+        assert [subtitle.text[0] for subtitle in merged] == ["B", "A"]
+        assert merged[0].start.to_string() == "00:00:00,000"
+
+    def test_consumes_inputs_lazily(self):
+        consumed = []
+
+        def stream(name, starts):
+            for number, start_ms in enumerate(starts, start=1):
+                consumed.append((name, number))
+                yield make_subtitle(number, start_ms, start_ms + 500, name)
+
+        merged = merge_subtitles([stream("a", [0, 2000, 4000]), stream("b", [1000, 3000])])
+        next(merged)
+
+        assert consumed == [("a", 1), ("b", 1)]
+
+    def test_renumber_subtitles(self):
+        subtitles = [make_subtitle(7, 0, 100, "x"), make_subtitle(7, 200, 300, "y")]
+
+        renumbered = list(renumber_subtitles(subtitles))
+
+        assert [subtitle.number for subtitle in renumbered] == [1, 2]
+
+
+class TestSortSubtitles:
+    def test_sorts_in_memory_without_spilling(self, tmp_path):
+        subtitles = [make_subtitle(2, 3000, 4000, "b"), make_subtitle(1, 1000, 2000, "a")]
+
+        ordered = list(sort_subtitles(subtitles, run_size=10, temp_dir=tmp_path))
+
+        assert [subtitle.text[0] for subtitle in ordered] == ["a", "b"]
+        assert [subtitle.number for subtitle in ordered] == [1, 2]
+
+    def test_external_sort_matches_in_memory_sort(self, tmp_path):
+        starts = [(index * 7919) % 1000 * 10 for index in range(250)]
+        subtitles = [
+            make_subtitle(index + 1, start_ms, start_ms + 5, f"cue {index}\nline two")
+            for index, start_ms in enumerate(starts)
+        ]
+
+        ordered = list(sort_subtitles(subtitles, run_size=16, temp_dir=tmp_path))
+
+        assert ordered == sorted(subtitles, key=lambda subtitle: subtitle.start_ms)
+        assert not list(tmp_path.iterdir())
+
+    def test_external_sort_keeps_cues_without_text(self):
+        subtitles = [
+            SRTSubtitle.from_milliseconds(
+                number, (5 - number) * 1000, (5 - number) * 1000 + 500, []
+            )
+            for number in range(1, 5)
+        ]
+        subtitles.append(make_subtitle(5, 0, 300, 'first\n\u00e9"quoted"'))
+
+        ordered = list(sort_subtitles(subtitles, run_size=2))
+
+        assert ordered == sorted(subtitles, key=lambda subtitle: subtitle.start_ms)
+        assert [subtitle.text for subtitle in ordered[1:]] == [[], [], [], []]
+
+    def test_external_sort_is_stable(self):
+        subtitles = [make_subtitle(number, 1000, 2000, f"tie {number}") for number in range(1, 9)]
+        subtitles.insert(0, make_subtitle(99, 5000, 6000, "late"))
+
+        ordered = list(sort_subtitles(subtitles, run_size=3))
+
+        assert [subtitle.number for subtitle in ordered] == [1, 2, 3, 4, 5, 6, 7, 8, 99]
+
+    def test_consumes_one_run_before_spilling(self):
+        consumed = []
+
+        def stream():
+            for number in range(10, 0, -1):
+                consumed.append(number)
+                yield make_subtitle(number, number * 1000, number * 1000 + 500, "x")
+
+        ordered = sort_subtitles(stream(), run_size=4)
+        assert consumed == []
+
+        assert next(ordered).number == 1
+        assert len(consumed) == 10
@@ -0,0 +1,112 @@
+import pytest
+
+from subtune.core.exceptions import FileProcessingError, InvalidOffsetError
+from subtune.core.multitrack import estimate_offset, expand_tracks, sync_tracks
+from subtune.core.repair import RepairOptions
+
+
+def _srt(*starts_ms):
+    blocks = []
+    for number, start_ms in enumerate(starts_ms, start=1):
+        start = f"00:00:{start_ms // 1000:02d},{start_ms % 1000:03d}"
+        end_ms = start_ms + 1500
+        end = f"00:00:{end_ms // 1000:02d},{end_ms % 1000:03d}"
+        blocks.append(f"{number}\n{start} --> {end}\nLine {number}\n")
+    return "\n".join(blocks)
+
+
+@pytest.fixture
+def movie(tmp_path):
+    movie_dir = tmp_path / "movie"
+    movie_dir.mkdir()
+    for language in ("en", "es", "fr"):
+        (movie_dir / f"{language}.srt").write_text(_srt(1000, 4000, 8000))
+    return movie_dir
+
+
+class TestExpandTracks:
+    def test_globs_and_paths(self, movie):
+        tracks = expand_tracks([str(movie / "*.srt"), str(movie / "en.srt")])
+
+        assert [track.name for track in tracks] == ["en.srt", "es.srt", "fr.srt"]
+
+    def test_no_match(self, tmp_path):
+        with pytest.raises(FileProcessingError, match="No tracks match"):
+            expand_tracks([str(tmp_path / "*.srt")])
+
+
+class TestEstimateOffset:
+    def test_median_ignores_outlier(self, tmp_path):
+        reference = tmp_path / "reference.srt"
+        reference.write_text(_srt(2500, 5500, 9500, 30000))
+        track = tmp_path / "track.srt"
+        track.write_text(_srt(1000, 4000, 8000, 12000))
+
+        assert estimate_offset(reference, track) == 1500
+
+    def test_different_cue_counts(self, tmp_path):
+        starts = [1000, 3200, 4100, 7800, 9000, 13300, 16100, 20500, 24200, 29900]
+        reference = tmp_path / "reference.srt"
+        # One extra leading cue and one cue missing from the reference
+        reference.write_text(_srt(200, *(start + 1500 for start in starts if start != 9000)))
+        track = tmp_path / "track.srt"
+        track.write_text(_srt(*starts))
+
+        assert estimate_offset(reference, track) == 1500
+        assert estimate_offset(track, reference) == -1500
+
+    def test_no_cues_in_range(self, tmp_path):
+        reference = tmp_path / "reference.srt"
+        reference.write_text(_srt(50000))
+        track = tmp_path / "track.srt"
+        track.write_text(_srt(1000))
+
+        with pytest.raises(InvalidOffsetError, match="within 10000ms"):
+            estimate_offset(reference, track, max_offset_ms=10000)
+
+
+class TestSyncTracks:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_shifts_all_tracks_into_output_dir(self, movie, tmp_path, workers):
+        tracks = expand_tracks([str(movie / "*.srt")])
+        output_dir = tmp_path / "synced"
+
+        reports = sync_tracks(tracks, 1000, output_dir=output_dir, workers=workers)
+
+        assert [report.output_path for report in reports] == [
+            output_dir / name for name in ("en.srt", "es.srt", "fr.srt")
+        ]
+        assert all(report.ok and report.subtitle_count == 3 for report in reports)
+        assert "00:00:02,000 --> 00:00:03,500" in (output_dir / "fr.srt").read_text()
+        assert "00:00:01,000" in (movie / "fr.srt").read_text()
+
+    def test_failing_track_does_not_stop_others(self, movie):
+        (movie / "es.srt").write_text("not subtitles")
+        tracks = expand_tracks([str(movie / "*.srt")])
+
+        reports = sync_tracks(tracks, 500)
+
+        assert [report.ok for report in reports] == [True, False, True]
+        assert reports[1].exit_code == 2
+        assert "00:00:01,500" in (movie / "en.srt").read_text()
+
+    def test_repair_report_per_track(self, movie):
+        (movie / "en.srt").write_text(_srt(1000, 2000))
+
+        reports = sync_tracks(
+            [movie / "en.srt"], 0, repair_options=RepairOptions(fix_overlaps=True)
+        )
+
+        assert reports[0].repair.overlaps_fixed == 1
+
+    def test_name_collision_in_output_dir(self, movie, tmp_path):
+        other = tmp_path / "other"
+        other.mkdir()
+        (other / "en.srt").write_text(_srt(1000))
+
+        with pytest.raises(FileProcessingError, match="would both be written"):
+            sync_tracks([movie / "en.srt", other / "en.srt"], 0, output_dir=tmp_path / "out")
+
+    def test_invalid_offset_checked_once_up_front(self, movie):
+        with pytest.raises(InvalidOffsetError):
+            sync_tracks([movie / "en.srt"], 10**9)
@@ -0,0 +1,124 @@
+import pytest
+
+from subtune.core.exceptions import FileProcessingError, InvalidSRTFormatError, SubtuneError
+from subtune.core.jobs import Job, JobLedger, run_jobs
+from subtune.core.pipeline import run_pipeline
+from subtune.utils.metrics import Metrics
+
+SRT_CONTENT = (
+    "1\n00:00:01,000 --> 00:00:03,000\nTest subtitle\n\n2\n00:00:04,000 --> 00:00:05,000\nMore\n"
+)
+
+
+@pytest.fixture
+def library(tmp_path):
+    for index in range(12):
+        (tmp_path / f"{index:02d}.srt").write_text(SRT_CONTENT)
+    return tmp_path
+
+
+def make_jobs(library, offset_ms=500, backup=False):
+    return [
+        Job(str(path), str(path.with_suffix(".out.srt")), offset_ms, backup)
+        for path in sorted(library.glob("*.srt"))
+    ]
+
+
+class TestRunPipeline:
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_matches_sequential_run(self, library, tmp_path_factory, workers):
+        jobs = make_jobs(library)
+        expected_dir = tmp_path_factory.mktemp("expected")
+        sequential = [
+            Job(job.input_path, str(expected_dir / f"{index}.srt"), job.offset_ms)
+            for index, job in enumerate(jobs)
+        ]
+        ledger = JobLedger(expected_dir / "ledger.sqlite")
+        run_jobs(sequential, ledger)
+        ledger.close()
+
+        results = list(run_pipeline(jobs, io_threads=2, workers=workers))
+
+        assert sorted(job.input_path for job, _, _ in results) == [job.input_path for job in jobs]
+        assert all(error is None for _, _, error in results)
+        for _, result, _ in results:
+            assert result.subtitle_count == 2
+            assert result.input_bytes == len(SRT_CONTENT)
+            assert {"read", "parse", "shift", "format", "write", "total"} <= set(result.timings)
+        for job, expected in zip(jobs, sequential):
+            with open(job.output_path) as output, open(expected.output_path) as reference:
+                assert output.read() == reference.read()
+
+    def test_failures_are_reported_per_job(self, library):
+        (library / "bad.srt").write_bytes(b"1\n00:00:01,000 --> 00:00:03,000\n\xff\xfe\n")
+        jobs = [
+            Job(str(library / "00.srt"), str(library / "00.out.srt"), 0),
+            Job(str(library / "missing.srt"), str(library / "m.srt"), 0),
+            Job(str(library / "bad.srt"), str(library / "bad.out.srt"), 0),
+        ]
+
+        errors = {job.input_path: error for job, _, error in run_pipeline(jobs, io_threads=2)}
+
+        assert errors[str(library / "00.srt")] is None
+        assert isinstance(errors[str(library / "missing.srt")], FileProcessingError)
+        assert isinstance(errors[str(library / "bad.srt")], InvalidSRTFormatError)
+        assert not (library / "bad.out.srt").exists()
+
+    def test_backup_made_before_in_place_write(self, library):
+        path = library / "00.srt"
+        job = Job(str(path), str(path), 1000, backup=True)
+
+        [(_, result, error)] = run_pipeline([job], io_threads=1)
+
+        assert error is None
+        assert result.backup_path.read_text() == SRT_CONTENT
+        assert "00:00:02,000" in path.read_text()
+
+    def test_warnings_recorded_on_result(self, library):
+        path = library / "notes.txt"
+        path.write_text(SRT_CONTENT)
+
+        [(_, result, error)] = run_pipeline([Job(str(path), str(path), 0)], io_threads=1)
+
+        assert error is None
+        assert result.warnings == [f"Input file does not have .srt extension: {path}"]
+
+    def test_consumes_jobs_lazily(self, library):
+        jobs = make_jobs(library)
+        pulled = []
+
+        def source():
+            for job in jobs:
+                pulled.append(job)
+                yield job
+
+        results = run_pipeline(source(), io_threads=1, workers=1)
+        next(results)
+
+        # window = 2 * io_threads + JOB_WINDOW_PER_WORKER
+        assert len(pulled) <= 7
+        assert len(list(results)) == len(jobs) - 1
+
+
+class TestRunJobsPipelined:
+    def test_records_outcomes_and_metrics(self, library):
+        jobs = make_jobs(library)
+        jobs.append(Job(str(library / "missing.srt"), str(library / "m.srt"), 0))
+        metrics = Metrics()
+        ledger = JobLedger(library / "ledger.sqlite")
+
+        summary = run_jobs(jobs, ledger, workers=2, metrics=metrics, io_threads=2)
+        ledger.close()
+
+        assert (summary.succeeded, summary.failed) == (12, 1)
+        assert summary.highest_exit_code == 1
+        assert metrics.counters["files_total", ()] == 12
+        assert metrics.counters["cues_total", ()] == 24
+        assert metrics.counters["errors_total", (("error", "FileProcessingError"),)] == 1
+
+    def test_rejects_incremental_mode(self, library):
+        ledger = JobLedger(library / "ledger.sqlite")
+
+        with pytest.raises(SubtuneError, match="incremental"):
+            run_jobs(make_jobs(library), ledger, state_path=library / "state", io_threads=2)
+        ledger.close()
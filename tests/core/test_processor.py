@@ -2,8 +2,8 @@ from datetime import timedelta
 
 import pytest
 
-from subtune.core.exceptions import InvalidSRTFormatError
-from subtune.core.processor import SRTFile, SRTSubtitle
+from subtune.core.exceptions import InvalidSRTFormatError, InvalidTimestampError
+from subtune.core.processor import SRTFile, SRTSubtitle, iter_subtitles
 from subtune.core.timestamp import SRTTimestamp
 
 
@@ -85,6 +85,58 @@ class TestSRTSubtitle:
         assert shifted.start.to_string() == "00:00:00,000"
         assert shifted.end.to_string() == "00:00:00,000"
 
+    def test_shift_beyond_timestamp_limit(self):
+        start = SRTTimestamp(99, 59, 59, 0)
+        end = SRTTimestamp(99, 59, 59, 500)
+        subtitle = SRTSubtitle(1, start, end, ["Text"])
+
+        with pytest.raises(InvalidTimestampError, match="Hours exceed SRT format limit"):
+            subtitle.shift(timedelta(seconds=1))
+
+    def test_compact_storage(self):
+        subtitle = SRTSubtitle.from_milliseconds(1, 1000, 3000, ["Hello", "World"])
+
+        assert not hasattr(subtitle, "__dict__")
+        assert subtitle.start_ms == 1000
+        assert subtitle.end_ms == 3000
+        assert subtitle.start == SRTTimestamp(0, 0, 1, 0)
+        assert subtitle.text == ["Hello", "World"]
+
+    def test_immutable(self):
+        subtitle = SRTSubtitle.from_milliseconds(1, 1000, 3000, ["Hello"])
+
+        with pytest.raises(AttributeError):
+            subtitle.number = 2
+
+        subtitle.text.append("mutated copy")
+        assert subtitle.text == ["Hello"]
+
+    def test_short_text_is_interned(self):
+        first = SRTSubtitle.from_lines(["1", "00:00:01,000 --> 00:00:02,000", "♪  "])
+        second = SRTSubtitle.from_lines(["2", "00:00:03,000 --> 00:00:04,000", "♪  "])
+
+        assert first._text is second._text
+
+    def test_from_milliseconds_end_before_start(self):
+        subtitle = SRTSubtitle.from_milliseconds(1, 3000, 1000, ["Text"])
+        assert subtitle.end_ms == 3000
+
+    def test_renumber(self):
+        subtitle = SRTSubtitle.from_milliseconds(4, 1000, 2000, ["Text"])
+        renumbered = subtitle.renumber(1)
+
+        assert renumbered.number == 1
+        assert renumbered.start_ms == 1000
+        assert renumbered.text == ["Text"]
+
+    def test_equality_and_hash(self):
+        first = SRTSubtitle(1, SRTTimestamp(0, 0, 1, 0), SRTTimestamp(0, 0, 2, 0), ["A"])
+        second = SRTSubtitle.from_milliseconds(1, 1000, 2000, ["A"])
+
+        assert first == second
+        assert hash(first) == hash(second)
+        assert first != second.renumber(2)
+
 
 class TestSRTFile:
     def test_valid_creation(self):
@@ -144,6 +196,15 @@ Another valid subtitle
         srt_file = SRTFile.from_content(content)
         assert len(srt_file) == 2
 
+    def test_iter_subtitles_reports_invalid_blocks(self):
+        content = "1\n00:00:01,000 --> 00:00:03,000\nValid\n\nInvalid block\n\n2\nbad\ntiming\n"
+        dropped = []
+
+        subtitles = list(iter_subtitles(content.split("\n"), on_invalid=dropped.append))
+
+        assert len(subtitles) == 1
+        assert dropped == [["Invalid block"], ["2", "bad", "timing"]]
+
     def test_to_content(self):
         start1 = SRTTimestamp(0, 0, 1, 0)
         end1 = SRTTimestamp(0, 0, 3, 0)
@@ -0,0 +1,154 @@
+import pytest
+
+from subtune.core.exceptions import InvalidOffsetError, InvalidSRTFormatError
+from subtune.core.processor import SRTFile, SRTSubtitle
+from subtune.core.repair import RepairOptions, RepairReport, repair_srt_file, repair_subtitles
+
+
+def cue(number, start_ms, end_ms, text="Text"):
+    return SRTSubtitle.from_milliseconds(number, start_ms, end_ms, [text])
+
+
+def timings(subtitles):
+    return [(subtitle.start_ms, subtitle.end_ms) for subtitle in subtitles]
+
+
+class TestRepairOptions:
+    @pytest.mark.parametrize(
+        "kwargs,error_msg",
+        [
+            ({"min_gap_ms": -1}, "Minimum gap cannot be negative"),
+            ({"min_duration_ms": -1}, "Minimum duration cannot be negative"),
+            ({"stacked": "shuffle"}, "Unknown stacked cue policy"),
+        ],
+    )
+    def test_invalid_options(self, kwargs, error_msg):
+        with pytest.raises(InvalidOffsetError, match=error_msg):
+            RepairOptions(**kwargs)
+
+
+class TestRepairSubtitles:
+    def test_fix_overlaps(self):
+        report = RepairReport()
+        subtitles = [cue(1, 0, 1500), cue(2, 1000, 2000), cue(3, 3000, 4000)]
+
+        repaired = list(repair_subtitles(subtitles, RepairOptions(fix_overlaps=True), report))
+
+        assert timings(repaired) == [(0, 1000), (1000, 2000), (3000, 4000)]
+        assert report.overlaps_fixed == 1
+        assert report.changes == 1
+
+    def test_overlaps_left_alone_without_flag(self):
+        subtitles = [cue(1, 0, 1500), cue(2, 1000, 2000)]
+
+        repaired = list(repair_subtitles(subtitles, RepairOptions(min_duration_ms=100)))
+
+        assert timings(repaired) == [(0, 1500), (1000, 2000)]
+
+    def test_min_gap_widens_small_gaps_and_overlaps(self):
+        report = RepairReport()
+        subtitles = [cue(1, 0, 990), cue(2, 1000, 2100), cue(3, 2000, 3000), cue(4, 5000, 6000)]
+        options = RepairOptions(fix_overlaps=True, min_gap_ms=40)
+
+        repaired = list(repair_subtitles(subtitles, options, report))
+
+        assert timings(repaired) == [(0, 960), (1000, 1960), (2000, 3000), (5000, 6000)]
+        assert report.gaps_widened == 1
+        assert report.overlaps_fixed == 1
+
+    def test_min_duration_capped_by_next_cue(self):
+        report = RepairReport()
+        subtitles = [cue(1, 0, 100), cue(2, 500, 600), cue(3, 5000, 5100)]
+
+        repaired = list(repair_subtitles(subtitles, RepairOptions(min_duration_ms=800), report))
+
+        assert timings(repaired) == [(0, 500), (500, 1300), (5000, 5800)]
+        assert report.durations_extended == 3
+
+    def test_stacked_cues_kept(self):
+        report = RepairReport()
+        subtitles = [cue(1, 0, 2000, "top"), cue(2, 0, 1500, "bottom"), cue(3, 1800, 2500)]
+
+        repaired = list(repair_subtitles(subtitles, RepairOptions(fix_overlaps=True), report))
+
+        assert timings(repaired) == [(0, 1800), (0, 1500), (1800, 2500)]
+        assert report.stacked_groups == 1
+        assert report.overlaps_fixed == 1
+
+    def test_stacked_cues_merged(self):
+        report = RepairReport()
+        subtitles = [cue(1, 0, 2000, "top"), cue(2, 0, 1500, "bottom"), cue(3, 3000, 3500)]
+        options = RepairOptions(fix_overlaps=True, stacked="merge")
+
+        repaired = list(repair_subtitles(subtitles, options, report))
+
+        assert len(repaired) == 2
+        assert repaired[0].text == ["top", "bottom"]
+        assert timings(repaired) == [(0, 2000), (3000, 3500)]
+        assert report.cues_merged == 1
+
+    def test_stacked_cues_trimmed(self):
+        subtitles = [cue(1, 0, 2000, "top"), cue(2, 0, 1500, "bottom")]
+        options = RepairOptions(fix_overlaps=True, stacked="trim")
+
+        repaired = list(repair_subtitles(subtitles, options))
+
+        assert timings(repaired) == [(0, 0), (0, 1500)]
+
+    def test_stacked_cues_trimmed_keep_min_duration(self):
+        subtitles = [cue(1, 0, 2000, "top"), cue(2, 0, 1500, "bottom"), cue(3, 1000, 1800)]
+        options = RepairOptions(fix_overlaps=True, stacked="trim", min_duration_ms=400)
+        report = RepairReport()
+
+        repaired = list(repair_subtitles(subtitles, options, report))
+
+        assert timings(repaired) == [(0, 400), (0, 1000), (1000, 1800)]
+        assert report.overlaps_fixed == 1
+
+    def test_min_duration_does_not_extend_into_next_cue(self):
+        report = RepairReport()
+        subtitles = [cue(1, 0, 1100), cue(2, 1000, 1200), cue(3, 5000, 5100)]
+
+        repaired = list(repair_subtitles(subtitles, RepairOptions(min_duration_ms=2000), report))
+
+        assert timings(repaired) == [(0, 1100), (1000, 3000), (5000, 7000)]
+        assert report.durations_extended == 2
+        assert report.overlaps_fixed == 0
+
+    def test_unchanged_cues_are_reused(self):
+        subtitles = [cue(1, 0, 1000), cue(2, 2000, 3000)]
+
+        repaired = list(repair_subtitles(subtitles, RepairOptions(fix_overlaps=True)))
+
+        assert repaired[0] is subtitles[0]
+        assert repaired[1] is subtitles[1]
+
+    def test_unordered_stream_rejected(self):
+        subtitles = [cue(1, 2000, 3000), cue(2, 0, 1000)]
+
+        with pytest.raises(InvalidSRTFormatError, match="start-time order"):
+            list(repair_subtitles(subtitles, RepairOptions(fix_overlaps=True)))
+
+    def test_sort_and_renumber(self):
+        subtitles = [cue(4, 2000, 3000), cue(4, 0, 2500), cue(9, 1000, 1200)]
+        options = RepairOptions(fix_overlaps=True, sort=True, renumber=True)
+
+        repaired = list(repair_subtitles(subtitles, options))
+
+        assert timings(repaired) == [(0, 1000), (1000, 1200), (2000, 3000)]
+        assert [subtitle.number for subtitle in repaired] == [1, 2, 3]
+
+    def test_renumber_counts_merged_stacked_cues_once(self):
+        subtitles = [cue(5, 0, 1000), cue(5, 0, 1500), cue(5, 2000, 3000)]
+        options = RepairOptions(stacked="merge", renumber=True)
+
+        repaired = list(repair_subtitles(subtitles, options))
+
+        assert [subtitle.number for subtitle in repaired] == [1, 2]
+
+    def test_repair_srt_file_sorts_first(self):
+        srt_file = SRTFile([cue(1, 2000, 3000), cue(2, 0, 2500)])
+
+        repaired = repair_srt_file(srt_file, RepairOptions(fix_overlaps=True))
+
+        assert timings(repaired) == [(0, 2000), (2000, 3000)]
@@ -0,0 +1,88 @@
+import os
+
+import pytest
+
+from subtune.core.exceptions import InvalidQueryError
+from subtune.core.search import SearchHit, SubtitleIndex
+
+EPISODE_ONE = """1
+00:00:01,000 --> 00:00:03,000
+Where is the café?
+
+2
+00:00:04,000 --> 00:00:06,000
+We need to talk.
+"""
+
+EPISODE_TWO = """1
+00:01:00,000 --> 00:01:02,500
+Nobody knows where
+the café is.
+"""
+
+
+@pytest.fixture
+def library(tmp_path):
+    (tmp_path / "show").mkdir()
+    (tmp_path / "show" / "e1.srt").write_text(EPISODE_ONE)
+    (tmp_path / "show" / "e2.srt").write_text(EPISODE_TWO)
+    return tmp_path / "show"
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = SubtitleIndex(tmp_path / "index.sqlite")
+    yield index
+    index.close()
+
+
+class TestSubtitleIndex:
+    def test_index_and_search(self, library, index):
+        summary = index.update([library])
+
+        assert (summary.added, summary.cues, summary.failed) == (2, 3, [])
+        hits = index.search("cafe")
+        assert {(hit.path, hit.number) for hit in hits} == {
+            (str(library.resolve() / "e1.srt"), 1),
+            (str(library.resolve() / "e2.srt"), 1),
+        }
+        assert index.search('"need to talk"') == [
+            SearchHit(str(library.resolve() / "e1.srt"), 2, 4000, 6000, "We need to talk.")
+        ]
+        assert index.search("where cafe NOT nobody")[0].start_ms == 1000
+
+    def test_incremental_update(self, library, index):
+        index.update([library])
+
+        assert index.update([library]).unchanged == 2
+
+        episode = library / "e1.srt"
+        os.utime(episode, ns=(0, 0))
+        summary = index.update([library])
+        assert (summary.unchanged, summary.updated) == (2, 0)
+
+        episode.write_text(EPISODE_ONE.replace("talk", "leave"))
+        summary = index.update([library])
+        assert (summary.unchanged, summary.updated, summary.cues) == (1, 1, 2)
+        assert index.search("talk") == []
+        assert index.search("leave")[0].number == 2
+
+    def test_removed_and_broken_files(self, library, index):
+        index.update([library])
+        (library / "e2.srt").unlink()
+        (library / "e1.srt").write_text("not subtitles")
+
+        summary = index.update([library])
+
+        assert summary.removed == 1
+        assert [(path.name, code) for path, code, _error in summary.failed] == [("e1.srt", 2)]
+        assert index.search("cafe") == []
+
+    def test_limit(self, library, index):
+        index.update([library])
+
+        assert len(index.search("cafe", limit=1)) == 1
+
+    def test_invalid_query(self, index):
+        with pytest.raises(InvalidQueryError, match="Invalid search query"):
+            index.search('"unterminated')
@@ -0,0 +1,127 @@
+import gzip
+import os
+
+import pytest
+
+import subtune
+from subtune.core.seekindex import SeekIndex, iter_srt_file_indexed, read_window
+from subtune.core.stats import library_stats
+
+
+def cue_block(number, start_ms, end_ms):
+    def stamp(ms):
+        return f"00:{ms // 60000:02d}:{ms // 1000 % 60:02d},{ms % 1000:03d}"
+
+    return f"{number}\n{stamp(start_ms)} --> {stamp(end_ms)}\nCue {number}\n"
+
+
+@pytest.fixture
+def long_file(tmp_path):
+    path = tmp_path / "long.srt"
+    blocks = [cue_block(n, n * 1000, n * 1000 + 800) for n in range(1, 1001)]
+    path.write_text("\n".join(blocks), encoding="utf-8")
+    return path
+
+
+def numbers(subtitles):
+    return [subtitle.number for subtitle in subtitles]
+
+
+class TestSeekIndex:
+    def test_full_pass_saves_sparse_index(self, long_file):
+        assert len(list(iter_srt_file_indexed(long_file, interval=100))) == 1000
+
+        index = SeekIndex.load(long_file)
+        assert index.interval == 100
+        assert index.ordered
+        assert len(index.entries) == 10
+        with open(long_file, "rb") as f:
+            for offset, start_ms, _ in index.entries:
+                f.seek(offset)
+                block = f.read(40).decode()
+                assert block.startswith(f"{start_ms // 1000}\n")
+
+    def test_stale_after_source_changes(self, long_file):
+        list(iter_srt_file_indexed(long_file))
+        assert SeekIndex.load(long_file) is not None
+
+        with open(long_file, "a", encoding="utf-8") as f:
+            f.write("\n" + cue_block(1001, 1001000, 1001500))
+
+        assert SeekIndex.load(long_file) is None
+
+    def test_partial_pass_saves_nothing(self, long_file):
+        next(iter(iter_srt_file_indexed(long_file)))
+
+        assert not SeekIndex.sidecar_path(long_file).exists()
+
+    def test_compressed_files_are_not_indexed(self, tmp_path):
+        path = tmp_path / "a.srt.gz"
+        path.write_bytes(gzip.compress(cue_block(1, 0, 500).encode()))
+
+        assert numbers(iter_srt_file_indexed(path)) == [1]
+        assert not SeekIndex.sidecar_path(path).exists()
+
+
+class TestReadWindow:
+    def test_window_with_and_without_index(self, long_file):
+        built = read_window(long_file, 73_000, 75_500)
+        assert SeekIndex.load(long_file) is not None
+
+        assert numbers(built) == [73, 74, 75]
+        assert numbers(read_window(long_file, 73_000, 75_500)) == [73, 74, 75]
+
+    def test_seeks_past_earlier_cues(self, long_file):
+        list(iter_srt_file_indexed(long_file, interval=50))
+        index = SeekIndex.load(long_file)
+
+        offset = index.seek_offset(730_000)
+
+        assert os.path.getsize(long_file) // 2 < offset
+        with open(long_file, "rb") as f:
+            f.seek(offset)
+            assert f.readline() == b"701\n"
+        assert numbers(read_window(long_file, 730_000, 731_001)) == [730, 731]
+
+    def test_long_cue_before_seek_point_is_found(self, tmp_path):
+        path = tmp_path / "overlap.srt"
+        blocks = [cue_block(1, 0, 3_000_000)]
+        blocks += [cue_block(n, n * 1000, n * 1000 + 500) for n in range(2, 600)]
+        path.write_text("\n".join(blocks), encoding="utf-8")
+        list(iter_srt_file_indexed(path, interval=10))
+
+        assert numbers(read_window(path, 400_600, 400_900)) == [1]
+
+    def test_unordered_file_reads_to_end(self, tmp_path):
+        path = tmp_path / "unordered.srt"
+        blocks = [cue_block(n, n * 1000, n * 1000 + 500) for n in range(1, 50)]
+        blocks.append(cue_block(50, 10_000, 10_200))
+        path.write_text("\n".join(blocks), encoding="utf-8")
+        list(iter_srt_file_indexed(path, interval=5))
+
+        assert not SeekIndex.load(path).ordered
+        assert numbers(read_window(path, 10_000, 10_300)) == [10, 50]
+
+    def test_stats_pass_builds_index(self, long_file):
+        library_stats([long_file], seek_index=True)
+
+        assert SeekIndex.load(long_file) is not None
+
+    def test_shift_writes_fresh_index(self, long_file):
+        result = subtune.shift_file(long_file, offset_ms=500, seek_index=True)
+
+        index = SeekIndex.load(long_file)
+        assert index is not None
+        assert len(index.entries) == -(-result.subtitle_count // index.interval)
+        with open(long_file, "rb") as f:
+            for offset, start_ms, _ in index.entries:
+                f.seek(offset)
+                number = int(f.readline())
+                assert start_ms == number * 1000 + 500
+        assert numbers(subtune.read_window(long_file, 730_600, 731_600)) == [730, 731]
+
+    def test_shift_to_compressed_output_writes_no_index(self, long_file, tmp_path):
+        output = tmp_path / "out.srt.gz"
+        subtune.shift_file(long_file, output, 500, seek_index=True)
+
+        assert not SeekIndex.sidecar_path(output).exists()
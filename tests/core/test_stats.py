@@ -0,0 +1,115 @@
+from array import array
+
+from subtune.core.processor import SRTSubtitle
+from subtune.core.stats import TimingStats, expand_srt_paths, file_stats, library_stats
+
+SRT_CONTENT = """1
+00:00:01,000 --> 00:00:03,000
+Hello there
+
+2
+00:00:02,500 --> 00:00:04,000
+Hi
+
+3
+00:00:05,000 --> 00:00:06,000
+Bye
+"""
+
+
+class TestTimingStats:
+    def test_from_arrays(self):
+        stats = TimingStats.from_arrays(
+            array("q", [1000, 2500, 5000]), array("q", [3000, 4000, 6000]), 16
+        )
+
+        assert stats.cues == 3
+        assert stats.total_duration_ms == 4500
+        assert stats.max_duration_ms == 2000
+        assert stats.overlaps == 1
+        assert stats.first_start_ms == 1000
+        assert stats.last_end_ms == 6000
+        assert stats.duration_percentiles() == {"p50": 1500, "p90": 2000, "p99": 2000}
+        assert stats.gap_percentiles()["p50"] == 1000
+        assert round(stats.characters_per_second, 2) == 3.56
+
+    def test_unordered_cues_sorted_for_gaps(self):
+        stats = TimingStats.from_arrays(array("q", [5000, 1000]), array("q", [6000, 2000]))
+
+        assert stats.overlaps == 0
+        assert stats.gap_percentiles()["p50"] == 3000
+        assert stats.first_start_ms == 1000
+
+    def test_from_subtitles_counts_characters(self):
+        subtitles = [SRTSubtitle.from_milliseconds(1, 0, 1000, ["abc", "de"])]
+
+        stats = TimingStats.from_subtitles(subtitles)
+
+        assert stats.characters == 5
+        assert stats.characters_per_second == 5.0
+
+    def test_merge_matches_combined_histograms(self):
+        first = TimingStats.from_arrays(array("q", [0, 2000]), array("q", [1000, 2500]))
+        second = TimingStats.from_arrays(array("q", [100]), array("q", [5100]))
+
+        total = TimingStats().merge(first).merge(second)
+
+        assert total.files == 2
+        assert total.cues == 3
+        assert total.total_duration_ms == 6500
+        assert total.max_duration_ms == 5000
+        assert total.first_start_ms == 0
+        assert total.last_end_ms == 5100
+        assert total.duration_percentiles()["p50"] == 1000
+
+    def test_empty_stats(self):
+        stats = TimingStats()
+
+        assert stats.to_dict()["duration_percentiles_ms"] == {"p50": None, "p90": None, "p99": None}
+        assert "First cue start:" in stats.to_table()
+
+    def test_to_table(self):
+        stats = TimingStats.from_arrays(array("q", [1000]), array("q", [3000]))
+
+        table = stats.to_table()
+
+        assert "Cues:" in table
+        assert "Total duration:       00:00:02,000" in table
+
+
+class TestLibraryStats:
+    def test_file_stats(self, tmp_path):
+        srt = tmp_path / "a.srt"
+        srt.write_text(SRT_CONTENT)
+
+        assert file_stats(srt).cues == 3
+
+    def test_expand_srt_paths(self, tmp_path):
+        (tmp_path / "season" / "e1").mkdir(parents=True)
+        (tmp_path / "season" / "e1" / "a.srt").write_text(SRT_CONTENT)
+        (tmp_path / "season" / "b.SRT").write_text(SRT_CONTENT)
+        (tmp_path / "season" / "c.srt.gz").write_bytes(b"")
+        (tmp_path / "season" / "notes.txt").write_text("ignored")
+        (tmp_path / "season" / "notes.txt.gz").write_bytes(b"")
+
+        files = expand_srt_paths([tmp_path / "season"])
+
+        assert [path.name for path in files] == ["b.SRT", "c.srt.gz", "a.srt"]
+
+    def test_library_stats_reduces_and_reports_errors(self, tmp_path):
+        for name in ("a", "b"):
+            (tmp_path / f"{name}.srt").write_text(SRT_CONTENT)
+        (tmp_path / "bad.srt").write_text("not subtitles")
+
+        total, per_file, errors = library_stats([tmp_path], workers=2)
+
+        assert total.files == 2
+        assert total.cues == 6
+        assert len(per_file) == 2
+        assert errors == [
+            (
+                tmp_path / "bad.srt",
+                2,
+                "SRT format error: No valid SRT timestamp format found in file",
+            )
+        ]
@@ -94,6 +94,26 @@ class TestSRTTimestamp:
         with pytest.raises(InvalidTimestampError, match="Expected timedelta"):
             SRTTimestamp.from_timedelta("not a timedelta")
 
+    @pytest.mark.parametrize(
+        "total_ms,expected_str",
+        [
+            (0, "00:00:00,000"),
+            (5025678, "01:23:45,678"),
+            (359999999, "99:59:59,999"),
+        ],
+    )
+    def test_milliseconds_round_trip(self, total_ms, expected_str):
+        timestamp = SRTTimestamp.from_milliseconds(total_ms)
+        assert timestamp.to_string() == expected_str
+        assert timestamp.to_milliseconds() == total_ms
+
+    def test_from_milliseconds_invalid(self):
+        with pytest.raises(InvalidTimestampError, match="Cannot format negative timestamp"):
+            SRTTimestamp.from_milliseconds(-1)
+
+        with pytest.raises(InvalidTimestampError, match="Hours exceed SRT format limit"):
+            SRTTimestamp.from_milliseconds(360000000)
+
     def test_to_timedelta(self):
         timestamp = SRTTimestamp(1, 23, 45, 678)
         td = timestamp.to_timedelta()
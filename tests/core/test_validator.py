@@ -1,3 +1,4 @@
+import gzip
 import os
 from datetime import timedelta
 from unittest.mock import patch
@@ -75,6 +76,8 @@ class TestFileValidator:
         [
             ("test.srt", False),
             ("test.SRT", False),
+            ("test.srt.gz", False),
+            ("test.txt.gz", True),
             ("test.txt", True),
             ("test", True),
         ],
@@ -91,6 +94,15 @@ class TestFileValidator:
         else:
             assert "Warning" not in captured.out
 
+    def test_collect_file_warnings(self, tmp_path, capsys):
+        test_file = tmp_path / "test.txt"
+        test_file.write_text("test")
+
+        warnings = FileValidator.collect_file_warnings(test_file)
+
+        assert warnings == [f"Input file does not have .srt extension: {test_file}"]
+        assert capsys.readouterr().out == ""
+
     def test_check_file_warnings_large_file(self, tmp_path, capsys):
         test_file = tmp_path / "large.srt"
         large_content = "x" * (11 * 1024 * 1024)  # 11MB
@@ -120,6 +132,66 @@ Test subtitle
         with pytest.raises(InvalidSRTFormatError, match="File is not valid UTF-8 text"):
             FileValidator.read_srt_file(test_file)
 
+    def test_iter_srt_file(self, tmp_path):
+        test_file = tmp_path / "test.srt"
+        test_file.write_text("1\n00:00:01,000 --> 00:00:03,000\nFirst\n\n2\nbroken\nblock\n")
+
+        subtitles = list(FileValidator.iter_srt_file(test_file))
+
+        assert [subtitle.text for subtitle in subtitles] == [["First"]]
+
+    @pytest.mark.parametrize("extension", [".gz", ".bz2", ".xz"])
+    def test_compressed_round_trip(self, tmp_path, extension):
+        start = SRTTimestamp(0, 0, 1, 0)
+        end = SRTTimestamp(0, 0, 3, 0)
+        subtitles = [SRTSubtitle(1, start, end, ["First"]), SRTSubtitle(2, start, end, ["Second"])]
+        output_file = tmp_path / f"output.srt{extension}"
+
+        FileValidator.write_subtitles(iter(subtitles), output_file)
+
+        assert output_file.read_bytes()[:1] != b"1"
+        assert list(FileValidator.iter_srt_file(output_file)) == subtitles
+        assert [path.name for path in tmp_path.iterdir()] == [output_file.name]
+
+    def test_iter_srt_file_detects_compression_by_content(self, tmp_path):
+        test_file = tmp_path / "test.srt"
+        test_file.write_bytes(gzip.compress(b"1\n00:00:01,000 --> 00:00:03,000\nFirst\n"))
+
+        subtitles = list(FileValidator.iter_srt_file(test_file))
+
+        assert [subtitle.text for subtitle in subtitles] == [["First"]]
+
+    def test_iter_srt_file_truncated_archive(self, tmp_path):
+        test_file = tmp_path / "test.srt.gz"
+        test_file.write_bytes(gzip.compress(b"1\n00:00:01,000 --> 00:00:03,000\nFirst\n")[:20])
+
+        with pytest.raises(FileProcessingError, match="Error reading input file"):
+            list(FileValidator.iter_srt_file(test_file))
+
+    def test_iter_srt_file_missing(self, tmp_path):
+        with pytest.raises(FileProcessingError, match="Error reading input file"):
+            list(FileValidator.iter_srt_file(tmp_path / "missing.srt"))
+
+    def test_write_subtitles_streams_content(self, tmp_path):
+        start = SRTTimestamp(0, 0, 1, 0)
+        end = SRTTimestamp(0, 0, 3, 0)
+        subtitles = [SRTSubtitle(1, start, end, ["First"]), SRTSubtitle(2, start, end, ["Second"])]
+
+        output_file = tmp_path / "output.srt"
+        count = FileValidator.write_subtitles(iter(subtitles), output_file)
+
+        assert count == 2
+        assert output_file.read_text() == SRTFile(subtitles).to_content()
+
+    def test_write_subtitles_empty_stream(self, tmp_path):
+        output_file = tmp_path / "output.srt"
+
+        with pytest.raises(InvalidSRTFormatError, match="at least one subtitle"):
+            FileValidator.write_subtitles(iter([]), output_file)
+
+        assert not output_file.exists()
+        assert list(tmp_path.iterdir()) == []
+
     def test_write_srt_file(self, tmp_path):
         start = SRTTimestamp(0, 0, 1, 0)
         end = SRTTimestamp(0, 0, 3, 0)
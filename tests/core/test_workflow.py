@@ -1,3 +1,5 @@
+import gzip
+
 import pytest
 
 from subtune.core.exceptions import (
@@ -5,6 +7,7 @@ from subtune.core.exceptions import (
     InvalidOffsetError,
     InvalidSRTFormatError,
 )
+from subtune.core.repair import RepairOptions
 from subtune.core.validator import FileValidator
 from subtune.core.workflow import SubtitleProcessor
 from subtune.utils.backup import BackupManager
@@ -56,6 +59,49 @@ Test subtitle
         captured = capsys.readouterr()
         assert "Created backup:" in captured.out
 
+    def test_shift_file_routes_warnings_to_callback(self, tmp_path, capsys):
+        input_file = tmp_path / "input.txt"
+        input_file.write_text("1\n00:00:01,000 --> 00:00:03,000\nTest\n")
+        received = []
+
+        service = SubtitleProcessor(on_warning=received.append)
+        result = service.shift_file(input_file, tmp_path / "output.srt", 1000)
+
+        assert result.subtitle_count == 1
+        assert received == result.warnings
+        assert "does not have .srt extension" in received[0]
+        assert capsys.readouterr().out == ""
+
+    def test_shift_file_compressed_in_place(self, tmp_path):
+        input_file = tmp_path / "input.srt.gz"
+        input_file.write_bytes(gzip.compress(b"1\n00:00:01,000 --> 00:00:03,000\nTest\n"))
+
+        service = SubtitleProcessor(on_warning=pytest.fail)
+        result = service.shift_file(input_file, input_file, 1000)
+        repeat = service.shift_file(input_file, input_file, 0, skip_identical=True)
+
+        assert result.subtitle_count == 1
+        assert gzip.decompress(input_file.read_bytes()).startswith(
+            b"1\n00:00:02,000 --> 00:00:04,000\nTest"
+        )
+        assert repeat.unchanged
+
+    def test_shift_srt_file_with_repair(self, tmp_path, capsys):
+        input_file = tmp_path / "input.srt"
+        input_file.write_text(
+            "1\n00:00:01,000 --> 00:00:03,000\nFirst\n\n2\n00:00:02,000 --> 00:00:04,000\nSecond\n"
+        )
+        output_file = tmp_path / "output.srt"
+
+        service = SubtitleProcessor()
+        service.shift_srt_file(
+            input_file, output_file, 1000, repair_options=RepairOptions(fix_overlaps=True)
+        )
+
+        assert "00:00:02,000 --> 00:00:03,000" in output_file.read_text()
+        captured = capsys.readouterr()
+        assert "Repaired timings: 1 overlaps fixed" in captured.out
+
     def test_shift_srt_file_input_validation_error(self, tmp_path):
         nonexistent = tmp_path / "nonexistent.srt"
         output_file = tmp_path / "output.srt"
@@ -142,3 +188,47 @@ Third subtitle
         assert "00:00:02,000 --> 00:00:04,000" in content  # First shifted
         assert "00:00:05,000 --> 00:00:07,000" in content  # Second shifted
         assert "00:00:08,000 --> 00:00:10,000" in content  # Third shifted
+
+    def test_merge_srt_files(self, tmp_path, capsys):
+        dialogue = tmp_path / "dialogue.srt"
+        dialogue.write_text(
+            "1\n00:00:01,000 --> 00:00:02,000\nHello\n\n2\n00:00:05,000 --> 00:00:06,000\nBye\n"
+        )
+        signs = tmp_path / "signs.srt"
+        signs.write_text("1\n00:00:02,000 --> 00:00:03,000\nEXIT\n")
+        output_file = tmp_path / "merged.srt"
+
+        service = SubtitleProcessor()
+        result = service.merge_srt_files([dialogue, signs], output_file, [0, 1000])
+
+        assert result == 3
+        assert output_file.read_text() == (
+            "1\n00:00:01,000 --> 00:00:02,000\nHello\n\n"
+            "2\n00:00:03,000 --> 00:00:04,000\nEXIT\n\n"
+            "3\n00:00:05,000 --> 00:00:06,000\nBye\n"
+        )
+
+        captured = capsys.readouterr()
+        assert "Successfully merged 3 subtitles from 2 files" in captured.out
+
+    def test_merge_srt_files_offset_count_mismatch(self, tmp_path):
+        input_file = tmp_path / "input.srt"
+        input_file.write_text("1\n00:00:01,000 --> 00:00:03,000\nTest\n")
+
+        service = SubtitleProcessor()
+        with pytest.raises(InvalidOffsetError, match="Expected 1 offsets"):
+            service.merge_srt_files([input_file], tmp_path / "out.srt", [0, 100])
+
+    def test_merge_srt_files_invalid_input_leaves_no_output(self, tmp_path):
+        valid = tmp_path / "valid.srt"
+        valid.write_text("1\n00:00:01,000 --> 00:00:03,000\nTest\n")
+        invalid = tmp_path / "invalid.srt"
+        invalid.write_text("Not a valid SRT file")
+        output_file = tmp_path / "merged.srt"
+
+        service = SubtitleProcessor()
+        with pytest.raises(InvalidSRTFormatError, match="No valid SRT timestamp format"):
+            service.merge_srt_files([valid, invalid], output_file)
+
+        assert not output_file.exists()
+        assert list(tmp_path.glob("*.tmp")) == []
@@ -0,0 +1,143 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from subtune import aio
+from subtune.core.exceptions import FileProcessingError
+from subtune.core.validator import FileValidator
+
+SRT_CONTENT = (
+    "1\n00:00:01,000 --> 00:00:03,000\nFirst\n\n2\n00:00:04,000 --> 00:00:06,000\nSecond\n"
+)
+
+
+@pytest.fixture
+def library(tmp_path):
+    for name in ("a", "b", "c", "d"):
+        (tmp_path / f"{name}.srt").write_text(SRT_CONTENT)
+    return tmp_path
+
+
+class TestShiftFile:
+    def test_matches_sync_output(self, library, tmp_path):
+        output_file = tmp_path / "out.srt"
+
+        result = asyncio.run(aio.shift_file(library / "a.srt", output_file, 1000))
+
+        assert result.subtitle_count == 2
+        assert result.content is None
+        assert {"shift", "write", "total"} <= set(result.timings)
+        assert output_file.read_text() == SRT_CONTENT.replace(
+            "00:00:01,000 --> 00:00:03,000", "00:00:02,000 --> 00:00:04,000"
+        ).replace("00:00:04,000 --> 00:00:06,000", "00:00:05,000 --> 00:00:07,000")
+
+    def test_process_executor(self, library):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            result = asyncio.run(
+                aio.shift_file(library / "a.srt", offset_ms=-1000, executor=executor)
+            )
+
+        assert result.subtitle_count == 2
+        assert "00:00:00,000 --> 00:00:02,000" in (library / "a.srt").read_text()
+
+    def test_warnings_and_unchanged(self, tmp_path):
+        input_file = tmp_path / "input.txt"
+        input_file.write_text(SRT_CONTENT)
+        received = []
+
+        result = asyncio.run(
+            aio.shift_file(input_file, offset_ms=0, on_warning=received.append, skip_identical=True)
+        )
+
+        assert received == result.warnings
+        assert "does not have .srt extension" in received[0]
+        assert result.unchanged
+
+    def test_missing_input(self, tmp_path):
+        with pytest.raises(FileProcessingError, match="does not exist"):
+            asyncio.run(aio.shift_file(tmp_path / "missing.srt", offset_ms=0))
+
+    def test_cancel_during_write_removes_temp_file(self, library):
+        started = threading.Event()
+        release = threading.Event()
+        write_temp_file = FileValidator.write_temp_file
+
+        def slow_write(chunks, output_path):
+            started.set()
+            release.wait(5)
+            return write_temp_file(chunks, output_path)
+
+        async def cancel_mid_write():
+            task = asyncio.ensure_future(aio.shift_file(library / "a.srt", offset_ms=1000))
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            release.set()
+
+        with patch.object(FileValidator, "write_temp_file", slow_write):
+            asyncio.run(cancel_mid_write())
+
+        assert sorted(path.name for path in library.iterdir()) == [
+            "a.srt",
+            "b.srt",
+            "c.srt",
+            "d.srt",
+        ]
+        assert (library / "a.srt").read_text() == SRT_CONTENT
+
+
+class TestShiftMany:
+    def test_results_in_job_order(self, library):
+        jobs = [(library / f"{name}.srt", None, 500) for name in "abcd"]
+        jobs.insert(2, (library / "missing.srt", None, 500))
+
+        results = asyncio.run(aio.shift_many(jobs, concurrency=2))
+
+        assert [result.input_path.name for result in results] == [
+            "a.srt",
+            "b.srt",
+            "missing.srt",
+            "c.srt",
+            "d.srt",
+        ]
+        assert isinstance(results[2].error, FileProcessingError)
+        assert [result.subtitle_count for result in results] == [2, 2, 0, 2, 2]
+
+    def test_raise_on_error(self, library):
+        jobs = [(library / "missing.srt", None, 0)]
+
+        with pytest.raises(FileProcessingError):
+            asyncio.run(aio.shift_many(jobs, raise_on_error=True))
+
+    def test_iter_respects_concurrency(self, library):
+        in_flight = 0
+        peak = 0
+        shift_file = aio.shift_file
+
+        async def tracked(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                await asyncio.sleep(0.01)
+                return await shift_file(*args, **kwargs)
+            finally:
+                in_flight -= 1
+
+        async def collect():
+            jobs = ((library / f"{name}.srt", None, 100) for name in "abcd")
+            return [result async for result in aio.iter_shift_many(jobs, concurrency=2)]
+
+        with patch.object(aio, "shift_file", tracked):
+            results = asyncio.run(collect())
+
+        assert len(results) == 4
+        assert peak == 2
+
+    def test_invalid_concurrency(self):
+        with pytest.raises(ValueError, match="at least 1"):
+            asyncio.run(aio.shift_many([], concurrency=0))
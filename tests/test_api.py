@@ -0,0 +1,106 @@
+import logging
+
+import pytest
+
+import subtune
+from subtune.core.exceptions import FileProcessingError, InvalidSRTFormatError
+
+SRT_CONTENT = """1
+00:00:01,000 --> 00:00:03,000
+First
+
+broken block
+
+2
+00:00:04,000 --> 00:00:06,000
+Second
+"""
+
+
+class TestShiftFile:
+    def test_returns_structured_result(self, tmp_path, capsys):
+        input_file = tmp_path / "input.srt"
+        input_file.write_text(SRT_CONTENT)
+        output_file = tmp_path / "output.srt"
+
+        result = subtune.shift_file(input_file, output_file, offset_ms=1000)
+
+        assert result.subtitle_count == 2
+        assert result.dropped_blocks == 1
+        assert result.warnings == []
+        assert result.output_path == output_file
+        assert {"validate", "process", "total"} <= set(result.timings)
+        assert "00:00:02,000 --> 00:00:04,000" in output_file.read_text()
+        assert capsys.readouterr().out == ""
+
+    def test_in_place_by_default(self, tmp_path):
+        input_file = tmp_path / "input.srt"
+        input_file.write_text(SRT_CONTENT)
+
+        subtune.shift_file(str(input_file), offset_ms=-1000)
+
+        assert "00:00:00,000 --> 00:00:02,000" in input_file.read_text()
+
+    def test_warnings_go_to_callback_and_logging(self, tmp_path, capsys, caplog):
+        input_file = tmp_path / "input.txt"
+        input_file.write_text(SRT_CONTENT)
+        received = []
+
+        with caplog.at_level(logging.WARNING, logger="subtune"):
+            result = subtune.shift_file(
+                input_file, tmp_path / "out.srt", offset_ms=0, on_warning=received.append
+            )
+
+        assert len(result.warnings) == 1
+        assert received == result.warnings
+        assert "does not have .srt extension" in caplog.text
+        assert capsys.readouterr().out == ""
+
+    def test_backup_path_reported(self, tmp_path):
+        input_file = tmp_path / "input.srt"
+        input_file.write_text(SRT_CONTENT)
+
+        result = subtune.shift_file(input_file, offset_ms=500, create_backup=True)
+
+        assert result.backup_path == input_file.with_suffix(".srt.backup")
+        assert result.backup_path.read_text() == SRT_CONTENT
+
+
+class TestShiftTextAndBytes:
+    def test_shift_text(self):
+        result = subtune.shift_text(SRT_CONTENT, 1500)
+
+        assert result.subtitle_count == 2
+        assert result.dropped_blocks == 1
+        assert result.content.startswith("1\n00:00:02,500 --> 00:00:04,500\nFirst\n")
+
+    def test_shift_bytes(self):
+        result = subtune.shift_bytes(SRT_CONTENT.encode("utf-8"), 1500)
+
+        assert isinstance(result.content, bytes)
+        assert b"00:00:05,500 --> 00:00:07,500" in result.content
+
+    def test_shift_bytes_invalid_utf8(self):
+        with pytest.raises(InvalidSRTFormatError, match="File is not valid UTF-8 text"):
+            subtune.shift_bytes(b"\xff\xfe invalid", 0)
+
+
+class TestShiftMany:
+    def test_collects_errors_per_job(self, tmp_path):
+        good = tmp_path / "good.srt"
+        good.write_text(SRT_CONTENT)
+        missing = tmp_path / "missing.srt"
+
+        results = subtune.shift_many(
+            [(good, tmp_path / "good.out.srt", 100), (missing, tmp_path / "x.srt", 100)]
+        )
+
+        assert results[0].error is None
+        assert results[0].subtitle_count == 2
+        assert isinstance(results[1].error, FileProcessingError)
+
+    def test_raise_on_error(self, tmp_path):
+        with pytest.raises(FileProcessingError):
+            subtune.shift_many(
+                [(tmp_path / "missing.srt", tmp_path / "out.srt", 0)], raise_on_error=True
+            )
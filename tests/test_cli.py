@@ -1,4 +1,9 @@
+import json
 import sys
+import tarfile
+import wave
+import zipfile
+from pathlib import Path
 from unittest.mock import patch
 
 import pytest
@@ -11,6 +16,7 @@ from subtune.core.exceptions import (
     InvalidTimestampError,
     SubtuneError,
 )
+from subtune.core.seekindex import SeekIndex
 
 
 class TestCLIArgumentParsing:
@@ -55,6 +61,46 @@ class TestCLIArgumentParsing:
                 assert call_kwargs["offset_ms"] == 2000
                 assert call_kwargs["create_backup"] is False
 
+    def test_repair_arguments(self):
+        argv = ["subtune", "input.srt", "-o", "0", "--fix-overlaps", "--min-gap", "40"]
+        with patch("sys.argv", argv):
+            with patch("subtune.core.workflow.SubtitleProcessor.shift_srt_file") as mock_shift:
+                with patch("builtins.print"):
+                    main()
+
+                repair_options = mock_shift.call_args.kwargs["repair_options"]
+                assert repair_options.fix_overlaps is True
+                assert repair_options.min_gap_ms == 40
+                assert repair_options.stacked == "keep"
+
+    def test_stacked_alone_enables_repair(self):
+        argv = ["subtune", "input.srt", "-o", "0", "--stacked", "merge"]
+        with patch("sys.argv", argv):
+            with patch("subtune.core.workflow.SubtitleProcessor.shift_srt_file") as mock_shift:
+                with patch("builtins.print"):
+                    main()
+
+                assert mock_shift.call_args.kwargs["repair_options"].stacked == "merge"
+
+    def test_stacked_trim_needs_fix_overlaps(self, capsys):
+        argv = ["subtune", "input.srt", "-o", "0", "--stacked", "trim"]
+        with patch("sys.argv", argv):
+            with patch("subtune.core.workflow.SubtitleProcessor.shift_srt_file") as mock_shift:
+                with pytest.raises(SystemExit) as exc_info:
+                    main()
+
+        assert exc_info.value.code == 2
+        assert "error: --stacked trim needs --fix-overlaps" in capsys.readouterr().err
+        mock_shift.assert_not_called()
+
+    def test_no_repair_by_default(self):
+        with patch("sys.argv", ["subtune", "input.srt", "-o", "0"]):
+            with patch("subtune.core.workflow.SubtitleProcessor.shift_srt_file") as mock_shift:
+                with patch("builtins.print"):
+                    main()
+
+                assert mock_shift.call_args.kwargs["repair_options"] is None
+
     def test_missing_offset_argument(self):
         with patch("sys.argv", ["subtune", "input.srt"]):
             with pytest.raises(SystemExit):
@@ -188,3 +234,490 @@ class TestCLIIntegration:
         # Verify original file was modified
         modified_content = input_file.read_text()
         assert "00:00:02,000 --> 00:00:04,000" in modified_content
+
+
+class TestCLIMergeCommand:
+    def test_merge_arguments(self):
+        with patch(
+            "sys.argv",
+            ["subtune", "merge", "a.srt", "b.srt", "-o", "0", "-o", "250", "--output", "m.srt"],
+        ):
+            with patch("subtune.core.workflow.SubtitleProcessor.merge_srt_files") as mock_merge:
+                with patch("builtins.print"):
+                    mock_merge.return_value = 5
+                    main()
+
+                call_kwargs = mock_merge.call_args.kwargs
+                assert [str(path) for path in call_kwargs["input_paths"]] == ["a.srt", "b.srt"]
+                assert str(call_kwargs["output_path"]) == "m.srt"
+                assert call_kwargs["offsets_ms"] == [0, 250]
+
+    def test_merge_requires_output(self):
+        with patch("sys.argv", ["subtune", "merge", "a.srt"]):
+            with pytest.raises(SystemExit):
+                main()
+
+    def test_merge_end_to_end(self, tmp_path):
+        first = tmp_path / "first.srt"
+        first.write_text("1\n00:00:03,000 --> 00:00:04,000\nLater\n")
+        second = tmp_path / "second.srt"
+        second.write_text("1\n00:00:01,000 --> 00:00:02,000\nEarlier\n")
+        output_file = tmp_path / "merged.srt"
+
+        with patch(
+            "sys.argv", ["subtune", "merge", str(first), str(second), "--output", str(output_file)]
+        ):
+            with patch("builtins.print"):
+                main()
+
+        content = output_file.read_text()
+        assert content.index("Earlier") < content.index("Later")
+        assert content.startswith("1\n00:00:01,000 --> 00:00:02,000\nEarlier")
+
+
+class TestCLIRunCommand:
+    def test_run_manifest_end_to_end(self, tmp_path):
+        input_file = tmp_path / "input.srt"
+        input_file.write_text("1\n00:00:01,000 --> 00:00:03,000\nTest subtitle\n")
+        manifest = tmp_path / "jobs.csv"
+        manifest.write_text(f"input,output,offset\n{input_file},{tmp_path / 'out.srt'},1000\n")
+
+        with patch("sys.argv", ["subtune", "run", str(manifest)]):
+            with patch("builtins.print") as mock_print:
+                main()
+
+        assert "00:00:02,000" in (tmp_path / "out.srt").read_text()
+        assert Path(f"{manifest}.ledger.sqlite").exists()
+        mock_print.assert_called_with("Processed 1 jobs: 1 succeeded, 0 failed, 0 already done")
+
+    @patch("builtins.print")
+    def test_run_manifest_failure_exit_code(self, mock_print, tmp_path):
+        manifest = tmp_path / "jobs.csv"
+        manifest.write_text(f"input,offset\n{tmp_path / 'missing.srt'},1000\n")
+
+        with patch("sys.argv", ["subtune", "run", str(manifest), "--ledger", str(tmp_path / "l")]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 1
+        assert any("File error" in str(call) for call in mock_print.call_args_list)
+
+    def test_run_manifest_dedupe_reports_ratio(self, tmp_path):
+        rows = ["input,output,offset"]
+        for name in ("a", "b", "c"):
+            (tmp_path / f"{name}.srt").write_text("1\n00:00:01,000 --> 00:00:03,000\nSame\n")
+            rows.append(f"{tmp_path / name}.srt,{tmp_path / name}.out.srt,1000")
+        manifest = tmp_path / "jobs.csv"
+        manifest.write_text("\n".join(rows) + "\n")
+
+        with patch("sys.argv", ["subtune", "run", str(manifest), "--dedupe"]):
+            with patch("builtins.print") as mock_print:
+                main()
+
+        mock_print.assert_called_with("Deduplicated 2 outputs from 1 shifted files (ratio 3.00)")
+        assert "00:00:02,000" in (tmp_path / "c.out.srt").read_text()
+
+
+class TestCLIMetrics:
+    def test_shift_writes_metrics_file(self, tmp_path):
+        input_file = tmp_path / "input.srt"
+        input_file.write_text("1\n00:00:01,000 --> 00:00:03,000\nTest subtitle\n")
+        metrics_file = tmp_path / "subtune.prom"
+
+        argv = ["subtune", str(input_file), "-o", "1000", "--metrics-file", str(metrics_file)]
+        with patch("sys.argv", argv), patch("builtins.print"):
+            main()
+
+        text = metrics_file.read_text()
+        assert "subtune_files_total 1" in text
+        assert "subtune_cues_total 1" in text
+
+    def test_failed_run_still_writes_metrics(self, tmp_path, capsys):
+        metrics_file = tmp_path / "subtune.prom"
+
+        argv = ["subtune", str(tmp_path / "missing.srt"), "-o", "1000"]
+        argv += ["--metrics-file", str(metrics_file)]
+        with patch("sys.argv", argv):
+            with pytest.raises(SystemExit):
+                main()
+
+        assert 'subtune_errors_total{error="FileProcessingError"} 1' in metrics_file.read_text()
+
+    def test_metrics_failure_keeps_run_error(self, tmp_path, capsys):
+        input_file = tmp_path / "input.srt"
+        input_file.write_text("not a subtitle\n")
+        metrics_file = tmp_path / "missing" / "subtune.prom"
+
+        argv = ["subtune", str(input_file), "-o", "1000", "--metrics-file", str(metrics_file)]
+        with patch("sys.argv", argv):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 2
+        err = capsys.readouterr().err
+        assert "Warning: Cannot write metrics file" in err
+        assert "SRT format error: No valid SRT timestamp" in err
+
+    def test_run_manifest_metrics(self, tmp_path):
+        input_file = tmp_path / "input.srt"
+        input_file.write_text("1\n00:00:01,000 --> 00:00:03,000\nTest subtitle\n")
+        manifest = tmp_path / "jobs.csv"
+        manifest.write_text(f"input,output,offset\n{input_file},{tmp_path / 'out.srt'},1000\n")
+        metrics_file = tmp_path / "subtune.prom"
+
+        argv = ["subtune", "run", str(manifest), "--metrics-file", str(metrics_file)]
+        with patch("sys.argv", argv), patch("builtins.print"):
+            main()
+
+        assert "subtune_files_total 1" in metrics_file.read_text()
+
+
+class TestCLISortRenumber:
+    def test_sort_and_renumber(self, tmp_path):
+        input_file = tmp_path / "input.srt"
+        input_file.write_text(
+            "3\n00:00:05,000 --> 00:00:06,000\nLater\n\n3\n00:00:01,000 --> 00:00:02,000\nEarlier\n"
+        )
+
+        with patch("sys.argv", ["subtune", str(input_file), "-o", "0", "--sort", "--renumber"]):
+            with patch("builtins.print"):
+                main()
+
+        assert input_file.read_text() == (
+            "1\n00:00:01,000 --> 00:00:02,000\nEarlier\n\n2\n00:00:05,000 --> 00:00:06,000\nLater\n"
+        )
+
+
+class TestCLIIncremental:
+    def test_incremental_shift_skips_second_run(self, tmp_path):
+        input_file = tmp_path / "test.srt"
+        input_file.write_text("1\n00:00:01,000 --> 00:00:03,000\nTest subtitle\n")
+        output_file = tmp_path / "output.srt"
+        argv = [
+            "subtune",
+            str(input_file),
+            "-o",
+            "1000",
+            "--output",
+            str(output_file),
+            "--incremental",
+            "--state",
+            str(tmp_path / "state.sqlite"),
+        ]
+
+        with patch("sys.argv", argv):
+            with patch("builtins.print"):
+                main()
+            with patch("builtins.print") as mock_print:
+                main()
+
+        mock_print.assert_called_with(f"Output is up to date: {output_file}")
+        assert "00:00:02,000" in output_file.read_text()
+
+    def test_incremental_shift_builds_missing_seek_index(self, tmp_path):
+        input_file = tmp_path / "test.srt"
+        input_file.write_text("1\n00:00:01,000 --> 00:00:03,000\nTest subtitle\n")
+        output_file = tmp_path / "output.srt"
+        argv = [
+            "subtune",
+            str(input_file),
+            "-o",
+            "1000",
+            "--output",
+            str(output_file),
+            "--incremental",
+            "--state",
+            str(tmp_path / "state.sqlite"),
+        ]
+
+        with patch("builtins.print"):
+            with patch("sys.argv", argv):
+                main()
+            mtime_ns = output_file.stat().st_mtime_ns
+            with patch("sys.argv", [*argv, "--seek-index"]):
+                main()
+
+        assert SeekIndex.load(output_file) is not None
+        assert output_file.stat().st_mtime_ns == mtime_ns
+
+        with patch("sys.argv", [*argv, "--seek-index"]):
+            with patch("builtins.print") as mock_print:
+                main()
+        mock_print.assert_called_with(f"Output is up to date: {output_file}")
+
+
+class TestCLIArchiveCommand:
+    def test_archive_end_to_end(self, tmp_path, capsys):
+        pack = tmp_path / "pack.zip"
+        with zipfile.ZipFile(pack, "w") as archive:
+            archive.writestr("a.srt", "1\n00:00:01,000 --> 00:00:03,000\nTest\n")
+            archive.writestr("notes.txt", "keep")
+        output = tmp_path / "out.tar.xz"
+
+        with patch(
+            "sys.argv", ["subtune", "archive", str(pack), "-o", "1000", "--output", str(output)]
+        ):
+            main()
+
+        assert "Shifted 1 subtitles in 1 files, copied 1 other members" in capsys.readouterr().out
+        with tarfile.open(output) as archive:
+            assert b"00:00:02,000 --> 00:00:04,000" in archive.extractfile("a.srt").read()
+
+    def test_archive_exit_code_on_bad_member(self, tmp_path, capsys):
+        pack = tmp_path / "pack.zip"
+        with zipfile.ZipFile(pack, "w") as archive:
+            archive.writestr("bad.srt", "not subtitles")
+
+        with patch("sys.argv", ["subtune", "archive", str(pack), "-o", "1000"]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 2
+        assert f"{pack}:bad.srt: SRT format error" in capsys.readouterr().err
+
+
+class TestCLISyncCommand:
+    def test_sync_with_reference(self, tmp_path, capsys):
+        for language in ("en", "de"):
+            (tmp_path / f"{language}.srt").write_text("1\n00:00:01,000 --> 00:00:03,000\nTest\n")
+        reference = tmp_path / "fixed.srt.ref"
+        reference.write_text("1\n00:00:03,500 --> 00:00:05,500\nTest\n")
+        output_dir = tmp_path / "out"
+
+        argv = ["subtune", "sync", str(tmp_path / "*.srt"), "--reference", str(reference)]
+        argv += ["--anchor", str(tmp_path / "en.srt"), "--output-dir", str(output_dir)]
+        with patch("sys.argv", argv):
+            main()
+
+        out = capsys.readouterr().out
+        assert "Estimated offset" in out and "2500ms" in out
+        assert "Shifted 2 of 2 tracks by 2500ms" in out
+        assert "00:00:03,500" in (output_dir / "de.srt").read_text()
+
+    def test_sync_requires_one_offset_source(self, tmp_path, capsys):
+        with patch("sys.argv", ["subtune", "sync", str(tmp_path / "a.srt")]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 4
+        assert "exactly one of --offset or --reference" in capsys.readouterr().err
+
+
+class TestCLIFollowCommand:
+    def test_follow_until_idle(self, tmp_path, capsys):
+        input_file = tmp_path / "live.srt"
+        input_file.write_text("1\n00:00:01,000 --> 00:00:03,000\nLive\n")
+        output_file = tmp_path / "out.srt"
+
+        argv = ["subtune", "follow", str(input_file), "-o", "1000", str(output_file)]
+        argv += ["--idle-timeout", "0.05", "--poll-interval", "0.01"]
+        with patch("sys.argv", argv):
+            main()
+
+        assert "1 cues written" in capsys.readouterr().out
+        assert output_file.read_text() == "1\n00:00:02,000 --> 00:00:04,000\nLive\n"
+
+
+class TestCLIHLSCommand:
+    def test_hls_segments(self, tmp_path, capsys):
+        input_file = tmp_path / "movie.srt"
+        input_file.write_text("1\n00:00:01,000 --> 00:00:07,000\nSpans\n")
+        output_dir = tmp_path / "hls"
+
+        argv = ["subtune", "hls", str(input_file), str(output_dir), "--segment-duration", "4"]
+        with patch("sys.argv", argv):
+            main()
+
+        assert "Wrote 2 segments with 1 cues (2 placements)" in capsys.readouterr().out
+        assert "Spans" in (output_dir / "segment00001.vtt").read_text()
+        assert (output_dir / "subtitles.m3u8").exists()
+
+
+class TestCLISearchCommands:
+    def test_index_then_search(self, tmp_path, capsys):
+        (tmp_path / "a.srt").write_text("1\n00:00:01,000 --> 00:00:03,000\nHello there\nfriend\n")
+        index = tmp_path / "index.sqlite"
+
+        with patch("sys.argv", ["subtune", "index", str(tmp_path), "--index", str(index)]):
+            main()
+        assert "Indexed 1 cues: 1 files added" in capsys.readouterr().out
+
+        with patch("sys.argv", ["subtune", "search", "hello", "--index", str(index)]):
+            main()
+        assert capsys.readouterr().out == (
+            f"{tmp_path.resolve() / 'a.srt'}:1  00:00:01,000 --> 00:00:03,000  "
+            "Hello there / friend\n"
+        )
+
+        with patch("sys.argv", ["subtune", "search", "friend", "--index", str(index), "--json"]):
+            main()
+        assert json.loads(capsys.readouterr().out)[0]["start_ms"] == 1000
+
+    def test_search_without_index(self, tmp_path, capsys):
+        with patch("sys.argv", ["subtune", "search", "x", "--index", str(tmp_path / "none")]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 1
+        assert "Search index not found" in capsys.readouterr().err
+        assert not (tmp_path / "none").exists()
+
+
+class TestCLIStatsCommand:
+    def test_stats_json(self, tmp_path, capsys):
+        input_file = tmp_path / "test.srt"
+        input_file.write_text("1\n00:00:01,000 --> 00:00:03,000\nTest subtitle\n")
+
+        with patch("sys.argv", ["subtune", "stats", str(input_file), "--json", "--per-file"]):
+            main()
+
+        report = json.loads(capsys.readouterr().out)
+        assert report["total"]["cues"] == 1
+        assert report["files"][str(input_file)]["total_duration_ms"] == 2000
+
+    def test_stats_exit_code_on_error(self, tmp_path, capsys):
+        with patch("sys.argv", ["subtune", "stats", str(tmp_path / "missing.srt")]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 1
+        assert "File error" in capsys.readouterr().err
+
+
+class TestCLIProfile:
+    def test_profile_any_command(self, tmp_path, capsys):
+        input_file = tmp_path / "test.srt"
+        input_file.write_text("1\n00:00:01,000 --> 00:00:03,000\nTest subtitle\n")
+        prefix = tmp_path / "prof"
+
+        with patch("sys.argv", ["subtune", "stats", str(input_file), "--profile", str(prefix)]):
+            main()
+
+        assert "Profile written to" in capsys.readouterr().err
+        assert (tmp_path / "prof.pstats").exists()
+        assert "cli.py:run_stats" in (tmp_path / "prof.collapsed").read_text()
+
+    def test_profile_sample_mode_on_shift(self, tmp_path):
+        input_file = tmp_path / "test.srt"
+        input_file.write_text("1\n00:00:01,000 --> 00:00:03,000\nTest subtitle\n")
+        argv = ["subtune", str(input_file), "-o", "500", "--profile", str(tmp_path / "prof")]
+
+        with patch("sys.argv", [*argv, "--profile-mode", "sample"]):
+            main()
+
+        assert (tmp_path / "prof.collapsed").exists()
+        assert not (tmp_path / "prof.pstats").exists()
+        assert "00:00:01,500" in input_file.read_text()
+
+
+class TestCLIUndoCommand:
+    def test_journal_then_undo_all(self, tmp_path, capsys):
+        content = "1\n00:00:00,500 --> 00:00:03,000\nTest subtitle\n"
+        input_file = tmp_path / "test.srt"
+        input_file.write_text(content)
+        journal = str(tmp_path / "journal.sqlite")
+
+        for offset in ("-1000", "250"):
+            argv = ["subtune", str(input_file), "-o", offset, "--journal"]
+            with patch("sys.argv", [*argv, "--journal-file", journal]):
+                main()
+        assert "00:00:00,250 --> 00:00:02,250" in input_file.read_text()
+
+        with patch("sys.argv", ["subtune", "undo", "--all", "--journal-file", journal]):
+            main()
+
+        out = capsys.readouterr().out
+        assert f"Undid +250ms shift of {input_file.resolve()}" in out
+        assert "Undid -1000ms shift" in out
+        assert input_file.read_text() == content
+
+    def test_undo_without_journal(self, tmp_path, capsys):
+        argv = ["subtune", "undo", "--journal-file", str(tmp_path / "none.sqlite")]
+        with patch("sys.argv", argv):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 1
+        assert "Undo journal not found" in capsys.readouterr().err
+        assert not (tmp_path / "none.sqlite").exists()
+
+
+class TestCLIDiffCommand:
+    def test_diff_with_expected_offset(self, tmp_path, capsys):
+        before = tmp_path / "before.srt"
+        before.write_text(
+            "1\n00:00:01,000 --> 00:00:03,000\nOne\n\n2\n00:00:05,000 --> 00:00:06,000\nTwo\n"
+        )
+        after = tmp_path / "after.srt"
+        after.write_text(
+            "1\n00:00:02,500 --> 00:00:04,500\nOne\n\n2\n00:00:06,500 --> 00:00:07,500\nTwo\n"
+        )
+
+        argv = ["subtune", "diff", str(before), str(after), "--cues", "--expect-offset", "1500"]
+        with patch("sys.argv", argv):
+            main()
+
+        out = capsys.readouterr().out
+        assert "offset +1500ms (2/2 cues by number)" in out
+        assert "  #2 -> #2  start +1500ms  end +1500ms" in out
+
+        with patch("sys.argv", [*argv[:4], "--expect-offset", "1000"]):
+            with pytest.raises(SystemExit) as exc_info:
+                main()
+
+        assert exc_info.value.code == 5
+        assert "1 of 1 pairs are not shifted by exactly 1000ms" in capsys.readouterr().err
+
+    def test_expect_zero_offset_allows_jitter(self, tmp_path, capsys):
+        before = tmp_path / "before.srt"
+        before.write_text(
+            "1\n00:00:01,000 --> 00:00:03,000\nOne\n\n2\n00:00:05,000 --> 00:00:06,000\nTwo\n"
+        )
+        after = tmp_path / "after.srt"
+        after.write_text(
+            "1\n00:00:01,001 --> 00:00:03,000\nOne\n\n2\n00:00:05,000 --> 00:00:06,000\nTwo\n"
+        )
+
+        argv = ["subtune", "diff", str(before), str(after), "--expect-offset", "0"]
+        with patch("sys.argv", argv):
+            main()
+
+        assert "offset +0ms" in capsys.readouterr().out
+
+
+class TestCLIAlignCommand:
+    def test_align_dry_run_and_apply(self, tmp_path, capsys):
+        np = pytest.importorskip("numpy")
+
+        cues = [
+            (1000 + n * 2500 + (n * 389) % 700, 1800 + n * 2500 + (n * 613) % 900)
+            for n in range(12)
+        ]
+        input_file = tmp_path / "movie.srt"
+        input_file.write_text(
+            "\n".join(
+                f"{number}\n00:00:{start // 1000:02d},{start % 1000:03d} --> "
+                f"00:00:{end // 1000:02d},{end % 1000:03d}\nLine\n"
+                for number, (start, end) in enumerate(cues, start=1)
+            )
+        )
+        amplitude = np.full(34_000 * 8, 0.01)
+        for start, end in cues:
+            amplitude[(start + 700) * 8 : (end + 700) * 8] = 0.5
+        noise = np.random.default_rng(3).uniform(-1, 1, len(amplitude))
+        with wave.open(str(tmp_path / "movie.wav"), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(8000)
+            wav.writeframes((noise * amplitude * 30000).astype("<i2").tobytes())
+
+        argv = ["subtune", "align", str(input_file), "--audio", str(tmp_path / "movie.wav")]
+        with patch("sys.argv", [*argv, "--dry-run"]):
+            main()
+        assert "Estimated offset +700ms" in capsys.readouterr().out
+        assert input_file.read_text().startswith("1\n00:00:01,000")
+
+        with patch("sys.argv", argv):
+            main()
+        assert "Aligned 12 subtitles" in capsys.readouterr().out
+        assert input_file.read_text().startswith("1\n00:00:01,700")
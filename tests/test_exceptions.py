@@ -2,10 +2,12 @@ import pytest
 
 from subtune.core.exceptions import (
     FileProcessingError,
+    InvalidManifestError,
     InvalidOffsetError,
     InvalidSRTFormatError,
     InvalidTimestampError,
     SubtuneError,
+    describe_error,
 )
 
 
@@ -17,6 +19,7 @@ class TestExceptionHierarchy:
             FileProcessingError,
             InvalidSRTFormatError,
             InvalidOffsetError,
+            InvalidManifestError,
         ],
     )
     def test_all_exceptions_inherit_from_subtune_error(self, exc_class):
@@ -125,3 +128,20 @@ class TestExceptionCatching:
                 raise InvalidTimestampError("Timestamp error") from e
 
         assert exc_info.value.__cause__ is original_error
+
+
+class TestDescribeError:
+    @pytest.mark.parametrize(
+        "error,exit_code,label",
+        [
+            (FileProcessingError("x"), 1, "File error"),
+            (InvalidSRTFormatError("x"), 2, "SRT format error"),
+            (InvalidTimestampError("x"), 3, "Timestamp error"),
+            (InvalidOffsetError("x"), 4, "Offset error"),
+            (InvalidManifestError("x"), 5, "Error"),
+            (SubtuneError("x"), 5, "Error"),
+            (RuntimeError("x"), 99, "Unexpected error"),
+        ],
+    )
+    def test_exit_code_mapping(self, error, exit_code, label):
+        assert describe_error(error) == (exit_code, label)
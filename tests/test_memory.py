@@ -0,0 +1,83 @@
+import tracemalloc
+from datetime import timedelta
+
+import pytest
+
+from subtune.core.merge import sort_subtitles
+from subtune.core.validator import FileValidator
+from subtune.core.workflow import SubtitleProcessor
+
+CUE_COUNT = 20000
+
+# Peak bytes traced per cue, with headroom over the measured figures
+# (read ~300, shift ~140, write ~2, streaming shift ~5, external sort ~25).
+READ_BUDGET = 450
+SHIFT_BUDGET = 250
+WRITE_BUDGET = 50
+STREAM_BUDGET = 50
+SORT_BUDGET = 50
+SORT_RUN_SIZE = 1000
+
+
+def _format(ms):
+    h, rest = divmod(ms, 3600000)
+    m, rest = divmod(rest, 60000)
+    s, ms = divmod(rest, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+@pytest.fixture(scope="module")
+def large_srt(tmp_path_factory):
+    path = tmp_path_factory.mktemp("memory") / "large.srt"
+    with open(path, "w", encoding="utf-8") as f:
+        for number in range(1, CUE_COUNT + 1):
+            start_ms = number * 300
+            f.write(f"{number}\n{_format(start_ms)} --> {_format(start_ms + 200)}\n")
+            f.write(f"Line {number}\nWhat do you mean?\n\n")
+
+    # Keep the cue texts alive for the whole module: once they are freed the
+    # interned-string dict fills with deleted slots and may resize mid-measurement
+    texts = FileValidator.read_srt_file(path)
+    yield path
+    del texts
+
+
+def _peak_per_cue(function, *args):
+    tracemalloc.start()
+    try:
+        function(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak / CUE_COUNT
+
+
+class TestMemoryBudget:
+    def test_read(self, large_srt):
+        assert _peak_per_cue(FileValidator.read_srt_file, large_srt) < READ_BUDGET
+
+    def test_shift(self, large_srt):
+        srt_file = FileValidator.read_srt_file(large_srt)
+
+        assert _peak_per_cue(srt_file.shift, timedelta(seconds=1)) < SHIFT_BUDGET
+
+    def test_write(self, large_srt, tmp_path):
+        srt_file = FileValidator.read_srt_file(large_srt)
+
+        peak = _peak_per_cue(FileValidator.write_srt_file, srt_file, tmp_path / "out.srt")
+
+        assert peak < WRITE_BUDGET
+
+    def test_streaming_shift(self, large_srt, tmp_path):
+        processor = SubtitleProcessor(on_warning=lambda _message: None)
+
+        peak = _peak_per_cue(processor.shift_file, large_srt, tmp_path / "out.srt", 1000)
+
+        assert peak < STREAM_BUDGET
+
+    def test_external_sort(self, large_srt):
+        def sort_file():
+            for _subtitle in sort_subtitles(FileValidator.iter_srt_file(large_srt), SORT_RUN_SIZE):
+                pass
+
+        assert _peak_per_cue(sort_file) < SORT_BUDGET
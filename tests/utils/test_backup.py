@@ -22,3 +22,14 @@ class TestBackupManager:
         assert backup_path is None
         captured = capsys.readouterr()
         assert "Warning: Could not create backup file" in captured.out
+
+    def test_create_backup_failure_callback(self, tmp_path, capsys):
+        received = []
+
+        backup_path = BackupManager.create_backup(
+            tmp_path / "nonexistent.srt", on_warning=received.append
+        )
+
+        assert backup_path is None
+        assert received[0].startswith("Could not create backup file")
+        assert capsys.readouterr().out == ""
@@ -0,0 +1,61 @@
+import bz2
+import gzip
+import io
+import lzma
+
+import pytest
+
+from subtune.utils.compression import Compression
+
+
+class TestCompression:
+    @pytest.mark.parametrize(
+        "compress,expected",
+        [(gzip.compress, "gzip"), (bz2.compress, "bz2"), (lzma.compress, "xz")],
+    )
+    def test_detect_by_magic_bytes(self, tmp_path, compress, expected):
+        test_file = tmp_path / "misnamed.srt"
+        test_file.write_bytes(compress(b"1\n"))
+
+        assert Compression.detect(test_file) == expected
+
+    def test_detect_plain_text(self, tmp_path):
+        test_file = tmp_path / "plain.srt.gz"
+        test_file.write_text("1\n")
+
+        assert Compression.detect(test_file) is None
+
+    def test_detect_missing_file_falls_back_to_extension(self, tmp_path):
+        assert Compression.detect(tmp_path / "new.srt.xz") == "xz"
+        assert Compression.detect(tmp_path / "new.srt") is None
+
+    @pytest.mark.parametrize(
+        "name,expected",
+        [("a.srt.gz", "a.srt"), ("a.srt.BZ2", "a.srt"), ("a.srt", "a.srt"), ("a.gz", "a")],
+    )
+    def test_strip_extension(self, tmp_path, name, expected):
+        assert Compression.strip_extension(tmp_path / name).name == expected
+
+    @pytest.mark.parametrize("compression", [None, "gzip", "bz2", "xz"])
+    def test_writer_round_trip(self, tmp_path, compression):
+        raw = io.BytesIO()
+        raw.close = lambda: None
+
+        with Compression.open_writer(raw, compression, "utf-8") as stream:
+            stream.write("héllo\n")
+
+        test_file = tmp_path / "out"
+        test_file.write_bytes(raw.getvalue())
+        with Compression.open_reader(test_file, "utf-8") as f:
+            assert f.read() == "héllo\n"
+
+    def test_gzip_output_is_deterministic(self):
+        outputs = []
+        for _ in range(2):
+            raw = io.BytesIO()
+            raw.close = lambda: None
+            with Compression.open_writer(raw, "gzip", "utf-8") as stream:
+                stream.write("same")
+            outputs.append(raw.getvalue())
+
+        assert outputs[0] == outputs[1]
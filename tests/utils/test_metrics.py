@@ -0,0 +1,91 @@
+import pickle
+
+import pytest
+
+from subtune.core.exceptions import FileProcessingError, InvalidSRTFormatError
+from subtune.core.workflow import ShiftResult, SubtitleProcessor
+from subtune.utils.metrics import Metrics
+
+SRT_CONTENT = "1\n00:00:01,000 --> 00:00:03,000\nTest\n\nbroken\n"
+
+
+class TestMetrics:
+    def test_counters_and_labels(self):
+        metrics = Metrics()
+        metrics.inc("cues_total", 3)
+        metrics.record_error(InvalidSRTFormatError("bad"))
+        metrics.record_error(InvalidSRTFormatError("bad"))
+
+        text = metrics.to_text(now=100)
+
+        assert "# TYPE subtune_cues_total counter\nsubtune_cues_total 3\n" in text
+        assert 'subtune_errors_total{error="InvalidSRTFormatError"} 2' in text
+        assert "subtune_last_run_timestamp_seconds 100" in text
+        assert "subtune_files_total" not in text
+
+    def test_histogram_is_cumulative(self):
+        metrics = Metrics()
+        for seconds in (0.0005, 0.02, 0.02, 120):
+            metrics.observe("stage_duration_seconds", seconds, stage="process")
+
+        text = metrics.to_text()
+
+        assert 'subtune_stage_duration_seconds_bucket{stage="process",le="0.001"} 1' in text
+        assert 'subtune_stage_duration_seconds_bucket{stage="process",le="0.05"} 3' in text
+        assert 'subtune_stage_duration_seconds_bucket{stage="process",le="60.0"} 3' in text
+        assert 'subtune_stage_duration_seconds_bucket{stage="process",le="+Inf"} 4' in text
+        assert 'subtune_stage_duration_seconds_count{stage="process"} 4' in text
+        assert 'subtune_stage_duration_seconds_sum{stage="process"} 120.0405' in text
+
+    def test_merge_survives_pickling(self):
+        first = Metrics()
+        first.inc("files_total")
+        first.observe("stage_duration_seconds", 0.2, stage="process")
+        second = pickle.loads(pickle.dumps(first))
+
+        first.merge(second).merge(Metrics())
+
+        assert first.counters["files_total", ()] == 2
+        assert first.histograms["stage_duration_seconds", (("stage", "process"),)][0][5] == 2
+
+    def test_label_escaping(self):
+        metrics = Metrics()
+        metrics.inc("errors_total", error='Odd"Name\\')
+
+        assert 'error="Odd\\"Name\\\\"' in metrics.to_text()
+
+    def test_processor_records_results_and_errors(self, tmp_path):
+        input_file = tmp_path / "input.srt"
+        input_file.write_text(SRT_CONTENT)
+        metrics = Metrics()
+        processor = SubtitleProcessor(on_warning=lambda _message: None, metrics=metrics)
+
+        processor.shift_file(input_file, tmp_path / "output.srt", 1000)
+        with pytest.raises(FileProcessingError):
+            processor.shift_file(tmp_path / "missing.srt", tmp_path / "output.srt", 1000)
+
+        assert metrics.counters["files_total", ()] == 1
+        assert metrics.counters["cues_total", ()] == 1
+        assert metrics.counters["dropped_blocks_total", ()] == 1
+        assert metrics.counters["bytes_total", ()] == len(SRT_CONTENT)
+        assert metrics.counters["errors_total", (("error", "FileProcessingError"),)] == 1
+        assert ("stage_duration_seconds", (("stage", "total"),)) in metrics.histograms
+
+    def test_up_to_date_result(self):
+        metrics = Metrics()
+        metrics.record_result(ShiftResult(up_to_date=True))
+
+        assert dict(metrics.counters) == {("files_up_to_date_total", ()): 1}
+
+    def test_write_is_atomic(self, tmp_path):
+        metrics_file = tmp_path / "subtune.prom"
+        metrics_file.write_text("old")
+
+        Metrics().write(metrics_file)
+
+        assert metrics_file.read_text().startswith("# HELP subtune_last_run_timestamp_seconds")
+        assert [path.name for path in tmp_path.iterdir()] == ["subtune.prom"]
+
+    def test_write_failure(self, tmp_path):
+        with pytest.raises(FileProcessingError, match="Cannot write metrics file"):
+            Metrics().write(tmp_path / "missing" / "subtune.prom")
@@ -0,0 +1,101 @@
+import pstats
+
+from subtune.core.hls import segment_hls
+from subtune.core.stats import library_stats
+from subtune.utils.profiling import Profiler, collapse_stats, thread_pool
+
+SRT_CONTENT = "1\n00:00:01,000 --> 00:00:03,000\nTest\n"
+
+
+def busy(n):
+    return sum(i * i for i in range(n))
+
+
+def parse_collapsed(path):
+    stacks = {}
+    for line in path.read_text().splitlines():
+        stack, weight = line.rsplit(" ", 1)
+        stacks[stack] = int(weight)
+    return stacks
+
+
+class TestProfiler:
+    def test_cprofile_writes_pstats_and_stacks(self, tmp_path):
+        with Profiler(tmp_path / "run") as profiler:
+            busy(200_000)
+
+        stats = pstats.Stats(str(profiler.pstats_path))
+        assert any(name == "busy" for _, _, name in stats.stats)
+
+        stacks = parse_collapsed(profiler.collapsed_path)
+        assert all(weight > 0 for weight in stacks.values())
+        assert any(
+            stack.startswith("test_profiling.py:busy;") and stack.endswith(":<genexpr>")
+            for stack in stacks
+        )
+
+    def test_sample_mode_records_thread_stacks(self, tmp_path):
+        with Profiler(tmp_path / "run", mode="sample", interval=0.001) as profiler:
+            busy(2_000_000)
+
+        assert not profiler.pstats_path.exists()
+        stacks = parse_collapsed(profiler.collapsed_path)
+        assert any(
+            stack.startswith("thread:MainThread;") and "test_profiling.py:busy" in stack
+            for stack in stacks
+        )
+        assert not any("subtune-sampler" in stack for stack in stacks)
+
+    def test_pool_threads_are_merged(self, tmp_path):
+        with Profiler(tmp_path / "run") as profiler:
+            with thread_pool(2) as executor:
+                list(executor.map(busy, [100_000, 100_000]))
+
+        stats = pstats.Stats(str(profiler.pstats_path))
+        assert any(name == "busy" for _, _, name in stats.stats)
+        assert any(":busy" in stack for stack in parse_collapsed(profiler.collapsed_path))
+
+    def test_threaded_commands_are_profiled(self, tmp_path):
+        input_file = tmp_path / "movie.srt"
+        input_file.write_text(SRT_CONTENT)
+
+        with Profiler(tmp_path / "run") as profiler:
+            segment_hls(input_file, tmp_path / "hls", workers=2)
+
+        stats = pstats.Stats(str(profiler.pstats_path))
+        assert any(name == "_vtt_cue" for _, _, name in stats.stats)
+
+    def test_worker_processes_are_merged(self, tmp_path):
+        files = []
+        for n in range(4):
+            path = tmp_path / f"{n}.srt"
+            path.write_text(SRT_CONTENT)
+            files.append(path)
+
+        with Profiler(tmp_path / "run") as profiler:
+            total, _, errors = library_stats(files, workers=2)
+
+        assert (total.cues, errors) == (4, [])
+        stats = pstats.Stats(str(profiler.pstats_path))
+        assert any(name == "file_stats" for _, _, name in stats.stats)
+        assert not list(tmp_path.glob("worker-*"))
+
+    def test_collapse_splits_time_between_callers(self, tmp_path):
+        def leaf():
+            busy(100_000)
+
+        def first():
+            leaf()
+
+        def second():
+            leaf()
+            leaf()
+
+        with Profiler(tmp_path / "run") as profiler:
+            first()
+            second()
+
+        stacks = collapse_stats(pstats.Stats(str(profiler.pstats_path)))
+        first_leaf = sum(w for s, w in stacks.items() if "first;" in s and ":leaf" in s)
+        second_leaf = sum(w for s, w in stacks.items() if "second;" in s and ":leaf" in s)
+        assert 1.3 < second_leaf / first_leaf < 3